@@ -394,6 +394,14 @@ def unregister():
     flamenco.unregister_flamenco_handlers()
     print("✓ Flamenco integration unregistered")
 
+    from . import proxy_prefetch, proxy_auto, proxy_store, proxy_manifest, proxy_cache, thumbnails
+    proxy_prefetch.shutdown()
+    proxy_cache.shutdown()
+    proxy_manifest.shutdown()
+    proxy_auto.stop_watching()
+    proxy_store.shutdown()
+    thumbnails.stop_atlas_rebuilds()
+
     utils.remove_handlers()
     print("✓ Handlers removed")
 
@@ -0,0 +1,197 @@
+"""
+Quick HDRI Controls - Analytic chrome/diffuse ball preview thumbnails
+"""
+import os
+import math
+import bpy
+import numpy as np
+
+# Environment maps are reduced to this width before shading
+ENV_MAX_WIDTH = 1024
+
+# Horizontal field of view of the background camera
+CAMERA_FOV = math.radians(60.0)
+
+# Diffuse ball albedo
+DIFFUSE_ALBEDO = 0.8
+
+# Cosine lobe convolution weights for SH bands 0-2
+SH_BAND_WEIGHTS = (math.pi, 2.0 * math.pi / 3.0, math.pi / 4.0)
+
+def load_environment(filepath, max_width=ENV_MAX_WIDTH):
+    """Load an equirectangular image into a linear (height, width, 3) float32 array.
+
+    Rows run bottom-up as in Blender, images wider than max_width are box filtered down.
+    """
+    if filepath.lower().endswith('.hdr'):
+        from . import hdr_io
+        return downsample_environment(hdr_io.read_hdr(filepath)[::-1], max_width)
+
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        env = pixels.reshape(height, width, 4)[..., :3]
+
+        # Byte images hold display values, bring them to linear
+        if not image.is_float:
+            env = np.where(env <= 0.04045, env / 12.92, ((env + 0.055) / 1.055) ** 2.4)
+    finally:
+        bpy.data.images.remove(image)
+
+    return downsample_environment(env, max_width)
+
+def downsample_environment(env, max_width=ENV_MAX_WIDTH):
+    """Box filter an environment by an integer factor so it is at most max_width wide"""
+    height, width = env.shape[:2]
+    factor = int(math.ceil(width / max_width))
+    if factor <= 1:
+        return np.ascontiguousarray(env, dtype=np.float32)
+
+    new_height, new_width = height // factor, width // factor
+    env = env[:new_height * factor, :new_width * factor]
+    env = env.reshape(new_height, factor, new_width, factor, 3).mean(axis=(1, 3))
+    return env.astype(np.float32)
+
+def direction_to_uv(directions):
+    """Map world directions to equirect UVs using Blender's environment texture layout"""
+    x, y, z = directions[..., 0], directions[..., 1], directions[..., 2]
+    u = 0.5 - np.arctan2(y, x) / (2.0 * math.pi)
+    v = np.arctan2(z, np.hypot(x, y)) / math.pi + 0.5
+    return u, v
+
+def sample_environment(env, directions):
+    """Nearest-texel lookup of an environment for an array of unit directions"""
+    height, width = env.shape[:2]
+    u, v = direction_to_uv(directions)
+    columns = np.clip((u * width).astype(np.int32), 0, width - 1)
+    rows = np.clip((v * height).astype(np.int32), 0, height - 1)
+    return env[rows, columns]
+
+def environment_directions(height, width):
+    """Unit directions and solid angles for every texel of an equirect map (rows bottom-up)"""
+    u = (np.arange(width, dtype=np.float32) + 0.5) / width
+    v = (np.arange(height, dtype=np.float32) + 0.5) / height
+    phi = (0.5 - u) * 2.0 * math.pi  # azimuth
+    theta = (v - 0.5) * math.pi  # elevation
+
+    cos_theta = np.cos(theta)[:, None]
+    directions = np.empty((height, width, 3), dtype=np.float32)
+    directions[..., 0] = np.cos(phi)[None, :] * cos_theta
+    directions[..., 1] = np.sin(phi)[None, :] * cos_theta
+    directions[..., 2] = np.sin(theta)[:, None]
+
+    solid_angles = (2.0 * math.pi / width) * (math.pi / height) * cos_theta
+    solid_angles = np.broadcast_to(solid_angles, (height, width)).astype(np.float32)
+    return directions, solid_angles
+
+def sh_basis(directions):
+    """Real spherical harmonics up to band 2, shape (..., 9)"""
+    x, y, z = directions[..., 0], directions[..., 1], directions[..., 2]
+    return np.stack([
+        0.282095 * np.ones_like(x),
+        0.488603 * y,
+        0.488603 * z,
+        0.488603 * x,
+        1.092548 * x * y,
+        1.092548 * y * z,
+        0.315392 * (3.0 * z * z - 1.0),
+        1.092548 * x * z,
+        0.546274 * (x * x - y * y),
+    ], axis=-1)
+
+def project_sh(env):
+    """Project an environment onto 9 SH coefficients per colour channel, shape (9, 3)"""
+    directions, solid_angles = environment_directions(*env.shape[:2])
+    basis = sh_basis(directions) * solid_angles[..., None]
+    return np.einsum('hwk,hwc->kc', basis, env)
+
+def sh_irradiance(coefficients, normals):
+    """Irradiance for surface normals from SH radiance coefficients"""
+    weights = np.array([SH_BAND_WEIGHTS[0]] +
+                       [SH_BAND_WEIGHTS[1]] * 3 +
+                       [SH_BAND_WEIGHTS[2]] * 5, dtype=np.float32)
+    return np.maximum(sh_basis(normals) @ (coefficients * weights[:, None]), 0.0)
+
+def camera_directions(width, height, fov=CAMERA_FOV):
+    """Directions of a camera looking along +Y, rows bottom-up"""
+    half_width = math.tan(fov / 2.0)
+    half_height = half_width * height / width
+    xs = ((np.arange(width, dtype=np.float32) + 0.5) / width * 2.0 - 1.0) * half_width
+    zs = ((np.arange(height, dtype=np.float32) + 0.5) / height * 2.0 - 1.0) * half_height
+
+    directions = np.empty((height, width, 3), dtype=np.float32)
+    directions[..., 0] = xs[None, :]
+    directions[..., 1] = 1.0
+    directions[..., 2] = zs[:, None]
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+def ball_normals(width, height, center_x, center_y, radius):
+    """Camera-facing sphere normals inside a screen-space disc (orthographic), plus its mask"""
+    xs = (np.arange(width, dtype=np.float32) + 0.5 - center_x) / radius
+    zs = (np.arange(height, dtype=np.float32) + 0.5 - center_y) / radius
+    sx, sz = np.meshgrid(xs, zs)
+    r2 = sx * sx + sz * sz
+    mask = r2 < 1.0
+
+    normals = np.zeros((height, width, 3), dtype=np.float32)
+    normals[..., 0] = sx
+    normals[..., 1] = -np.sqrt(np.clip(1.0 - r2, 0.0, 1.0))
+    normals[..., 2] = sz
+    return normals, mask
+
+def tonemap(radiance, exposure=1.0):
+    """Soft shoulder tonemap to sRGB display values in 0-1"""
+    mapped = 1.0 - np.exp(-np.maximum(radiance, 0.0) * exposure)
+    return np.where(mapped <= 0.0031308,
+                    mapped * 12.92,
+                    1.055 * np.power(mapped, 1.0 / 2.4) - 0.055)
+
+def render_orbs(env, width, height):
+    """Render background, mirror ball and diffuse ball for an environment.
+
+    Returns a (height, width, 4) float32 display-referred image, rows bottom-up.
+    """
+    image = sample_environment(env, camera_directions(width, height))
+
+    radius = 0.22 * height
+    center_y = 0.38 * height
+    view = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+
+    # Mirror ball - reflect the view vector about the normal
+    normals, mask = ball_normals(width, height, 0.32 * width, center_y, radius)
+    n = normals[mask]
+    reflected = view - 2.0 * (n @ view)[:, None] * n
+    image[mask] = sample_environment(env, reflected)
+
+    # Diffuse ball - low order irradiance
+    normals, mask = ball_normals(width, height, 0.68 * width, center_y, radius)
+    coefficients = project_sh(env)
+    image[mask] = DIFFUSE_ALBEDO / math.pi * sh_irradiance(coefficients, normals[mask])
+
+    output = np.ones((height, width, 4), dtype=np.float32)
+    output[..., :3] = tonemap(image)
+    return output
+
+def save_image(pixels, filepath):
+    """Write a display-referred (height, width, 4) image (rows bottom-up) as PNG"""
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new("_qhdri_analytic_preview", width=width, height=height, alpha=True)
+    try:
+        image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+        image.filepath_raw = filepath
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+def render_preview(hdri_path, thumb_path, width, height):
+    """Render an analytic orb preview of an HDRI straight to a thumbnail file"""
+    try:
+        env = load_environment(hdri_path)
+        save_image(render_orbs(env, width, height), thumb_path)
+        return os.path.exists(thumb_path)
+    except Exception as e:
+        print(f"Error rendering analytic preview for {hdri_path}: {str(e)}")
+        return False
@@ -0,0 +1,254 @@
+"""
+Quick HDRI Controls - Resumable batch job journal
+"""
+import os
+import json
+import time
+
+# Journal kinds, one journal per batch type
+JOB_PREVIEWS = 'PREVIEWS'
+JOB_PROXIES = 'PROXIES'
+
+# Preferences recorded with a job so a resumed run produces identical output
+JOB_SETTINGS = {
+    JOB_PREVIEWS: (
+        'hdri_directory',
+        'preview_render_method',
+        'preview_scene_type',
+        'preview_render_device',
+        'preview_samples',
+        'preview_resolution',
+        'preview_use_proxy',
+        'preview_proxy_resolution',
+        'thumbnail_format',
+        'thumbnail_max_width',
+    ),
+    JOB_PROXIES: (
+        'hdri_directory',
+        'proxy_generation_resolution',
+        'proxy_engine',
+        'proxy_pyramid',
+        'proxy_pyramid_resolutions',
+        'proxy_format',
+        'proxy_exr_codec',
+        'proxy_storage',
+        'central_proxy_directory',
+    ),
+}
+
+# Parsed journals keyed by kind -> (mtime, size, job)
+_job_cache = {}
+
+def get_journal_path(kind):
+    from .utils import get_state_path
+    return get_state_path(f"batch_{kind.lower()}_journal.jsonl")
+
+def _append(kind, record):
+    try:
+        with open(get_journal_path(kind), 'a') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+    except (IOError, OSError) as e:
+        print(f"Error writing batch journal: {str(e)}")
+        return False
+
+def start_job(kind, files, preferences):
+    """Start a new journal holding the file list and the settings used"""
+    settings = {}
+    for name in JOB_SETTINGS[kind]:
+        value = getattr(preferences, name)
+        # Multi-select enums come back as sets, which JSON can't hold
+        settings[name] = sorted(value) if isinstance(value, set) else value
+    discard_job(kind)
+    return _append(kind, {
+        'type': 'job',
+        'kind': kind,
+        'created': time.time(),
+        'files': list(files),
+        'settings': settings,
+    })
+
+def record_entry(kind, path, success):
+    """Append the result of one processed file to the journal"""
+    return _append(kind, {
+        'type': 'entry',
+        'path': path,
+        'status': 'done' if success else 'failed',
+        'time': time.time(),
+    })
+
+def load_job(kind):
+    """Read a journal back into a job dict, or None if there is no job.
+
+    A partially written last line (crash mid-write) is ignored.
+    """
+    journal_path = get_journal_path(kind)
+    try:
+        stat = os.stat(journal_path)
+    except OSError:
+        _job_cache.pop(kind, None)
+        return None
+
+    cached = _job_cache.get(kind)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+
+    job = None
+    try:
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if record.get('type') == 'job':
+                    job = {
+                        'created': record.get('created', 0),
+                        'files': record.get('files', []),
+                        'settings': record.get('settings', {}),
+                        'completed': set(),
+                        'failed': set(),
+                    }
+                elif job is not None and record.get('type') == 'entry':
+                    if record.get('status') == 'done':
+                        job['completed'].add(record['path'])
+                        job['failed'].discard(record['path'])
+                    else:
+                        job['failed'].add(record['path'])
+    except IOError as e:
+        print(f"Error reading batch journal: {str(e)}")
+        return None
+
+    _job_cache[kind] = (stat.st_mtime, stat.st_size, job)
+    return job
+
+def get_pending_files(job):
+    """Files of a job that have not been processed yet, in original order"""
+    processed = job['completed'] | job['failed']
+    return [f for f in job['files'] if f not in processed]
+
+def has_pending_job(kind):
+    job = load_job(kind)
+    return job is not None and bool(get_pending_files(job))
+
+def restore_settings(kind, job, preferences):
+    """Apply the settings recorded with a job for the resumed run.
+
+    Returns the values they replaced, put back with revert_settings when the
+    run ends so the user's own preferences survive a resume.
+    """
+    previous = {}
+    for name in JOB_SETTINGS[kind]:
+        if name in job['settings']:
+            value = job['settings'][name]
+            current = getattr(preferences, name)
+            if isinstance(current, set):
+                value = set(value)
+            if value == current:
+                continue
+            try:
+                setattr(preferences, name, value)
+                previous[name] = current
+            except (TypeError, ValueError) as e:
+                print(f"Could not restore batch setting {name}: {str(e)}")
+    return previous
+
+def revert_settings(preferences, previous):
+    """Put back the preferences a resumed run replaced, emptying previous"""
+    if not previous:
+        return
+    for name, value in previous.items():
+        try:
+            setattr(preferences, name, value)
+        except (TypeError, ValueError) as e:
+            print(f"Could not revert batch setting {name}: {str(e)}")
+    previous.clear()
+
+def finish_job(kind):
+    """Remove the journal of a job that ran to completion"""
+    discard_job(kind)
+
+def discard_job(kind):
+    _job_cache.pop(kind, None)
+    journal_path = get_journal_path(kind)
+    if os.path.exists(journal_path):
+        try:
+            os.remove(journal_path)
+        except OSError as e:
+            print(f"Error removing batch journal: {str(e)}")
+
+# Priority tiers for background generation, lower runs first
+PRIORITY_CURRENT_FOLDER = 0
+PRIORITY_SEARCH = 1
+PRIORITY_FAVORITE = 2
+PRIORITY_REST = 3
+
+# Seconds between checks of the browser state while a batch runs
+PRIORITY_CHECK_INTERVAL = 1.0
+
+def get_priority_signature(context):
+    """Browser state that affects ordering - when it changes the queue is re-sorted"""
+    if not hasattr(context.scene, "hdri_settings"):
+        return None
+
+    from .favorites import get_favorites_file_path
+    try:
+        favorites_mtime = os.path.getmtime(get_favorites_file_path())
+    except OSError:
+        favorites_mtime = None
+
+    settings = context.scene.hdri_settings
+    return (settings.current_folder, settings.search_query.lower().strip(), favorites_mtime)
+
+def prioritize_files(files, context, base_dir):
+    """Order files so the browsed folder, search results and favorites come first.
+
+    The sort is stable, files of equal priority keep their original order.
+    """
+    if not hasattr(context.scene, "hdri_settings"):
+        return list(files)
+
+    from .favorites import load_favorites
+    settings = context.scene.hdri_settings
+
+    current_dir = settings.current_folder or base_dir
+    current_dir = os.path.normpath(os.path.abspath(current_dir)) if current_dir else None
+    search_query = settings.search_query.lower().strip()
+    search_terms = search_query.replace('_', ' ').replace('-', ' ').split()
+    favorites = {os.path.normpath(f) for f in load_favorites()}
+
+    def priority(hdri_path):
+        norm_path = os.path.normpath(os.path.abspath(hdri_path))
+        if current_dir and os.path.dirname(norm_path) == current_dir:
+            return PRIORITY_CURRENT_FOLDER
+        if search_terms:
+            rel_path = os.path.relpath(norm_path, base_dir) if base_dir else norm_path
+            searchable_text = f"{rel_path} {os.path.basename(norm_path)}".lower()
+            searchable_text = searchable_text.replace('_', ' ').replace('-', ' ')
+            if all(term in searchable_text for term in search_terms):
+                return PRIORITY_SEARCH
+        if os.path.normpath(hdri_path) in favorites:
+            return PRIORITY_FAVORITE
+        return PRIORITY_REST
+
+    return sorted(files, key=priority)
+
+def reprioritize_remaining(operator, context, files, start_index, base_dir):
+    """Re-sort the unprocessed tail of a batch list when the browser state changed.
+
+    Called for every processed file, the state (and the favorites file) is only
+    looked at once per PRIORITY_CHECK_INTERVAL.
+    """
+    now = time.monotonic()
+    if now - getattr(operator, '_priority_checked', -PRIORITY_CHECK_INTERVAL) < PRIORITY_CHECK_INTERVAL:
+        return
+    operator._priority_checked = now
+
+    signature = get_priority_signature(context)
+    if signature == getattr(operator, '_priority_signature', None):
+        return
+    operator._priority_signature = signature
+    files[start_index:] = prioritize_files(files[start_index:], context, base_dir)
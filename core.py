@@ -28,6 +28,10 @@ class HDRISettings(PropertyGroup):
             print(f"Warning: HDRI file not found: {filepath}")
             return
 
+        # Build the neighbours' proxies in the background while this one loads
+        from . import proxy_prefetch
+        proxy_prefetch.schedule_prefetch(context, filepath)
+
         render_engine = context.scene.render.engine
 
         if render_engine == 'VRAY_RENDER_RT':
@@ -103,13 +107,12 @@ class HDRISettings(PropertyGroup):
 
                     target_path = filepath
                     if self.proxy_resolution != 'ORIGINAL':
-                        from .utils import create_hdri_proxy
+                        from .utils import create_hdri_proxy, find_proxy
+                        from . import proxy_cache
 
-                        proxy_dir = os.path.join(os.path.dirname(filepath), 'proxies')
-                        base_name = os.path.splitext(os.path.basename(filepath))[0]
-                        potential_proxy = os.path.join(proxy_dir, f"{base_name}_{self.proxy_resolution}.hdr")
+                        potential_proxy = proxy_cache.touch(find_proxy(filepath, self.proxy_resolution))
 
-                        if os.path.exists(potential_proxy):
+                        if potential_proxy:
                             target_path = potential_proxy
                         else:
                             proxy_path = create_hdri_proxy(filepath, self.proxy_resolution)
@@ -279,6 +282,12 @@ class HDRISettings(PropertyGroup):
         """Update handler for proxy resolution and mode changes"""
         print(f"Core update_hdri_proxy called: proxy_resolution={self.proxy_resolution}, proxy_mode={self.proxy_mode}")
 
+        # AUTO follows the viewport size, keep watching it
+        if self.proxy_resolution == 'AUTO':
+            from . import proxy_auto
+            proxy_auto.remember(context.scene)
+            proxy_auto.start_watching()
+
         # Determine the appropriate engine to handle the update based on current render engine
         render_engine = context.scene.render.engine
 
@@ -469,6 +478,7 @@ class HDRISettings(PropertyGroup):
         description="Resolution to use for HDRI",
         items=[
             ('ORIGINAL', 'Original', 'Use original resolution'),
+            ('AUTO', 'Auto', 'Smallest proxy covering the viewport, within the memory budget'),
             ('1K', '1K', 'Use 1K resolution'),
             ('2K', '2K', 'Use 2K resolution'),
             ('4K', '4K', 'Use 4K resolution'),
@@ -498,6 +508,7 @@ class HDRISettings(PropertyGroup):
         description="Previously used proxy resolution",
         items=[
             ('ORIGINAL', 'Original', 'Use original resolution'),
+            ('AUTO', 'Auto', 'Smallest proxy covering the viewport, within the memory budget'),
             ('1K', '1K', 'Use 1K resolution'),
             ('2K', '2K', 'Use 2K resolution'),
             ('4K', '4K', 'Use 4K resolution'),
@@ -571,6 +582,10 @@ def initialize_proxy_settings_from_preferences(scene):
         # Mark as initialized (this flag can be used for other purposes if needed)
         hdri_settings.proxy_initialized = True
 
+        if hdri_settings.proxy_resolution == 'AUTO':
+            from . import proxy_auto
+            proxy_auto.start_watching()
+
         print(f"Synced proxy settings with preferences: resolution={preferences.default_proxy_resolution}, mode={preferences.default_proxy_mode}")
         return True
 
@@ -0,0 +1,171 @@
+"""
+Quick HDRI Controls - Tiled, mip-mapped OpenEXR writing without bpy
+
+Blender only saves scanline EXRs. Renderers with a texture cache page tiled
+mip-mapped files in by level and tile instead of loading the full map, so
+these are written here directly: half float RGB, square tiles, one mip level
+per halving of the size (rounded down) and ZIP or no compression.
+"""
+import math
+import struct
+import zlib
+import numpy as np
+
+try:
+    from . import imaging
+except ImportError:
+    import imaging
+
+EXR_MAGIC = 20000630
+EXR_VERSION = 2
+TILED_FLAG = 0x200
+
+HALF = 1
+
+COMPRESSIONS = {
+    'NONE': 0,
+    'ZIP': 3,
+}
+
+MIPMAP_LEVELS = 1
+ROUND_DOWN = 0
+RANDOM_Y = 2
+
+# Largest finite half float, brighter values would turn into infinity
+HALF_MAX = 65504.0
+
+TILE_SIZE = 64
+
+def mip_level_sizes(width, height):
+    """(width, height) of every mip level, full size first, down to 1x1"""
+    count = int(math.floor(math.log2(max(width, height)))) + 1
+    return [(max(1, width >> level), max(1, height >> level)) for level in range(count)]
+
+def _attribute(name, kind, data):
+    return name.encode() + b'\0' + kind.encode() + b'\0' + struct.pack('<i', len(data)) + data
+
+def _header(width, height, tile_size, compression):
+    channels = b''.join(name + b'\0' + struct.pack('<iB3xii', HALF, 0, 1, 1) for name in (b'B', b'G', b'R'))
+    window = struct.pack('<iiii', 0, 0, width - 1, height - 1)
+    return b''.join([
+        struct.pack('<ii', EXR_MAGIC, EXR_VERSION | TILED_FLAG),
+        _attribute('channels', 'chlist', channels + b'\0'),
+        _attribute('compression', 'compression', struct.pack('<B', COMPRESSIONS[compression])),
+        _attribute('dataWindow', 'box2i', window),
+        _attribute('displayWindow', 'box2i', window),
+        _attribute('lineOrder', 'lineOrder', struct.pack('<B', RANDOM_Y)),
+        _attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0)),
+        _attribute('screenWindowCenter', 'v2f', struct.pack('<ff', 0.0, 0.0)),
+        _attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0)),
+        _attribute('tiles', 'tiledesc', struct.pack('<IIB', tile_size, tile_size, MIPMAP_LEVELS | ROUND_DOWN << 4)),
+        b'\0',
+    ])
+
+def _zip(raw):
+    """OpenEXR ZIP: bytes split into even and odd halves, delta encoded, then deflated"""
+    data = np.frombuffer(raw, dtype=np.uint8)
+    interleaved = np.concatenate([data[0::2], data[1::2]])
+    predicted = interleaved.copy()
+    predicted[1:] = (interleaved[1:].astype(np.int16) - interleaved[:-1] + 128).astype(np.uint8)
+    return zlib.compress(predicted.tobytes(), 6)
+
+class TiledEXRWriter:
+    """Write a tiled mip-mapped EXR from rows of the full-size image, top row first.
+
+    Each level keeps only the rows of its current row of tiles. Finished rows
+    cascade into the next level through an area downsample, so every level is
+    written in the same single pass over the source. The offset table is
+    filled in on close, tiles are stored in the order they complete.
+    """
+
+    def __init__(self, filepath, width, height, tile_size=TILE_SIZE, compression='ZIP'):
+        self.tile_size = tile_size
+        self.compression = compression
+        self.levels = []
+        sizes = mip_level_sizes(width, height)
+        for index, (level_width, level_height) in enumerate(sizes):
+            resampler = None
+            if index + 1 < len(sizes):
+                resampler = imaging.StreamingAreaResampler(level_width, level_height, *sizes[index + 1])
+            self.levels.append({
+                'width': level_width,
+                'height': level_height,
+                'tiles_x': -(-level_width // tile_size),
+                'tiles_y': -(-level_height // tile_size),
+                'rows': [],
+                'buffered': 0,
+                'tile_row': 0,
+                'resampler': resampler,
+            })
+
+        self._offsets = [np.zeros(level['tiles_x'] * level['tiles_y'], dtype='<u8') for level in self.levels]
+        self._file = open(filepath, 'wb')
+        self._file.write(_header(width, height, tile_size, compression))
+        self._table_position = self._file.tell()
+        self._file.write(b'\0' * 8 * sum(len(offsets) for offsets in self._offsets))
+
+    def _write_tile_row(self, index, rows):
+        level = self.levels[index]
+        tile_y = level['tile_row']
+        half = np.clip(rows, -HALF_MAX, HALF_MAX).astype('<f2')
+        for tile_x in range(level['tiles_x']):
+            x = tile_x * self.tile_size
+            # Channels are stored per tile line in name order, B G R
+            tile = half[:, x:x + self.tile_size, ::-1].transpose(0, 2, 1)
+            raw = np.ascontiguousarray(tile).tobytes()
+            data = _zip(raw) if self.compression == 'ZIP' else raw
+            if len(data) >= len(raw):
+                data = raw
+
+            self._offsets[index][tile_y * level['tiles_x'] + tile_x] = self._file.tell()
+            self._file.write(struct.pack('<iiiii', tile_x, tile_y, index, index, len(data)))
+            self._file.write(data)
+        level['tile_row'] += 1
+
+    def _feed_level(self, index, rows):
+        if not len(rows):
+            return
+        level = self.levels[index]
+        level['rows'].append(rows)
+        level['buffered'] += len(rows)
+
+        # Write every complete row of tiles, the last one may be shorter
+        remaining = level['height'] - level['tile_row'] * self.tile_size
+        while level['buffered'] >= min(self.tile_size, remaining) > 0:
+            buffered = np.concatenate(level['rows'])
+            take = min(self.tile_size, remaining)
+            self._write_tile_row(index, buffered[:take])
+            level['rows'] = [buffered[take:]]
+            level['buffered'] -= take
+            remaining -= take
+
+        if level['resampler']:
+            self._feed_level(index + 1, level['resampler'].feed(rows))
+
+    def write_rows(self, rows):
+        """Add the next rows of the full-size image, (rows, width, 3+) float"""
+        self._feed_level(0, np.asarray(rows, dtype=np.float32)[..., :3])
+
+    def close(self):
+        """Flush the smaller levels and write the offset table"""
+        for index, level in enumerate(self.levels):
+            if level['resampler']:
+                self._feed_level(index + 1, level['resampler'].finish())
+
+        self._file.seek(self._table_position)
+        for offsets in self._offsets:
+            self._file.write(offsets.tobytes())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_tiled_exr(filepath, pixels, tile_size=TILE_SIZE, compression='ZIP', band_rows=64):
+    """Write a (height, width, 3+) float array (top row first) as a tiled mip-mapped EXR"""
+    height, width = pixels.shape[:2]
+    with TiledEXRWriter(filepath, width, height, tile_size, compression) as writer:
+        for start in range(0, height, band_rows):
+            writer.write_rows(pixels[start:start + band_rows])
@@ -0,0 +1,251 @@
+"""
+Quick HDRI Controls - Radiance HDR reading and writing without bpy
+"""
+import numpy as np
+
+def _read_header(f):
+    """Parse the header and resolution line, returns (height, width, flip rows)"""
+    magic = f.readline()
+    if not magic.startswith((b'#?RADIANCE', b'#?RGBE')):
+        raise ValueError("Not a Radiance HDR file")
+
+    for line in iter(f.readline, b''):
+        line = line.strip()
+        if not line:
+            break
+        if line.startswith(b'FORMAT=') and line != b'FORMAT=32-bit_rle_rgbe':
+            raise ValueError(f"Unsupported HDR format {line[7:].decode(errors='replace')}")
+
+    parts = f.readline().split()
+    if len(parts) != 4 or parts[2] != b'+X' or parts[0] not in (b'-Y', b'+Y'):
+        raise ValueError("Unsupported HDR orientation")
+    return int(parts[1]), int(parts[3]), parts[0] == b'+Y'
+
+# Scanlines decoded or encoded together, bounds the index arrays for 16K maps
+BAND_ROWS = 64
+
+# Shortest repeat worth a run packet when encoding
+MIN_RUN = 4
+
+def _is_rle(width):
+    return 8 <= width < 0x8000
+
+def _decode_band(data, buffer, offset, width, rows):
+    """Decode a band of scanlines into (rows, width, 4) RGBE bytes.
+
+    Only the packet headers are walked in Python - each packet is recorded as
+    (source offset, length, literal) and all bytes of the band are gathered
+    with a single vectorized index.
+    """
+    starts = []
+    counts = []
+    literal = []
+    flat_rows = []
+
+    for row in range(rows):
+        if (_is_rle(width) and data[offset] == 2 and data[offset + 1] == 2 and
+                (data[offset + 2] << 8 | data[offset + 3]) == width):
+            offset += 4
+            x = 0
+            end = width * 4
+            while x < end:
+                count = data[offset]
+                if count > 128:
+                    count -= 128
+                    starts.append(offset + 1)
+                    literal.append(False)
+                    offset += 2
+                elif count:
+                    starts.append(offset + 1)
+                    literal.append(True)
+                    offset += count + 1
+                else:
+                    raise ValueError("Corrupt HDR scanline")
+                counts.append(count)
+                x += count
+            if x != end:
+                raise ValueError("Corrupt HDR scanline")
+        else:
+            # Flat scanline, stored pixel by pixel instead of channel by channel
+            starts.append(offset)
+            counts.append(width * 4)
+            literal.append(True)
+            flat_rows.append(row)
+            offset += width * 4
+
+    counts = np.asarray(counts, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    within = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(first, counts)
+    source = np.repeat(np.asarray(starts, dtype=np.int64), counts)
+    source += within * np.repeat(np.asarray(literal, dtype=bool), counts)
+
+    planar = buffer[source].reshape(rows, 4, width)
+    band = planar.transpose(0, 2, 1).copy()
+    for row in flat_rows:
+        band[row] = planar[row].reshape(width, 4)
+    return band, offset
+
+def _encode_band(rgbe):
+    """RLE encode a band of (rows, width, 4) RGBE scanlines, fully vectorized.
+
+    Each scanline is a 2, 2, width header and its four channels one after
+    another, split into run packets (128 + n, value) for repeats of MIN_RUN or
+    more and literal packets (n, bytes...) for everything else.
+    """
+    rows, width = rgbe.shape[:2]
+    channels = np.ascontiguousarray(rgbe.transpose(0, 2, 1)).ravel()
+    total = channels.size
+
+    # Runs of equal bytes, never crossing a channel row
+    change = np.ones(total, dtype=bool)
+    change[1:] = channels[1:] != channels[:-1]
+    change[::width] = True
+    run_starts = np.flatnonzero(change)
+    run_lengths = np.diff(np.append(run_starts, total))
+    long_starts = run_starts[run_lengths >= MIN_RUN]
+    long_ends = long_starts + run_lengths[run_lengths >= MIN_RUN]
+
+    # Segments are whole long runs or the literal stretches between them
+    boundary = np.zeros(total + 1, dtype=bool)
+    boundary[::width] = True
+    boundary[long_starts] = True
+    boundary[long_ends] = True
+    segment_starts = np.flatnonzero(boundary[:total])
+    segment_lengths = np.diff(np.append(segment_starts, total))
+    is_run = np.zeros(total, dtype=bool)
+    is_run[long_starts] = True
+    segment_run = is_run[segment_starts]
+
+    # Split segments into packets of at most 127 repeats or 128 literals
+    limit = np.where(segment_run, 127, 128)
+    packet_counts = -(-segment_lengths // limit)
+    packet_first = np.cumsum(packet_counts) - packet_counts
+    packet_index = np.arange(int(packet_counts.sum())) - np.repeat(packet_first, packet_counts)
+    packet_starts = np.repeat(segment_starts, packet_counts) + packet_index * np.repeat(limit, packet_counts)
+    packet_ends = np.minimum(np.repeat(segment_starts + segment_lengths, packet_counts),
+                             packet_starts + np.repeat(limit, packet_counts))
+    packet_lengths = packet_ends - packet_starts
+    packet_run = np.repeat(segment_run, packet_counts)
+
+    # Packet positions, with room for the header in front of every scanline
+    packet_bytes = np.where(packet_run, 2, packet_lengths + 1)
+    scanline = packet_starts // (width * 4)
+    positions = np.cumsum(packet_bytes) - packet_bytes + 4 * (scanline + 1)
+    scanline_bytes = np.bincount(scanline, weights=packet_bytes, minlength=rows).astype(np.int64)
+    header_positions = np.cumsum(scanline_bytes + 4) - (scanline_bytes + 4)
+
+    out = np.empty(int(packet_bytes.sum()) + 4 * rows, dtype=np.uint8)
+    out[header_positions] = 2
+    out[header_positions + 1] = 2
+    out[header_positions + 2] = width >> 8
+    out[header_positions + 3] = width & 0xff
+    out[positions] = np.where(packet_run, 128 + packet_lengths, packet_lengths)
+    out[positions[packet_run] + 1] = channels[packet_starts[packet_run]]
+
+    # Literal bytes keep their order, shifted by the headers before them
+    literal_lengths = np.where(packet_run, 0, packet_lengths)
+    literal_source = np.repeat(packet_starts, literal_lengths)
+    literal_first = np.cumsum(literal_lengths) - literal_lengths
+    literal_source += np.arange(literal_source.size) - np.repeat(literal_first, literal_lengths)
+    out[literal_source + np.repeat(positions + 1 - packet_starts, literal_lengths)] = channels[literal_source]
+    return out.tobytes()
+
+def rgbe_to_float(rgbe):
+    """Convert (..., 4) RGBE bytes to (..., 3) float32 radiance"""
+    exponent = rgbe[..., 3].astype(np.int32)
+    scale = np.where(exponent > 0, np.ldexp(1.0, exponent - 136), 0.0).astype(np.float32)
+    return rgbe[..., :3].astype(np.float32) * scale[..., None]
+
+def float_to_rgbe(rgb):
+    """Convert (..., 3) float radiance to (..., 4) RGBE bytes"""
+    rgb = np.maximum(np.asarray(rgb, dtype=np.float32)[..., :3], 0.0)
+    brightest = rgb.max(axis=-1)
+    mantissa, exponent = np.frexp(brightest)
+    scale = np.where(brightest > 1e-32, mantissa * 256.0 / np.maximum(brightest, 1e-32), 0.0)
+
+    rgbe = np.zeros(rgb.shape[:-1] + (4,), dtype=np.uint8)
+    rgbe[..., :3] = np.clip(rgb * scale[..., None], 0, 255).astype(np.uint8)
+    rgbe[..., 3] = np.where(brightest > 1e-32, exponent + 128, 0).astype(np.uint8)
+    return rgbe
+
+def read_header(filepath):
+    """(height, width, bottom-up) of a Radiance file without reading its pixels"""
+    with open(filepath, 'rb') as f:
+        return _read_header(f)
+
+def _max_band_bytes(width, rows):
+    """Upper bound of the encoded size of a band, RLE packets included"""
+    return rows * (4 + 4 * (width + -(-width // 128)))
+
+def iter_hdr_bands(filepath, band_rows=BAND_ROWS):
+    """Decode a Radiance file band by band, in file order.
+
+    Yields (height, width, bottom-up) first, then (band_rows, width, 3) float32
+    arrays. Only the encoded bytes of about one band are held at a time.
+    """
+    with open(filepath, 'rb') as f:
+        height, width, flip = _read_header(f)
+        yield height, width, flip
+
+        data = b''
+        for start in range(0, height, band_rows):
+            rows = min(band_rows, height - start)
+            wanted = _max_band_bytes(width, rows)
+            if len(data) < wanted:
+                data += f.read(wanted - len(data))
+            try:
+                band, offset = _decode_band(data, np.frombuffer(data, dtype=np.uint8), 0, width, rows)
+            except IndexError:
+                raise ValueError(f"Truncated HDR file, scanlines {start}-{start + rows - 1} of {height} are incomplete") from None
+            data = data[offset:]
+            yield rgbe_to_float(band)
+
+def read_hdr(filepath):
+    """Read a Radiance .hdr file into a (height, width, 3) float32 array, top row first.
+
+    Handles flat and new-style adaptive RLE scanlines.
+    """
+    bands = iter_hdr_bands(filepath)
+    height, width, flip = next(bands)
+
+    pixels = np.empty((height, width, 3), dtype=np.float32)
+    start = 0
+    for band in bands:
+        pixels[start:start + len(band)] = band
+        start += len(band)
+
+    return pixels[::-1] if flip else pixels
+
+class HDRWriter:
+    """Write a Radiance file incrementally, band by band in file order"""
+
+    def __init__(self, filepath, width, height, bottom_up=False, compress=True):
+        self.width = width
+        self.compress = compress and _is_rle(width)
+        self._file = open(filepath, 'wb')
+        self._file.write(b"#?RADIANCE\nFORMAT=32-bit_rle_rgbe\n\n")
+        self._file.write(f"{'+Y' if bottom_up else '-Y'} {height} +X {width}\n".encode())
+
+    def write_rows(self, pixels):
+        for start in range(0, len(pixels), BAND_ROWS):
+            rgbe = float_to_rgbe(pixels[start:start + BAND_ROWS])
+            self._file.write(_encode_band(rgbe) if self.compress else rgbe.tobytes())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_hdr(filepath, pixels, compress=True):
+    """Write a (height, width, 3+) float array (top row first) as a Radiance .hdr.
+
+    Scanlines are RLE compressed unless compress is False or the width
+    is outside the range the format allows for RLE.
+    """
+    height, width = pixels.shape[:2]
+    with HDRWriter(filepath, width, height, compress=compress) as writer:
+        writer.write_rows(pixels)
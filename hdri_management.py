@@ -5,21 +5,135 @@ import os
 import bpy
 import re
 import time
-from bpy.utils import previews
-from .utils import world_has_nodes
+from .utils import world_has_nodes, get_hdri_previews
 
 # Original paths tracking for proxies
 original_paths = {}
 
-def get_hdri_previews():
-    """Get or create the preview collection"""
-    if not hasattr(get_hdri_previews, "preview_collection"):
-        pcoll = previews.new()
-        get_hdri_previews.preview_collection = pcoll
-        get_hdri_previews.cached_dir = None
-        get_hdri_previews.cached_items = []
-        get_hdri_previews.last_update_time = None
-    return get_hdri_previews.preview_collection
+# Formats that are only ever shown through a generated thumbnail, never decoded as icons
+HDRI_EXTENSIONS = ('.hdr', '.exr')
+
+# Background icon loading - seconds of work per timer tick and delay between ticks
+ICON_LOAD_BUDGET = 0.02
+ICON_LOAD_INTERVAL = 0.05
+
+# Ordered (preview key, candidate thumbnail paths) pairs waiting to be loaded, in grid order
+_icon_queue = []
+
+PLACEHOLDER_ICON = "__qhdri_placeholder__"
+
+def get_icon_sources():
+    """Map of preview key -> (loaded source or None, folder mtime when checked)"""
+    if not hasattr(get_hdri_previews, "icon_sources"):
+        get_hdri_previews.icon_sources = {}
+    return get_hdri_previews.icon_sources
+
+def get_placeholder_icon(pcoll):
+    """Get the icon id of a flat placeholder shown while real icons load"""
+    if PLACEHOLDER_ICON not in pcoll:
+        preview = pcoll.new(PLACEHOLDER_ICON)
+        preview.image_size = (4, 3)
+        preview.image_pixels_float.foreach_set([0.18, 0.18, 0.18, 1.0] * 12)
+        preview.icon_size = (4, 3)
+        preview.icon_pixels_float.foreach_set([0.18, 0.18, 0.18, 1.0] * 12)
+    return pcoll[PLACEHOLDER_ICON].icon_id
+
+def _folder_mtime(folder, cache):
+    if folder not in cache:
+        try:
+            cache[folder] = os.path.getmtime(folder)
+        except OSError:
+            cache[folder] = None
+    return cache[folder]
+
+def _create_ldr_thumbnail(image_path, thumb_paths):
+    """Downscale an LDR map into its thumbnails and return the preferred one that exists"""
+    from . import thumbnails
+    try:
+        preferences = bpy.context.preferences.addons[__package__.split('.')[0]].preferences
+        thumbnails.write_downscaled_thumbnail(image_path,
+                                              preferences.thumbnail_format,
+                                              preferences.thumbnail_max_width)
+    except Exception as e:
+        print(f"Error creating thumbnail for {image_path}: {str(e)}")
+        return None
+    return next((path for path in thumb_paths if os.path.exists(path)), None)
+
+def queue_icon_loads(pending):
+    """Replace the background icon queue with the current grid order and start loading"""
+    _icon_queue[:] = pending
+    if _icon_queue and not bpy.app.timers.is_registered(process_icon_queue):
+        bpy.app.timers.register(process_icon_queue, first_interval=ICON_LOAD_INTERVAL)
+
+def process_icon_queue():
+    """Timer callback that loads queued icons within a small time budget per tick"""
+    pcoll = get_hdri_previews()
+    icon_sources = get_icon_sources()
+    folder_mtimes = {}
+    loaded = set()
+    start = time.perf_counter()
+
+    processed = 0
+    while _icon_queue and time.perf_counter() - start < ICON_LOAD_BUDGET:
+        hdri_path, thumb_paths = _icon_queue[0]
+        if hdri_path in pcoll:
+            _icon_queue.pop(0)
+            continue
+
+        folder_mtime = _folder_mtime(os.path.dirname(hdri_path), folder_mtimes)
+        thumb_path = next((path for path in thumb_paths if os.path.exists(path)), None)
+
+        downscaled = False
+        if not thumb_path and not hdri_path.lower().endswith(HDRI_EXTENSIONS):
+            # LDR maps get their cached thumbnails from a one-time downscale. Decoding the
+            # full-size map is the slowest step in this queue, so it only runs as the first
+            # work of a tick and ends the tick - later items wait for the next one
+            if processed:
+                break
+            thumb_path = _create_ldr_thumbnail(hdri_path, thumb_paths)
+            downscaled = True
+
+        _icon_queue.pop(0)
+        processed += 1
+
+        if thumb_path:
+            source = thumb_path
+        else:
+            # Never decode a full HDRI for an icon - keep the placeholder
+            icon_sources[hdri_path] = (None, folder_mtime)
+            if downscaled:
+                break
+            continue
+
+        try:
+            pcoll.load(hdri_path, source, 'IMAGE')
+            icon_sources[hdri_path] = (source, folder_mtime)
+            loaded.add(hdri_path)
+        except Exception as e:
+            print(f"Error loading icon for {hdri_path}: {str(e)}")
+            icon_sources[hdri_path] = (None, folder_mtime)
+
+        if downscaled:
+            break
+
+    if loaded:
+        # Swap the placeholders of the cached enum items for the real icons
+        cached_items = getattr(get_hdri_previews, "cached_items", None)
+        if cached_items:
+            get_hdri_previews.cached_items = [
+                (item[0], item[1], item[2], pcoll[item[0]].icon_id, item[4])
+                if item[0] in loaded else item
+                for item in cached_items
+            ]
+
+        try:
+            for window in bpy.context.window_manager.windows:
+                for area in window.screen.areas:
+                    area.tag_redraw()
+        except Exception:
+            pass
+
+    return ICON_LOAD_INTERVAL if _icon_queue else None
 
 def generate_previews(self, context):
     """Generate preview items for HDRIs in current folder with favorites support"""
@@ -126,46 +240,70 @@ def generate_previews(self, context):
                         original_paths[os.path.basename(filename)] = file_path
                         hdri_files.append((filename, file_path))
 
-        # Process thumbnails and create enum items
+        icon_sources = get_icon_sources()
+
+        # Pick the thumbnail size matching the drawn icon size, reload everything when it changes
+        from . import thumbnails
+        use_small = thumbnails.use_small_thumbnails(preferences.preview_scale,
+                                                    context.preferences.system.ui_scale)
+        if getattr(get_hdri_previews, "use_small_thumbs", use_small) != use_small:
+            pcoll.clear()
+            icon_sources.clear()
+        get_hdri_previews.use_small_thumbs = use_small
+
+        # Slice the folder atlas into icons in one read before falling back to single files
+        if use_small and preferences.use_thumbnail_atlas and not search_query and not show_favorites_only:
+            for hdri_path, atlas_path in thumbnails.load_atlas_icons(
+                    current_dir, pcoll, [hdri_path for _, hdri_path in hdri_files]).items():
+                icon_sources[hdri_path] = (atlas_path, None)
+
+        # Return every item immediately - missing icons show a placeholder and load in the background
+        placeholder_id = get_placeholder_icon(pcoll)
+        folder_mtimes = {}
+        pending = []
+
         for idx, (filename, hdri_path) in enumerate(hdri_files, 1):
             try:
                 base_name = os.path.splitext(filename)[0]
-                thumb_path = os.path.join(os.path.dirname(hdri_path), f"{base_name}_thumb.png")
-
-                # Load thumbnail
-                if hdri_path in pcoll:
-                    existing = pcoll[hdri_path]
-                    # If thumb exists but the cached icon was loaded from the raw file, evict it
-                    thumb_exists = os.path.exists(thumb_path)
-                    loaded_from_raw = getattr(existing, 'filepath', hdri_path) == hdri_path
-                    if thumb_exists and loaded_from_raw:
+                source, checked_mtime = icon_sources.get(hdri_path, (None, None))
+
+                # Icons loaded from the raw file or found missing are rechecked once the folder changes
+                needs_check = hdri_path not in pcoll or source == hdri_path
+                if needs_check and hdri_path in icon_sources:
+                    needs_check = checked_mtime != _folder_mtime(os.path.dirname(hdri_path), folder_mtimes)
+
+                if needs_check:
+                    if hdri_path in pcoll:
                         pcoll.pop(hdri_path)  # evict stale entry so it reloads with thumb
+                    thumb_path = thumbnails.get_thumb_path(hdri_path)
+                    if use_small:
+                        pending.append((hdri_path, (thumbnails.get_small_thumb_path(hdri_path), thumb_path)))
+                    else:
+                        pending.append((hdri_path, (thumb_path,)))
 
-                if hdri_path not in pcoll:
-                    thumb = pcoll.load(hdri_path, thumb_path if os.path.exists(thumb_path) else hdri_path, 'IMAGE')
-                else:
-                    thumb = pcoll[hdri_path]
+                icon_id = pcoll[hdri_path].icon_id if hdri_path in pcoll else placeholder_id
 
-                if thumb and thumb.icon_id:
-                    # Store the original path when creating enum items
-                    original_paths[hdri_path] = hdri_path
+                # Store the original path when creating enum items
+                original_paths[hdri_path] = hdri_path
 
-                    # Check if this HDRI is a favorite
-                    is_favorite = os.path.normpath(hdri_path) in favorites_list
+                # Check if this HDRI is a favorite
+                is_favorite = os.path.normpath(hdri_path) in favorites_list
 
-                    # Create enum item with original path as identifier
-                    enum_items.append((
-                        hdri_path,  # Always use original path as identifier
-                        base_name,
-                        "HDRI file" + (" ★" if is_favorite else ""),
-                        thumb.icon_id,
-                        idx
-                    ))
+                # Create enum item with original path as identifier
+                enum_items.append((
+                    hdri_path,  # Always use original path as identifier
+                    base_name,
+                    "HDRI file" + (" ★" if is_favorite else ""),
+                    icon_id,
+                    idx
+                ))
 
             except Exception as e:
                 print(f"Error processing {filename}: {str(e)}")
                 continue
 
+        queue_icon_loads(pending)
+
     except Exception as e:
         print(f"Error scanning directory: {str(e)}")
 
@@ -0,0 +1,216 @@
+"""
+Quick HDRI Controls - Pure NumPy image encoding helpers
+"""
+import struct
+import zlib
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _png_chunk(tag, data):
+    return (struct.pack(">I", len(data)) + tag + data +
+            struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff))
+
+def quantize_palette(rgb, colors=256):
+    """Reduce an 8-bit RGB image to an indexed image with at most `colors` entries.
+
+    Colours are binned at 5 bits per channel, the most populated bins become the
+    palette (bin mean colour) and every bin maps to its nearest palette entry.
+    Returns (indices (h, w) uint8, palette (n, 3) uint8).
+    """
+    rgb = np.asarray(rgb, dtype=np.uint8)[..., :3]
+    bins = ((rgb[..., 0].astype(np.int32) >> 3) << 10 |
+            (rgb[..., 1].astype(np.int32) >> 3) << 5 |
+            (rgb[..., 2].astype(np.int32) >> 3)).ravel()
+
+    counts = np.bincount(bins, minlength=32768)
+    sums = np.stack([np.bincount(bins, weights=rgb[..., c].ravel(), minlength=32768)
+                     for c in range(3)], axis=1)
+
+    occupied = np.nonzero(counts)[0]
+    bin_colors = (sums[occupied] / counts[occupied, None]).astype(np.float32)
+    top = np.argsort(counts[occupied], kind='stable')[::-1][:colors]
+    palette = bin_colors[top]
+
+    # Nearest palette entry per occupied bin, in chunks to bound memory
+    lut = np.zeros(32768, dtype=np.uint8)
+    for start in range(0, len(occupied), 4096):
+        chunk = bin_colors[start:start + 4096]
+        distance = ((chunk[:, None, :] - palette[None, :, :]) ** 2).sum(axis=-1)
+        lut[occupied[start:start + 4096]] = distance.argmin(axis=1)
+
+    indices = lut[bins].reshape(rgb.shape[:2])
+    return indices, np.clip(np.round(palette), 0, 255).astype(np.uint8)
+
+def encode_png_palette(indices, palette, transparent_index=None, level=9):
+    """Encode an indexed image as PNG bytes (colour type 3, 8-bit)"""
+    height, width = indices.shape
+    # Filter type 0 on every scanline, as recommended for palette images
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = indices
+
+    data = PNG_SIGNATURE
+    data += _png_chunk(b'IHDR', struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+    data += _png_chunk(b'PLTE', np.ascontiguousarray(palette, dtype=np.uint8).tobytes())
+    if transparent_index is not None:
+        alpha = np.full(transparent_index + 1, 255, dtype=np.uint8)
+        alpha[transparent_index] = 0
+        data += _png_chunk(b'tRNS', alpha.tobytes())
+    data += _png_chunk(b'IDAT', zlib.compress(raw.tobytes(), level))
+    data += _png_chunk(b'IEND', b'')
+    return data
+
+def write_png_palette(filepath, rgba, colors=256, level=9):
+    """Quantize an 8-bit RGBA/RGB image (top row first) and write it as palette PNG.
+
+    Pixels with alpha below 128 share a single fully transparent palette entry.
+    """
+    rgba = np.asarray(rgba, dtype=np.uint8)
+    transparent = None
+    if rgba.shape[-1] == 4:
+        mask = rgba[..., 3] < 128
+        if mask.any():
+            transparent = mask
+
+    if transparent is None:
+        indices, palette = quantize_palette(rgba, colors)
+        data = encode_png_palette(indices, palette, level=level)
+    else:
+        # Reserve index 0 for transparent pixels
+        indices, palette = quantize_palette(rgba, colors - 1)
+        indices = indices + 1
+        indices[transparent] = 0
+        palette = np.vstack([np.zeros((1, 3), dtype=np.uint8), palette])
+        data = encode_png_palette(indices, palette, transparent_index=0, level=level)
+
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+def resample_axis(array, new_length, axis=0):
+    """Area-average resample along one axis using prefix sums.
+
+    Each output sample is the exact mean of the source interval it covers,
+    including partial samples at fractional boundaries, so total energy is kept.
+    """
+    length = array.shape[axis]
+    if new_length == length:
+        return array.astype(np.float32, copy=False)
+
+    # Whole-number ratios reduce to a plain block mean
+    if length % new_length == 0:
+        factor = length // new_length
+        shape = array.shape[:axis] + (new_length, factor) + array.shape[axis + 1:]
+        return array.reshape(shape).mean(axis=axis + 1, dtype=np.float32)
+
+    shape = list(array.shape)
+    shape[axis] = length + 1
+    cumulative = np.zeros(shape, dtype=np.float64)
+    tail = [slice(None)] * array.ndim
+    tail[axis] = slice(1, None)
+    np.cumsum(array, axis=axis, dtype=np.float64, out=cumulative[tuple(tail)])
+
+    scale = length / new_length
+    edges = np.arange(new_length + 1, dtype=np.float64) * scale
+    lower = np.minimum(np.floor(edges).astype(np.int64), length)
+    upper = np.minimum(lower + 1, length)
+    broadcast = [1] * array.ndim
+    broadcast[axis] = new_length + 1
+    fraction = (edges - lower).reshape(broadcast)
+
+    below = np.take(cumulative, lower, axis=axis)
+    integral = below + (np.take(cumulative, upper, axis=axis) - below) * fraction
+    return (np.diff(integral, axis=axis) / scale).astype(np.float32)
+
+def area_resample(pixels, new_width, new_height, chunk=128):
+    """Area-average resample a (height, width, channels) image.
+
+    Width is reduced first in bands of rows, then height in bands of columns,
+    which bounds the float64 prefix-sum buffers for 16K sources.
+    """
+    height, width = pixels.shape[:2]
+
+    reduced = np.empty((height, new_width) + pixels.shape[2:], dtype=np.float32)
+    for start in range(0, height, chunk):
+        reduced[start:start + chunk] = resample_axis(pixels[start:start + chunk], new_width, axis=1)
+
+    result = np.empty((new_height, new_width) + pixels.shape[2:], dtype=np.float32)
+    for start in range(0, new_width, chunk):
+        result[:, start:start + chunk] = resample_axis(reduced[:, start:start + chunk], new_height, axis=0)
+    return result
+
+def bilinear_resample(pixels, new_width, new_height):
+    """Bilinear resample a (height, width, ...) array with pixel centres aligned, for upscaling"""
+    height, width = pixels.shape[:2]
+    y = np.clip((np.arange(new_height) + 0.5) * height / new_height - 0.5, 0, height - 1)
+    x = np.clip((np.arange(new_width) + 0.5) * width / new_width - 0.5, 0, width - 1)
+    y0 = np.floor(y).astype(np.int64)
+    x0 = np.floor(x).astype(np.int64)
+    y1 = np.minimum(y0 + 1, height - 1)
+    x1 = np.minimum(x0 + 1, width - 1)
+
+    trailing = (1,) * (pixels.ndim - 2)
+    fy = (y - y0).astype(np.float32).reshape((new_height, 1) + trailing)
+    fx = (x - x0).astype(np.float32).reshape((1, new_width) + trailing)
+
+    top = pixels[y0]
+    bottom = pixels[y1]
+    top = top[:, x0] * (1.0 - fx) + top[:, x1] * fx
+    bottom = bottom[:, x0] * (1.0 - fx) + bottom[:, x1] * fx
+    return (top * (1.0 - fy) + bottom * fy).astype(np.float32)
+
+class StreamingAreaResampler:
+    """Area-average downsample of an image fed in bands of rows.
+
+    Each band is reduced horizontally straight away, and its rows are spread
+    over the output rows they overlap. Finished output rows are returned as
+    soon as the input covering them has been seen, so only a band of input
+    and one or two partial output rows are held at any time.
+    """
+
+    def __init__(self, width, height, new_width, new_height, channels=3):
+        self.new_width = new_width
+        self.new_height = new_height
+        self.scale = height / new_height
+        self.channels = channels
+        self._row = 0  # next input row
+        self._emitted = 0  # output rows already returned
+        self._partial = np.zeros((0, new_width, channels), dtype=np.float32)
+
+    def feed(self, band):
+        """Add the next input rows, returns the output rows completed by them"""
+        rows = len(band)
+        reduced = resample_axis(band[..., :self.channels], self.new_width, axis=1)
+
+        y = np.arange(self._row, self._row + rows, dtype=np.float64)
+        first = np.floor(y / self.scale).astype(np.int64)
+        last = np.minimum(np.ceil((y + 1) / self.scale).astype(np.int64) - 1, self.new_height - 1)
+        first = np.minimum(first, last)
+        split = (first + 1) * self.scale
+        upper = np.where(last > first, (y + 1 - split) / self.scale, 0.0)
+        lower = np.where(last > first, (split - y) / self.scale, 1.0 / self.scale)
+
+        # Output rows touched by this band, the partial ones carried over first
+        base = self._emitted
+        count = int(last.max()) - base + 1
+        weights = np.zeros((count, rows), dtype=np.float32)
+        np.add.at(weights, (first - base, np.arange(rows)), lower)
+        np.add.at(weights, (last - base, np.arange(rows)), upper)
+
+        accumulated = (weights @ reduced.reshape(rows, -1)).reshape(count, self.new_width, self.channels)
+        accumulated[:len(self._partial)] += self._partial
+        self._row += rows
+
+        # Rows whose whole input interval has been consumed are final
+        complete = min(int(np.floor(self._row / self.scale + 1e-9)), self.new_height) - base
+        complete = max(complete, 0)
+        self._partial = accumulated[complete:]
+        self._emitted += complete
+        return accumulated[:complete]
+
+    def finish(self):
+        """Remaining output rows once every input row was fed"""
+        rest = self._partial[:self.new_height - (self._emitted)]
+        self._emitted += len(rest)
+        self._partial = self._partial[len(rest):]
+        return rest
@@ -11,6 +11,7 @@ import shutil
 import tempfile
 import threading
 import glob
+import time
 from datetime import datetime
 from math import radians, degrees
 from bpy.types import Operator
@@ -758,11 +759,48 @@ class HDRI_OT_cleanup_hdri_proxies(Operator):
                         except Exception as e:
                             self.report({'ERROR'}, f"Failed to remove proxy folder: {proxy_dir} ({str(e)})")
 
+            # Empty the central store too, keeping its hash index
+            from . import proxy_cache, proxy_store
+            store_dir = proxy_store.get_store_directory()
+            if os.path.isdir(store_dir):
+                for entry in os.listdir(store_dir):
+                    entry_path = os.path.join(store_dir, entry)
+                    if os.path.isdir(entry_path):
+                        shutil.rmtree(entry_path, ignore_errors=True)
+                self.report({'INFO'}, f"Emptied central proxy store: {store_dir}")
+
+            proxy_cache.clear()
+
             return {'FINISHED'}
         except Exception as e:
             self.report({'ERROR'}, f"Failed to clean proxy cache: {str(e)}")
             return {'CANCELLED'}
 
+class HDRI_OT_verify_proxies(Operator):
+    bl_idname = "world.verify_hdri_proxies"
+    bl_label = "Verify Proxies"
+    bl_description = "Find proxies whose original HDRI changed since they were generated and regenerate them in the background"
+
+    def execute(self, context):
+        try:
+            from . import utils, proxy_manifest
+            addon_name = utils.get_addon_name()
+            preferences = context.preferences.addons[addon_name].preferences
+            hdri_dir = os.path.normpath(os.path.abspath(preferences.hdri_directory))
+
+            stale = proxy_manifest.find_stale_proxies(hdri_dir)
+            for original_path, resolution, proxy_path in stale:
+                proxy_manifest.queue_regeneration(original_path, resolution, proxy_path)
+
+            if stale:
+                self.report({'INFO'}, f"Checking and regenerating {len(stale)} possibly out of date proxies")
+            else:
+                self.report({'INFO'}, "All proxies are up to date")
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to verify proxies: {str(e)}")
+            return {'CANCELLED'}
+
 class HDRI_OT_clear_proxy_stats(Operator):
     bl_idname = "world.clear_proxy_stats"
     bl_label = "Clear Proxy Generation Stats"
@@ -776,6 +814,7 @@ class HDRI_OT_clear_proxy_stats(Operator):
         preferences.proxy_stats_completed = 0
         preferences.proxy_stats_failed = 0
         preferences.proxy_stats_time = 0.0
+        preferences.proxy_stats_throughput = 0.0
         preferences.proxy_stats_current_file = ""
         preferences.is_proxy_generating = False
         return {'FINISHED'}
@@ -1530,13 +1569,8 @@ class HDRI_OT_generate_previews(Operator):
     bl_description = "Generate thumbnails for HDRI files"
 
     def get_thumb_path(self, hdri_path):
-        hdri_path = os.path.abspath(hdri_path)
-        directory = os.path.dirname(hdri_path)
-        filename = os.path.basename(hdri_path)
-        base_name = os.path.splitext(filename)[0]
-        return os.path.join(directory, f"{base_name}_thumb.png")
-
-        return thumb_path
+        from . import thumbnails
+        return thumbnails.get_thumb_path(hdri_path)
 
     def initialize_stats(self, context):
         from . import utils
@@ -1546,6 +1580,7 @@ class HDRI_OT_generate_previews(Operator):
         preferences.preview_stats_completed = 0
         preferences.preview_stats_failed = 0
         preferences.preview_stats_time = 0.0
+        preferences.preview_stats_throughput = 0.0
         preferences.preview_stats_current_file = ""
         preferences.is_generating = True
         preferences.preview_image = ""  # Clear any existing preview
@@ -1564,6 +1599,9 @@ class HDRI_OT_generate_previews(Operator):
 
         preferences.preview_stats_current_file = os.path.basename(current_file)
         preferences.preview_stats_time = (datetime.now() - self._start_time).total_seconds()
+        if preferences.preview_stats_time > 0:
+            processed = preferences.preview_stats_completed + preferences.preview_stats_failed
+            preferences.preview_stats_throughput = processed / preferences.preview_stats_time
 
         # Force redraw of all UI
         for window in context.window_manager.windows:
@@ -1577,24 +1615,42 @@ class HDRI_OT_generate_previews(Operator):
         preferences = context.preferences.addons[addon_name].preferences
 
         if event.type == 'TIMER':
-            if self._current_file_index >= self._total_files:
-                self.finish_preview_generation(context)
-                return {'FINISHED'}
+            from . import batch_jobs
 
-            current_hdri = self._preview_files[self._current_file_index]
-            success = self.generate_single_preview(context, current_hdri)
+            # Process as many files as fit in the tick budget, always at least one
+            tick_start = time.perf_counter()
+            tick_budget = preferences.batch_tick_budget_ms / 1000.0
 
-            if not success:
-                self._failed_files.append(current_hdri)
+            while True:
+                if self._current_file_index >= self._total_files:
+                    self.finish_preview_generation(context)
+                    return {'FINISHED'}
 
-            # Update statistics
-            self.update_stats(context, success, current_hdri)
+                # Keep the browsed folder, search results and favorites at the front of the queue
+                batch_jobs.reprioritize_remaining(self, context, self._preview_files,
+                                                  self._current_file_index, preferences.hdri_directory)
 
-            # Update progress
-            progress = (self._current_file_index + 1) / self._total_files
-            context.window_manager.progress_update(progress * 100)
+                current_hdri = self._preview_files[self._current_file_index]
+                success = self.generate_single_preview(context, current_hdri)
+
+                if not success:
+                    self._failed_files.append(current_hdri)
 
-            self._current_file_index += 1
+                # Update statistics
+                self.update_stats(context, success, current_hdri)
+
+                # Record progress so an interrupted batch can resume
+                if getattr(self, '_journal_kind', None):
+                    batch_jobs.record_entry(self._journal_kind, current_hdri, success)
+
+                # Update progress
+                progress = (self._current_file_index + 1) / self._total_files
+                context.window_manager.progress_update(progress * 100)
+
+                self._current_file_index += 1
+
+                if time.perf_counter() - tick_start >= tick_budget:
+                    break
 
             # Force redraw of preferences window
             for window in context.window_manager.windows:
@@ -1622,8 +1678,9 @@ class HDRI_OT_generate_previews(Operator):
             if not os.path.exists(preferences.preview_single_file):
                 self.report({'ERROR'}, "Selected file does not exist")
                 return {'CANCELLED'}
-            if not preferences.preview_single_file.lower().endswith(('.hdr', '.exr')):
-                self.report({'ERROR'}, "Selected file must be an HDR or EXR file")
+            from . import thumbnails
+            if not preferences.preview_single_file.lower().endswith(thumbnails.get_preview_extensions(preferences)):
+                self.report({'ERROR'}, "Selected file must be an HDR or EXR file, or an enabled PNG/JPG")
                 return {'CANCELLED'}
         else:  # MULTIPLE mode
             if not preferences.preview_multiple_folder:
@@ -1638,6 +1695,7 @@ class HDRI_OT_generate_previews(Operator):
 
         self._failed_files = []
         self._current_file_index = 0
+        self._journal_kind = None
 
         if preferences.preview_generation_type == 'SINGLE':
             self._preview_files = [preferences.preview_single_file]
@@ -1679,6 +1737,12 @@ class HDRI_OT_generate_previews(Operator):
         preferences.preview_stats_failed = total_failed
         preferences.is_generating = False
 
+        # The batch ran to completion, its journal is no longer needed
+        from . import batch_jobs
+        if getattr(self, '_journal_kind', None):
+            batch_jobs.finish_job(self._journal_kind)
+        batch_jobs.revert_settings(preferences, getattr(self, '_previous_settings', None))
+
         if self._failed_files:
             failed_names = [os.path.basename(f) for f in self._failed_files]
             self.report({'WARNING'},
@@ -1687,6 +1751,12 @@ class HDRI_OT_generate_previews(Operator):
             self.report({'INFO'},
                 f"Successfully generated {total_successful} previews")
 
+        # Repack the atlas of every folder that received new thumbnails
+        if preferences.use_thumbnail_atlas:
+            from . import thumbnails
+            for folder in sorted({os.path.dirname(os.path.abspath(f)) for f in self._preview_files}):
+                thumbnails.build_folder_atlas(folder)
+
         # Clear the preview collection to force a clean reload
         from .utils import get_hdri_previews
         if hasattr(get_hdri_previews, "preview_collection"):
@@ -1703,20 +1773,101 @@ class HDRI_OT_generate_previews(Operator):
             context.window_manager.event_timer_remove(self._timer)
         context.window_manager.progress_end()
 
+        # A resumed run put the job's settings in place, give the user theirs back
+        from . import utils, batch_jobs
+        preferences = context.preferences.addons[utils.get_addon_name()].preferences
+        batch_jobs.revert_settings(preferences, getattr(self, '_previous_settings', None))
+
     def get_hdri_files(self, folder):
-        supported_extensions = ['.hdr', '.exr']
+        from . import utils, thumbnails
+        preferences = bpy.context.preferences.addons[utils.get_addon_name()].preferences
+        supported_extensions = thumbnails.get_preview_extensions(preferences)
         return [
             os.path.join(folder, f)
             for f in os.listdir(folder)
             if os.path.isfile(os.path.join(folder, f))
             and os.path.splitext(f)[1].lower() in supported_extensions
+            and not thumbnails.is_thumbnail_file(f)
         ]
 
+    def get_preview_source(self, preferences, hdri_path):
+        """Image to light the preview with - a small proxy when enabled so cost doesn't scale with the source"""
+        from . import utils
+        if preferences.preview_use_proxy:
+            # A proxy locked by another instance isn't waited for, the original is used instead
+            proxy_path = utils.create_hdri_proxy(hdri_path, preferences.preview_proxy_resolution, timeout=0)
+            if proxy_path and os.path.exists(proxy_path):
+                return proxy_path
+        return hdri_path
+
+    def generate_analytic_preview(self, context, hdri_path):
+        """Compute mirror/diffuse ball thumbnails with NumPy instead of a Cycles render"""
+        from . import utils, thumbnails, analytic_previews
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        source_path = self.get_preview_source(preferences, hdri_path)
+
+        width = int(1024 * preferences.preview_resolution / 100)
+        height = int(768 * preferences.preview_resolution / 100)
+        if not analytic_previews.render_preview(source_path, self.get_thumb_path(hdri_path), width, height):
+            return False
+
+        thumbnails.store_rendered_thumbnails(hdri_path,
+                                             preferences.thumbnail_format,
+                                             preferences.thumbnail_max_width)
+        return True
+
+    def generate_transfer_preview(self, context, hdri_path):
+        """Relight the baked preview scene with NumPy, None when no bake exists"""
+        from . import utils, thumbnails, preview_transfer
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        support_blend_path = utils.get_support_blend_path()
+        if not support_blend_path:
+            return None
+
+        transfer = preview_transfer.load_transfer(
+            preview_transfer.get_transfer_path(support_blend_path, preferences.preview_scene_type))
+        if transfer is None:
+            return None
+
+        # The bake has a fixed size, relit thumbnails are resized to the preview resolution
+        source_path = self.get_preview_source(preferences, hdri_path)
+        width = int(1024 * preferences.preview_resolution / 100)
+        height = int(768 * preferences.preview_resolution / 100)
+        if not preview_transfer.render_preview(transfer, source_path, self.get_thumb_path(hdri_path), width, height):
+            return False
+
+        thumbnails.store_rendered_thumbnails(hdri_path,
+                                             preferences.thumbnail_format,
+                                             preferences.thumbnail_max_width)
+        return True
+
     def generate_single_preview(self, context, hdri_path):
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
 
+        # LDR maps only need a downscale, never a render
+        from . import thumbnails
+        if thumbnails.is_ldr(hdri_path):
+            return thumbnails.write_downscaled_thumbnail(hdri_path,
+                                                         preferences.thumbnail_format,
+                                                         preferences.thumbnail_max_width) is not None
+
+        # Analytic orbs skip the Cycles preview scene entirely
+        if preferences.preview_render_method == 'ANALYTIC':
+            return self.generate_analytic_preview(context, hdri_path)
+
+        # Relit previews need a bake of the preview scene, fall back to Cycles without one
+        if preferences.preview_render_method == 'PRT':
+            result = self.generate_transfer_preview(context, hdri_path)
+            if result is not None:
+                return result
+            print("No baked preview transfer found, rendering with Cycles")
+
         # Get the support.blend path
         from .utils import get_support_blend_path
         support_blend_path = get_support_blend_path()
@@ -1785,10 +1936,13 @@ class HDRI_OT_generate_previews(Operator):
                     print("Falling back to CPU rendering")
                     preview_scene.cycles.device = 'CPU'
 
+            # Render from a small proxy so load time doesn't scale with the source resolution
+            render_path = self.get_preview_source(preferences, hdri_path)
+
             # Load the HDRI image
             hdri_image = None
             try:
-                hdri_image = bpy.data.images.load(hdri_path, check_existing=True)
+                hdri_image = bpy.data.images.load(render_path, check_existing=True)
             except Exception as e:
                 print(f"Failed to load HDRI image: {e}")
                 return False
@@ -1865,6 +2019,12 @@ class HDRI_OT_generate_previews(Operator):
             # Render
             bpy.ops.render.render(write_still=True, scene=preview_scene.name)
 
+            # Grid-size thumbnail from the same render for small icon scales, both stored in the chosen format
+            from . import thumbnails
+            thumbnails.store_rendered_thumbnails(hdri_path,
+                                                 preferences.thumbnail_format,
+                                                 preferences.thumbnail_max_width)
+
             return True
 
         except Exception as e:
@@ -1876,12 +2036,23 @@ class HDRI_OT_full_batch_previews(Operator):
     bl_label = "Full Batch Preview Generation"
     bl_description = "Generate previews for all HDRIs in all subfolders"
 
+    resume: BoolProperty(
+        name="Resume",
+        description="Continue the interrupted batch recorded in the job journal",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+
     def invoke(self, context, event):
+        if self.resume:
+            return self.execute(context)
+
         message = (
             "⚠️ Batch Process can take several minutes to hours ⚠️\n"
             "• Network speeds affect processing time if using NAS\n\n"
             "🔧 Process Details 🔧\n"
             "• Creates thumbnails for ALL .hdr and .exr files\n"
+            "• PNG/JPG maps (when enabled) are downscaled, not rendered\n"
             "• Searches entire HDRI directory structure\n\n"
             "📊 Settings 📊\n"
             "• Remember to adjust Quality settings!\n\n"
@@ -1895,6 +2066,10 @@ class HDRI_OT_full_batch_previews(Operator):
         )
 
     def get_all_hdri_files(self, base_dir):
+        from . import utils, thumbnails
+        preferences = bpy.context.preferences.addons[utils.get_addon_name()].preferences
+        extensions = thumbnails.get_preview_extensions(preferences)
+
         hdri_files = []
         for root, dirs, files in os.walk(base_dir):
             # Skip 'proxies' folders
@@ -1902,7 +2077,7 @@ class HDRI_OT_full_batch_previews(Operator):
                 dirs.remove('proxies')
 
             for f in files:
-                if f.lower().endswith(('.hdr', '.exr')):
+                if f.lower().endswith(extensions) and not thumbnails.is_thumbnail_file(f):
                     hdri_files.append(os.path.join(root, f))
         return hdri_files
 
@@ -1916,11 +2091,30 @@ class HDRI_OT_full_batch_previews(Operator):
             self.report({'ERROR'}, "HDRI directory not set or invalid")
             return {'CANCELLED'}
 
-        # Get all HDRI files recursively
-        self._preview_files = self.get_all_hdri_files(base_dir)
-        if not self._preview_files:
-            self.report({'ERROR'}, "No HDR or EXR files found")
-            return {'CANCELLED'}
+        from . import batch_jobs
+        self._journal_kind = batch_jobs.JOB_PREVIEWS
+
+        if self.resume:
+            job = batch_jobs.load_job(batch_jobs.JOB_PREVIEWS)
+            if not job:
+                self.report({'ERROR'}, "No interrupted preview batch to resume")
+                return {'CANCELLED'}
+            # The job's settings only apply to this run, finish and cancel put the user's back
+            self._previous_settings = batch_jobs.restore_settings(batch_jobs.JOB_PREVIEWS, job, preferences)
+            self._preview_files = [f for f in batch_jobs.get_pending_files(job) if os.path.exists(f)]
+            if not self._preview_files:
+                batch_jobs.revert_settings(preferences, self._previous_settings)
+                batch_jobs.finish_job(batch_jobs.JOB_PREVIEWS)
+                self.report({'INFO'}, "Preview batch already complete")
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"Resuming preview batch: {len(self._preview_files)} of {len(job['files'])} files remaining")
+        else:
+            # Get all HDRI files recursively
+            self._preview_files = self.get_all_hdri_files(base_dir)
+            if not self._preview_files:
+                self.report({'ERROR'}, "No HDR or EXR files found")
+                return {'CANCELLED'}
+            batch_jobs.start_job(batch_jobs.JOB_PREVIEWS, self._preview_files, preferences)
 
         self._failed_files = []
         self._current_file_index = 0
@@ -1942,6 +2136,9 @@ class HDRI_OT_full_batch_previews(Operator):
     modal = HDRI_OT_generate_previews.modal
     finish_preview_generation = HDRI_OT_generate_previews.finish_preview_generation
     generate_single_preview = HDRI_OT_generate_previews.generate_single_preview
+    generate_analytic_preview = HDRI_OT_generate_previews.generate_analytic_preview
+    generate_transfer_preview = HDRI_OT_generate_previews.generate_transfer_preview
+    get_preview_source = HDRI_OT_generate_previews.get_preview_source
     get_thumb_path = HDRI_OT_generate_previews.get_thumb_path
     cancel = HDRI_OT_generate_previews.cancel
 
@@ -1958,25 +2155,369 @@ class HDRI_OT_clear_preview_stats(Operator):
         preferences.preview_stats_completed = 0
         preferences.preview_stats_failed = 0
         preferences.preview_stats_time = 0.0
+        preferences.preview_stats_throughput = 0.0
         preferences.preview_stats_current_file = ""
         preferences.show_generation_stats = False
         return {'FINISHED'}
 
-class HDRI_OT_generate_proxies(Operator):
-    bl_idname = "world.generate_hdri_proxies"
-    bl_label = "Generate HDRI Proxies"
-    bl_description = "Generate proxies for selected folder"
+class HDRI_OT_build_thumbnail_atlases(Operator):
+    bl_idname = "world.build_thumbnail_atlases"
+    bl_label = "Build Thumbnail Atlases"
+    bl_description = "Pack existing thumbnails of every HDRI folder into per-folder atlas images"
+
+    def execute(self, context):
+        from . import utils, thumbnails
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+        base_dir = preferences.hdri_directory
+
+        if not base_dir or not os.path.exists(base_dir):
+            self.report({'ERROR'}, "HDRI directory not set or invalid")
+            return {'CANCELLED'}
+
+        folders = 0
+        packed = 0
+        for root, dirs, files in os.walk(base_dir):
+            # Skip 'proxies' folders
+            if 'proxies' in dirs:
+                dirs.remove('proxies')
+
+            if any(f.lower().endswith("_thumb.png") for f in files):
+                packed += thumbnails.build_folder_atlas(root)
+                folders += 1
+
+        self.report({'INFO'}, f"Packed {packed} thumbnails into {folders} folder atlas{'es' if folders != 1 else ''}")
+        return {'FINISHED'}
+
+class HDRI_OT_bake_preview_transfer(Operator):
+    bl_idname = "world.bake_hdri_preview_transfer"
+    bl_label = "Bake Preview Transfer"
+    bl_description = "Render the preview scene once per environment cell so thumbnails can be relit without Cycles"
+
+    def execute(self, context):
+        from . import utils, preview_transfer
+        import numpy as np
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        support_blend_path = utils.get_support_blend_path()
+        if not support_blend_path or not os.path.exists(support_blend_path):
+            self.report({'ERROR'}, "support.blend not found")
+            return {'CANCELLED'}
+
+        with bpy.data.libraries.load(support_blend_path, link=False) as (data_from, data_to):
+            data_to.scenes = [s for s in data_from.scenes if s == "Preview"]
+
+        if not data_to.scenes or not data_to.scenes[0] or not data_to.scenes[0].camera:
+            self.report({'ERROR'}, "Could not find Preview scene")
+            return {'CANCELLED'}
+
+        scene = data_to.scenes[0]
+        scene_type = preferences.preview_scene_type
+        self._scene = scene
+        self._transfer_path = preview_transfer.get_transfer_path(support_blend_path, scene_type)
+
+        # Same visibility setup as the Cycles preview render
+        collection_types = {'Orbs - 4': 'ORBS_4', 'Orbs - 3': 'ORBS_3', 'Teapot': 'TEAPOT'}
+        for collection in scene.collection.children:
+            if collection.name in collection_types:
+                hidden = collection_types[collection.name] != scene_type
+                collection.hide_render = hidden
+                collection.hide_viewport = hidden
+        for obj in scene.objects:
+            if obj.name in ['GROUND_PLANE', 'HDRI_PLANE_ORBS']:
+                obj.hide_render = False
+                obj.hide_viewport = False
+
+        # The basis image stands in for the HDRI everywhere the preview scene shows it
+        self._basis_image = bpy.data.images.new("_qhdri_transfer_basis",
+                                                width=preview_transfer.BASIS_COLUMNS,
+                                                height=preview_transfer.BASIS_ROWS,
+                                                float_buffer=True)
+        image_nodes = []
+        if scene.world and world_has_nodes(scene.world):
+            image_nodes += [n for n in scene.world.node_tree.nodes if n.type == 'TEX_ENVIRONMENT']
+        plane = scene.objects.get('HDRI_PLANE_ORBS')
+        if plane:
+            for material in plane.data.materials:
+                if material and material.node_tree:
+                    image_nodes += [n for n in material.node_tree.nodes if n.type == 'TEX_IMAGE']
+        for node in image_nodes:
+            node.image = self._basis_image
+            node.interpolation = 'Closest'
+
+        scene.render.resolution_x = preview_transfer.BAKE_WIDTH
+        scene.render.resolution_y = preview_transfer.BAKE_HEIGHT
+        scene.render.resolution_percentage = 100
+        scene.render.film_transparent = True
+        scene.render.image_settings.file_format = 'OPEN_EXR'
+        scene.render.image_settings.color_depth = '32'
+        scene.cycles.samples = preferences.preview_samples
+        scene.cycles.device = 'CPU' if preferences.preview_render_device == 'CPU' else 'GPU'
+
+        self._temp_dir = tempfile.mkdtemp(prefix="qhdri_transfer_")
+        scene.render.filepath = os.path.join(self._temp_dir, "cell.exr")
+
+        camera = scene.camera
+        self._directions = preview_transfer.camera_ray_directions(
+            [tuple(c) for c in camera.data.view_frame(scene=scene)],
+            [tuple(r) for r in camera.matrix_world.to_3x3()],
+            preview_transfer.BAKE_WIDTH, preview_transfer.BAKE_HEIGHT)
+
+        count = preview_transfer.basis_count()
+        self._transfer = np.zeros((preview_transfer.BAKE_HEIGHT, preview_transfer.BAKE_WIDTH, count, 3),
+                                  dtype=np.float32)
+        self._constant = None
+        self._alpha = None
+        # Index -1 renders with a dark environment to capture scene lights
+        self._index = -1
+        self._count = count
+
+        wm = context.window_manager
+        wm.progress_begin(0, count + 1)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Baking preview transfer: {count + 1} renders")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        from . import preview_transfer
+        import numpy as np
+
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'WARNING'}, "Preview transfer bake cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        try:
+            self._basis_image.pixels.foreach_set(preview_transfer.basis_pixels(self._index))
+            self._basis_image.update()
+            bpy.ops.render.render(write_still=True, scene=self._scene.name)
+
+            result = bpy.data.images.load(self._scene.render.filepath, check_existing=False)
+            try:
+                pixels = np.empty(preview_transfer.BAKE_WIDTH * preview_transfer.BAKE_HEIGHT * 4, dtype=np.float32)
+                result.pixels.foreach_get(pixels)
+            finally:
+                bpy.data.images.remove(result)
+            pixels = pixels.reshape(preview_transfer.BAKE_HEIGHT, preview_transfer.BAKE_WIDTH, 4)
+        except Exception as e:
+            print(f"Error baking preview transfer: {str(e)}")
+            self.cancel(context)
+            self.report({'ERROR'}, f"Preview transfer bake failed: {str(e)}")
+            return {'CANCELLED'}
+
+        if self._index < 0:
+            self._constant = pixels[..., :3].copy()
+            self._alpha = pixels[..., 3].copy()
+        else:
+            self._transfer[:, :, self._index] = pixels[..., :3] - self._constant
+
+        self._index += 1
+        context.window_manager.progress_update(self._index + 1)
+
+        if self._index < self._count:
+            return {'RUNNING_MODAL'}
+
+        preview_transfer.save_transfer(self._transfer_path, self._transfer, self._constant,
+                                       self._alpha, self._directions)
+        self.cleanup(context)
+        self.report({'INFO'}, f"Preview transfer baked: {os.path.basename(self._transfer_path)}")
+        return {'FINISHED'}
+
+    def cleanup(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+        if self._basis_image:
+            bpy.data.images.remove(self._basis_image)
+            self._basis_image = None
+        if self._scene:
+            bpy.data.scenes.remove(self._scene)
+            self._scene = None
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def cancel(self, context):
+        self.cleanup(context)
+
+class HDRI_OT_reencode_thumbnails(Operator):
+    bl_idname = "world.reencode_hdri_thumbnails"
+    bl_label = "Re-encode Thumbnails"
+    bl_description = "Convert all existing thumbnails to the selected storage format"
+
+    def execute(self, context):
+        from . import utils, thumbnails
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+        base_dir = preferences.hdri_directory
+
+        if not base_dir or not os.path.exists(base_dir):
+            self.report({'ERROR'}, "HDRI directory not set or invalid")
+            return {'CANCELLED'}
+
+        thumb_format = preferences.thumbnail_format
+        folders = []
+        for root, dirs, files in os.walk(base_dir):
+            if 'proxies' in dirs:
+                dirs.remove('proxies')
+            thumbs = [f for f in files
+                      if f.lower().endswith(("_thumb.png", thumbnails.SMALL_THUMB_SUFFIX))]
+            if thumbs:
+                folders.append((root, thumbs))
+
+        total = sum(len(thumbs) for _, thumbs in folders)
+        encoded = 0
+        failed = 0
+        wm = context.window_manager
+        wm.progress_begin(0, max(total, 1))
+
+        for folder, thumbs in folders:
+            manifest = thumbnails.load_manifest(folder)
+            recorded = manifest.get('thumbnails', {})
+
+            for filename in thumbs:
+                thumb_path = os.path.join(folder, filename)
+                is_small = filename.lower().endswith(thumbnails.SMALL_THUMB_SUFFIX)
+                max_width = 0 if is_small else preferences.thumbnail_max_width
+
+                # Skip thumbnails already stored with these settings
+                entry = recorded.get(filename)
+                if (entry and entry.get('format') == thumb_format
+                        and entry.get('mtime') == os.path.getmtime(thumb_path)
+                        and (not max_width or entry.get('width', 0) <= max_width)):
+                    continue
+
+                size = thumbnails.encode_thumbnail(thumb_path, thumb_format, max_width)
+                if size:
+                    thumbnails.record_thumbnail(manifest, thumb_path, thumb_format, size)
+                    encoded += 1
+                else:
+                    failed += 1
+                wm.progress_update(encoded + failed)
+
+            thumbnails.save_manifest(folder, manifest)
+
+        wm.progress_end()
+
+        # Reload icons from the re-encoded files
+        from .utils import get_hdri_previews
+        if hasattr(get_hdri_previews, "preview_collection"):
+            get_hdri_previews.preview_collection.clear()
+            get_hdri_previews.cached_dir = None
+            get_hdri_previews.cached_items = []
+
+        if failed:
+            self.report({'WARNING'}, f"Re-encoded {encoded} thumbnails with {failed} failures")
+        else:
+            self.report({'INFO'}, f"Re-encoded {encoded} thumbnails")
+        return {'FINISHED'}
+
+class HDRI_OT_resume_batch_job(Operator):
+    bl_idname = "world.resume_hdri_batch_job"
+    bl_label = "Resume Batch"
+    bl_description = "Continue an interrupted full batch run where it stopped"
+
+    kind: EnumProperty(
+        name="Batch Type",
+        items=[
+            ('PREVIEWS', 'Previews', 'Preview thumbnail batch'),
+            ('PROXIES', 'Proxies', 'Proxy generation batch')
+        ],
+        default='PREVIEWS'
+    )
+
+    def execute(self, context):
+        if self.kind == 'PREVIEWS':
+            return bpy.ops.world.full_batch_hdri_previews('INVOKE_DEFAULT', resume=True)
+        return bpy.ops.world.full_batch_hdri_proxies('INVOKE_DEFAULT', resume=True)
+
+class HDRI_OT_discard_batch_job(Operator):
+    bl_idname = "world.discard_hdri_batch_job"
+    bl_label = "Discard Batch"
+    bl_description = "Forget an interrupted full batch run"
+
+    kind: EnumProperty(
+        name="Batch Type",
+        items=[
+            ('PREVIEWS', 'Previews', 'Preview thumbnail batch'),
+            ('PROXIES', 'Proxies', 'Proxy generation batch')
+        ],
+        default='PREVIEWS'
+    )
+
+    def execute(self, context):
+        from . import batch_jobs
+        batch_jobs.discard_job(self.kind)
+        self.report({'INFO'}, "Interrupted batch discarded")
+        return {'FINISHED'}
+
+class HDRI_OT_benchmark_proxy_engines(Operator):
+    bl_idname = "world.benchmark_hdri_proxy_engines"
+    bl_label = "Benchmark Proxy Engines"
+    bl_description = "Time each proxy engine on the current HDRI (or the first HDRI of the batch folder)"
+
+    def execute(self, context):
+        from . import utils
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        hdri_path = None
+        hdri_settings = getattr(context.scene, "hdri_settings", None)
+        if hdri_settings and hdri_settings.hdri_preview not in ('', 'NONE') and os.path.exists(hdri_settings.hdri_preview):
+            hdri_path = hdri_settings.hdri_preview
+        elif preferences.proxy_generation_directory and os.path.isdir(preferences.proxy_generation_directory):
+            hdri_files = ProxyBatchMixin.get_hdri_files(preferences.proxy_generation_directory)
+            hdri_path = hdri_files[0] if hdri_files else None
+
+        if not hdri_path:
+            self.report({'ERROR'}, "Select an HDRI or a proxy batch folder to benchmark")
+            return {'CANCELLED'}
+
+        try:
+            resolution, results = utils.benchmark_proxy_engines(hdri_path, preferences.proxy_generation_resolution)
+        except Exception as e:
+            self.report({'ERROR'}, f"Benchmark failed: {str(e)}")
+            return {'CANCELLED'}
+
+        if not results:
+            self.report({'WARNING'},
+                        f"{os.path.basename(hdri_path)} is no larger than the smallest proxy, nothing was benchmarked")
+            return {'CANCELLED'}
+
+        summary = " | ".join(f"{engine}: {seconds:.2f}s ({rate:.1f} MPix/s)"
+                             for engine, (seconds, rate) in results.items())
+        if resolution != preferences.proxy_generation_resolution:
+            summary = f"{resolution} (source too small for {preferences.proxy_generation_resolution}) | {summary}"
+        print(f"Proxy benchmark {os.path.basename(hdri_path)} -> {resolution}: {summary}")
+        self.report({'INFO'}, summary)
+        return {'FINISHED'}
+
+class ProxyBatchMixin:
+    """Worker pool, proxy locks and progress shared by the proxy batch operators.
+
+    Operators set self._hdri_files, self._current_file_index and self._timer
+    before calling initialize_stats and start_workers, and set
+    self._journal_kind to record progress for resuming. A resumed run keeps
+    the user's replaced settings in self._previous_settings.
+    """
 
     def cancel(self, context):
         if hasattr(self, '_timer') and self._timer:
             context.window_manager.event_timer_remove(self._timer)
         context.window_manager.progress_end()
+        self.stop_workers()
 
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
         preferences.is_proxy_generating = False
 
+        # A resumed run put the job's settings in place, give the user theirs back
+        from . import batch_jobs
+        batch_jobs.revert_settings(preferences, getattr(self, '_previous_settings', None))
+
         self.report({'INFO'}, "Proxy generation cancelled")
 
     def initialize_stats(self, context):
@@ -1987,6 +2528,7 @@ class HDRI_OT_generate_proxies(Operator):
         preferences.proxy_stats_completed = 0
         preferences.proxy_stats_failed = 0
         preferences.proxy_stats_time = 0.0
+        preferences.proxy_stats_throughput = 0.0
         preferences.proxy_stats_current_file = ""
         preferences.is_proxy_generating = True
         self._start_time = datetime.now()
@@ -2002,31 +2544,225 @@ class HDRI_OT_generate_proxies(Operator):
 
         preferences.proxy_stats_current_file = os.path.basename(current_file)
         preferences.proxy_stats_time = (datetime.now() - self._start_time).total_seconds()
+        if preferences.proxy_stats_time > 0:
+            processed = preferences.proxy_stats_completed + preferences.proxy_stats_failed
+            preferences.proxy_stats_throughput = processed / preferences.proxy_stats_time
 
         for window in context.window_manager.windows:
             for area in window.screen.areas:
                 if area.type == 'PREFERENCES':
                     area.tag_redraw()
 
+    def start_workers(self, context):
+        """Start the worker pool, without one every proxy is generated on the main thread"""
+        from . import utils
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        self._pool = None
+        self._pending = {}
+        self._proxy_locks = {}
+        self._max_pending = 0
+
+        if preferences.proxy_use_workers:
+            from . import proxy_worker
+            try:
+                worker_count = preferences.proxy_worker_count or proxy_worker.default_worker_count()
+                self._pool = proxy_worker.create_pool(worker_count)
+                self._max_pending = worker_count * 2
+            except Exception as e:
+                print(f"Error starting proxy workers, generating on the main thread: {str(e)}")
+
+    def stop_workers(self):
+        pool = getattr(self, '_pool', None)
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._pending = {}
+        for hdri_path in list(getattr(self, '_proxy_locks', {})):
+            self.release_proxy_locks(hdri_path)
+
+    def release_proxy_locks(self, hdri_path):
+        from . import proxy_lock
+        for proxy_path in self._proxy_locks.pop(hdri_path, []):
+            proxy_lock.release(proxy_path)
+
+    def get_proxy_targets(self, context, hdri_path):
+        """(resolution, width, proxy path) of every proxy still missing or out of date.
+
+        Each returned proxy is locked until its job completes. Proxies locked by
+        another Blender instance are left to it.
+        """
+        from . import utils, proxy_manifest, proxy_lock
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        resolutions = {preferences.proxy_generation_resolution}
+        if preferences.proxy_pyramid:
+            resolutions |= set(preferences.proxy_pyramid_resolutions)
+
+        targets = []
+        for resolution in resolutions:
+            if resolution not in utils.PROXY_RESOLUTIONS:
+                continue
+            existing = utils.find_proxy(hdri_path, resolution, check_stale=False)
+            if existing and not proxy_manifest.is_stale(hdri_path, existing):
+                continue
+
+            proxy_path = utils.get_proxy_path(hdri_path, resolution)
+            if not proxy_lock.acquire(proxy_path, timeout=0):
+                continue
+            self._proxy_locks.setdefault(hdri_path, []).append(proxy_path)
+
+            # A stale proxy stays in place until the worker's atomic rename replaces it
+            targets.append((resolution, utils.PROXY_RESOLUTIONS[resolution], proxy_path))
+        return targets
+
+    def submit_proxy(self, context, hdri_path):
+        """Hand an HDRI to the worker pool, False if it has to be generated here instead"""
+        from . import proxy_worker
+        if not self._pool or not proxy_worker.can_generate(hdri_path):
+            return False
+
+        try:
+            targets = self.get_proxy_targets(context, hdri_path)
+            if not targets:
+                # Every proxy already exists
+                self.complete_proxy(context, hdri_path, True)
+                return True
+
+            future = self._pool.submit(proxy_worker.generate_proxies, hdri_path, targets)
+        except Exception as e:
+            print(f"Error queueing proxy for {hdri_path}: {str(e)}")
+            self.release_proxy_locks(hdri_path)
+            return False
+
+        self._pending[future] = hdri_path
+        return True
+
+    def collect_proxy_results(self, context):
+        """Finish completed worker jobs on the main thread.
+
+        Proxies in formats the workers can't write are saved here, then every
+        proxy is recorded in its manifest and the proxy cache.
+        """
+        from . import utils, proxy_cache, proxy_manifest
+
+        for future in [f for f in self._pending if f.done()]:
+            hdri_path = self._pending.pop(future)
+            success = False
+            try:
+                _, results = future.result()
+                utils.write_streamed_proxies(results)
+                for resolution, (proxy_path, pixels) in results.items():
+                    if proxy_path == hdri_path:
+                        continue
+                    proxy_manifest.record_proxy(hdri_path, proxy_path, resolution)
+                    proxy_cache.touch(proxy_path)
+                success = True
+            except Exception as e:
+                print(f"Error generating proxy for {hdri_path}: {str(e)}")
+
+            self.release_proxy_locks(hdri_path)
+            self.complete_proxy(context, hdri_path, success)
+
+    def complete_proxy(self, context, hdri_path, success):
+        self.update_stats(context, success, hdri_path)
+
+        # Record progress so an interrupted batch can resume
+        journal_kind = getattr(self, '_journal_kind', None)
+        if journal_kind:
+            from . import batch_jobs
+            batch_jobs.record_entry(journal_kind, hdri_path, success)
+
+        from . import utils
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+        processed = preferences.proxy_stats_completed + preferences.proxy_stats_failed
+        context.window_manager.progress_update(processed / max(1, len(self._hdri_files)) * 100)
+
+    @staticmethod
+    def get_hdri_files(directory):
+        extensions = ('.hdr', '.exr')
+        return [
+            os.path.join(directory, f)
+            for f in os.listdir(directory)
+            if f.lower().endswith(extensions)
+        ]
+
+    @staticmethod
+    def get_all_hdri_files(base_dir):
+        hdri_files = []
+        for root, dirs, files in os.walk(base_dir):
+            # Skip 'proxies' folders
+            if 'proxies' in dirs:
+                dirs.remove('proxies')
+
+            for f in files:
+                if f.lower().endswith(('.hdr', '.exr')):
+                    hdri_files.append(os.path.join(root, f))
+        return hdri_files
+
+    def generate_single_proxy(self, context, hdri_path):
+        from . import utils
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+        target_resolution = preferences.proxy_generation_resolution
+
+        try:
+            # Pyramid mode decodes the original once for every configured resolution,
+            # an original with nothing smaller to make counts as done like in the workers
+            if preferences.proxy_pyramid:
+                resolutions = set(preferences.proxy_pyramid_resolutions) | {target_resolution}
+                return utils.create_hdri_proxy_pyramid(hdri_path, resolutions, timeout=0) is not None
+
+            # Never wait on the main thread, a proxy another instance is writing is left to it
+            from .utils import create_hdri_proxy
+            from . import proxy_lock
+            proxy_path = create_hdri_proxy(hdri_path, target_resolution, timeout=0)
+            return proxy_path is not None or proxy_lock.is_locked(utils.get_proxy_path(hdri_path, target_resolution))
+        except Exception as e:
+            print(f"Error generating proxy for {hdri_path}: {str(e)}")
+            return False
+
+
+class HDRI_OT_generate_proxies(ProxyBatchMixin, Operator):
+    bl_idname = "world.generate_hdri_proxies"
+    bl_label = "Generate HDRI Proxies"
+    bl_description = "Generate proxies for selected folder"
+
     def modal(self, context, event):
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
 
         if event.type == 'TIMER':
-            if self._current_file_index >= len(self._hdri_files):
-                self.finish_proxy_generation(context)
-                return {'FINISHED'}
+            # Process as many files as fit in the tick budget, always at least one
+            tick_start = time.perf_counter()
+            tick_budget = preferences.batch_tick_budget_ms / 1000.0
+
+            while True:
+                self.collect_proxy_results(context)
 
-            current_hdri = self._hdri_files[self._current_file_index]
-            success = self.generate_single_proxy(context, current_hdri)
+                if self._current_file_index >= len(self._hdri_files):
+                    if not self._pending:
+                        self.finish_proxy_generation(context)
+                        return {'FINISHED'}
+                    break
 
-            self.update_stats(context, success, current_hdri)
+                # Keep enough jobs queued for every worker, no more
+                if self._pool and len(self._pending) >= self._max_pending:
+                    break
 
-            progress = (self._current_file_index + 1) / len(self._hdri_files)
-            context.window_manager.progress_update(progress * 100)
+                current_hdri = self._hdri_files[self._current_file_index]
+                self._current_file_index += 1
 
-            self._current_file_index += 1
+                if not self.submit_proxy(context, current_hdri):
+                    success = self.generate_single_proxy(context, current_hdri)
+                    self.complete_proxy(context, current_hdri, success)
+
+                if time.perf_counter() - tick_start >= tick_budget:
+                    break
 
             for window in context.window_manager.windows:
                 for area in window.screen.areas:
@@ -2053,6 +2789,7 @@ class HDRI_OT_generate_proxies(Operator):
         self._current_file_index = 0
 
         self.initialize_stats(context)
+        self.start_workers(context)
 
         wm = context.window_manager
         wm.progress_begin(0, 100)
@@ -2068,6 +2805,7 @@ class HDRI_OT_generate_proxies(Operator):
         preferences = context.preferences.addons[addon_name].preferences
         context.window_manager.event_timer_remove(self._timer)
         context.window_manager.progress_end()
+        self.stop_workers()
         preferences.is_proxy_generating = False
         if preferences.proxy_stats_failed > 0:
             self.report({'WARNING'},
@@ -2082,35 +2820,23 @@ class HDRI_OT_generate_proxies(Operator):
             layout.operator("world.clear_proxy_stats", text="Clear Results", icon='X')
         context.window_manager.popup_menu(draw_callback, title="Proxy Generation Results", icon='INFO')
 
-    def get_hdri_files(self, directory):
-        extensions = ('.hdr', '.exr')
-        return [
-            os.path.join(directory, f)
-            for f in os.listdir(directory)
-            if f.lower().endswith(extensions)
-        ]
 
-    def generate_single_proxy(self, context, hdri_path):
-        from . import utils
-        addon_name = utils.get_addon_name()
-        preferences = context.preferences.addons[addon_name].preferences
-        target_resolution = preferences.proxy_generation_resolution
-
-        try:
-            from .utils import create_hdri_proxy
-            proxy_path = create_hdri_proxy(hdri_path, target_resolution)
-            return proxy_path is not None
-        except Exception as e:
-            print(f"Error generating proxy for {hdri_path}: {str(e)}")
-            return False
-
-
-class HDRI_OT_full_batch_proxies(Operator):
+class HDRI_OT_full_batch_proxies(ProxyBatchMixin, Operator):
     bl_idname = "world.full_batch_hdri_proxies"
     bl_label = "Full Batch Proxy Generation"
     bl_description = "Generate proxies for all HDRIs in all subfolders"
 
+    resume: BoolProperty(
+        name="Resume",
+        description="Continue the interrupted batch recorded in the job journal",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+
     def invoke(self, context, event):
+        if self.resume:
+            return self.execute(context)
+
         message = (
             "⚠️ Batch Process can take several minutes to hours ⚠️\n"
             "• Network speeds affect processing time if using NAS\n\n"
@@ -2126,18 +2852,6 @@ class HDRI_OT_full_batch_proxies(Operator):
             message=message
         )
 
-    def get_all_hdri_files(self, base_dir):
-        hdri_files = []
-        for root, dirs, files in os.walk(base_dir):
-            # Skip 'proxies' folders
-            if 'proxies' in dirs:
-                dirs.remove('proxies')
-
-            for f in files:
-                if f.lower().endswith(('.hdr', '.exr')):
-                    hdri_files.append(os.path.join(root, f))
-        return hdri_files
-
     def execute(self, context):
         from . import utils
         addon_name = utils.get_addon_name()
@@ -2147,15 +2861,34 @@ class HDRI_OT_full_batch_proxies(Operator):
             self.report({'ERROR'}, "Please set HDRI directory first")
             return {'CANCELLED'}
 
-        self._hdri_files = self.get_all_hdri_files(preferences.hdri_directory)
+        from . import batch_jobs
+        if self.resume:
+            job = batch_jobs.load_job(batch_jobs.JOB_PROXIES)
+            if not job:
+                self.report({'ERROR'}, "No interrupted proxy batch to resume")
+                return {'CANCELLED'}
+            # The job's settings only apply to this run, finish and cancel put the user's back
+            self._previous_settings = batch_jobs.restore_settings(batch_jobs.JOB_PROXIES, job, preferences)
+            self._hdri_files = [f for f in batch_jobs.get_pending_files(job) if os.path.exists(f)]
+            if not self._hdri_files:
+                batch_jobs.revert_settings(preferences, self._previous_settings)
+                batch_jobs.finish_job(batch_jobs.JOB_PROXIES)
+                self.report({'INFO'}, "Proxy batch already complete")
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"Resuming proxy batch: {len(self._hdri_files)} of {len(job['files'])} files remaining")
+        else:
+            self._hdri_files = self.get_all_hdri_files(preferences.hdri_directory)
 
-        if not self._hdri_files:
-            self.report({'ERROR'}, "No HDRI files found")
-            return {'CANCELLED'}
+            if not self._hdri_files:
+                self.report({'ERROR'}, "No HDRI files found")
+                return {'CANCELLED'}
+            batch_jobs.start_job(batch_jobs.JOB_PROXIES, self._hdri_files, preferences)
 
         self._current_file_index = 0
+        self._journal_kind = batch_jobs.JOB_PROXIES
 
         self.initialize_stats(context)
+        self.start_workers(context)
 
         wm = context.window_manager
         wm.progress_begin(0, 100)
@@ -2164,54 +2897,44 @@ class HDRI_OT_full_batch_proxies(Operator):
 
         return {'RUNNING_MODAL'}
 
-    def initialize_stats(self, context):
+    def modal(self, context, event):
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
-        preferences.proxy_stats_total = len(self._hdri_files)
-        preferences.proxy_stats_completed = 0
-        preferences.proxy_stats_failed = 0
-        preferences.proxy_stats_time = 0.0
-        preferences.proxy_stats_current_file = ""
-        preferences.is_proxy_generating = True
-        self._start_time = datetime.now()
 
-    def update_stats(self, context, success, current_file):
-        from . import utils
-        addon_name = utils.get_addon_name()
-        preferences = context.preferences.addons[addon_name].preferences
-        if success:
-            preferences.proxy_stats_completed += 1
-        else:
-            preferences.proxy_stats_failed += 1
+        if event.type == 'TIMER':
+            from . import batch_jobs
 
-        preferences.proxy_stats_current_file = os.path.basename(current_file)
-        preferences.proxy_stats_time = (datetime.now() - self._start_time).total_seconds()
+            # Process as many files as fit in the tick budget, always at least one
+            tick_start = time.perf_counter()
+            tick_budget = preferences.batch_tick_budget_ms / 1000.0
 
-        for window in context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'PREFERENCES':
-                    area.tag_redraw()
+            while True:
+                self.collect_proxy_results(context)
 
-    def modal(self, context, event):
-        from . import utils
-        addon_name = utils.get_addon_name()
-        preferences = context.preferences.addons[addon_name].preferences
+                if self._current_file_index >= len(self._hdri_files):
+                    if not self._pending:
+                        self.finish_proxy_generation(context)
+                        return {'FINISHED'}
+                    break
 
-        if event.type == 'TIMER':
-            if self._current_file_index >= len(self._hdri_files):
-                self.finish_proxy_generation(context)
-                return {'FINISHED'}
+                # Keep enough jobs queued for every worker, no more
+                if self._pool and len(self._pending) >= self._max_pending:
+                    break
 
-            current_hdri = self._hdri_files[self._current_file_index]
-            success = self.generate_single_proxy(context, current_hdri)
+                # Keep the browsed folder, search results and favorites at the front of the queue
+                batch_jobs.reprioritize_remaining(self, context, self._hdri_files,
+                                                  self._current_file_index, preferences.hdri_directory)
 
-            self.update_stats(context, success, current_hdri)
+                current_hdri = self._hdri_files[self._current_file_index]
+                self._current_file_index += 1
 
-            progress = (self._current_file_index + 1) / len(self._hdri_files)
-            context.window_manager.progress_update(progress * 100)
+                if not self.submit_proxy(context, current_hdri):
+                    success = self.generate_single_proxy(context, current_hdri)
+                    self.complete_proxy(context, current_hdri, success)
 
-            self._current_file_index += 1
+                if time.perf_counter() - tick_start >= tick_budget:
+                    break
 
             for window in context.window_manager.windows:
                 for area in window.screen.areas:
@@ -2226,7 +2949,14 @@ class HDRI_OT_full_batch_proxies(Operator):
         preferences = context.preferences.addons[addon_name].preferences
         context.window_manager.event_timer_remove(self._timer)
         context.window_manager.progress_end()
+        self.stop_workers()
         preferences.is_proxy_generating = False
+
+        # The batch ran to completion, its journal is no longer needed
+        from . import batch_jobs
+        batch_jobs.finish_job(batch_jobs.JOB_PROXIES)
+        batch_jobs.revert_settings(preferences, getattr(self, '_previous_settings', None))
+
         if preferences.proxy_stats_failed > 0:
             self.report({'WARNING'},
                       f"Generated {preferences.proxy_stats_completed} proxies with {preferences.proxy_stats_failed} failures")
@@ -2240,31 +2970,140 @@ class HDRI_OT_full_batch_proxies(Operator):
             layout.operator("world.clear_proxy_stats", text="Clear Results", icon='X')
         context.window_manager.popup_menu(draw_callback, title="Proxy Generation Results", icon='INFO')
 
-    def generate_single_proxy(self, context, hdri_path):
+
+class HDRI_OT_generate_tiled_proxies(ProxyBatchMixin, Operator):
+    bl_idname = "world.generate_tiled_hdri_proxies"
+    bl_label = "Generate Tiled EXRs"
+    bl_description = ("Convert every HDRI in the library into a tiled, mip-mapped EXR in the background, "
+                      "so renderers with a texture cache only load the levels and tiles they need")
+
+    def execute(self, context):
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
-        target_resolution = preferences.proxy_generation_resolution
+
+        if not preferences.hdri_directory:
+            self.report({'ERROR'}, "Please set HDRI directory first")
+            return {'CANCELLED'}
+
+        self._hdri_files = self.get_all_hdri_files(preferences.hdri_directory)
+        if not self._hdri_files:
+            self.report({'ERROR'}, "No HDRI files found")
+            return {'CANCELLED'}
+
+        self._current_file_index = 0
+
+        self.initialize_stats(context)
+        self.start_workers(context)
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        from . import utils, proxy_lock
+        addon_name = utils.get_addon_name()
+        preferences = context.preferences.addons[addon_name].preferences
+
+        if event.type == 'TIMER':
+            tick_start = time.perf_counter()
+            tick_budget = preferences.batch_tick_budget_ms / 1000.0
+
+            while True:
+                self.collect_tiled_results(context)
+
+                if self._current_file_index >= len(self._hdri_files):
+                    if not self._pending:
+                        self.finish_tiled_generation(context)
+                        return {'FINISHED'}
+                    break
+
+                if self._pool and len(self._pending) >= self._max_pending:
+                    break
+
+                current_hdri = self._hdri_files[self._current_file_index]
+                self._current_file_index += 1
+
+                if not self.submit_tiled(context, current_hdri):
+                    success = (utils.create_tiled_proxy(current_hdri, timeout=0) is not None or
+                               proxy_lock.is_locked(utils.get_tiled_proxy_path(current_hdri)))
+                    self.complete_proxy(context, current_hdri, success)
+
+                if time.perf_counter() - tick_start >= tick_budget:
+                    break
+
+            for window in context.window_manager.windows:
+                for area in window.screen.areas:
+                    if area.type == 'PREFERENCES':
+                        area.tag_redraw()
+
+        return {'RUNNING_MODAL'}
+
+    def submit_tiled(self, context, hdri_path):
+        """Hand a Radiance original to the worker pool, False if it has to be converted here instead"""
+        from . import utils, proxy_worker, proxy_lock
+        if not self._pool or not proxy_worker.can_generate(hdri_path):
+            return False
+
+        if utils.find_tiled_proxy(hdri_path):
+            self.complete_proxy(context, hdri_path, True)
+            return True
+
+        tiled_path = utils.get_tiled_proxy_path(hdri_path)
+        if not proxy_lock.acquire(tiled_path, timeout=0):
+            # Another instance is converting it
+            self.complete_proxy(context, hdri_path, True)
+            return True
+        self._proxy_locks[hdri_path] = [tiled_path]
 
         try:
-            from .utils import create_hdri_proxy
-            proxy_path = create_hdri_proxy(hdri_path, target_resolution)
-            return proxy_path is not None
+            tile_size, compression = utils.get_tiled_proxy_settings()
+            future = self._pool.submit(proxy_worker.generate_tiled_proxy, hdri_path, tiled_path,
+                                       tile_size, compression)
         except Exception as e:
-            print(f"Error generating proxy for {hdri_path}: {str(e)}")
+            print(f"Error queueing tiled EXR for {hdri_path}: {str(e)}")
+            self.release_proxy_locks(hdri_path)
             return False
 
-    def cancel(self, context):
-        if hasattr(self, '_timer') and self._timer:
-            context.window_manager.event_timer_remove(self._timer)
-        context.window_manager.progress_end()
+        self._pending[future] = hdri_path
+        return True
+
+    def collect_tiled_results(self, context):
+        """Record finished conversions in the proxy manifest and cache"""
+        from . import utils, proxy_cache, proxy_manifest
 
+        for future in [f for f in self._pending if f.done()]:
+            hdri_path = self._pending.pop(future)
+            success = False
+            try:
+                _, details = future.result()
+                tiled_path = utils.get_tiled_proxy_path(hdri_path)
+                proxy_manifest.record_proxy(hdri_path, tiled_path, utils.TILED_PROXY, **details)
+                proxy_cache.touch(tiled_path)
+                success = True
+            except Exception as e:
+                print(f"Error generating tiled EXR for {hdri_path}: {str(e)}")
+
+            self.release_proxy_locks(hdri_path)
+            self.complete_proxy(context, hdri_path, success)
+
+    def finish_tiled_generation(self, context):
         from . import utils
         addon_name = utils.get_addon_name()
         preferences = context.preferences.addons[addon_name].preferences
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+        self.stop_workers()
         preferences.is_proxy_generating = False
-
-        self.report({'INFO'}, "Proxy generation cancelled")
+        if preferences.proxy_stats_failed > 0:
+            self.report({'WARNING'},
+                        f"Converted {preferences.proxy_stats_completed} HDRIs to tiled EXR with {preferences.proxy_stats_failed} failures")
+        else:
+            self.report({'INFO'},
+                        f"Converted {preferences.proxy_stats_completed} HDRIs to tiled EXR")
 
 
 class HDRI_OT_apply_render_engine(Operator):
@@ -2496,6 +3335,7 @@ operators = {
     HDRI_OT_toggle_search_bar,
     HDRI_OT_cleanup_unused,
     HDRI_OT_cleanup_hdri_proxies,
+    HDRI_OT_verify_proxies,
     HDRI_OT_clear_proxy_stats,
     HDRI_OT_check_updates,
     HDRI_OT_download_update,
@@ -2509,7 +3349,14 @@ operators = {
     HDRI_OT_generate_proxies,
     HDRI_OT_full_batch_previews,
     HDRI_OT_full_batch_proxies,
+    HDRI_OT_generate_tiled_proxies,
     HDRI_OT_clear_preview_stats,
+    HDRI_OT_build_thumbnail_atlases,
+    HDRI_OT_reencode_thumbnails,
+    HDRI_OT_bake_preview_transfer,
+    HDRI_OT_benchmark_proxy_engines,
+    HDRI_OT_resume_batch_job,
+    HDRI_OT_discard_batch_job,
     HDRI_OT_toggle_favorite,
     HDRI_OT_toggle_favorites_mode,
 }
@@ -0,0 +1,406 @@
+"""
+Quick HDRI Controls - Headless proxy and thumbnail pre-bake
+
+Bakes proxies (and thumbnails) for a whole library without opening the UI:
+
+    blender -b --python prebake.py -- /path/to/hdris --resolutions 1K 2K --thumbnails
+    python prebake.py /path/to/hdris --resolutions 1K 2K --workers 8
+
+Inside Blender the add-on's preferences decide format, engine and storage, and
+every original and thumbnail method is supported. Plain Python only has the
+NumPy paths - .hdr originals to .hdr proxies in the local proxies folders, no
+thumbnails. A JSON summary with per-file timings is printed (or written with
+--output) at the end.
+
+bpy is optional here, proxy workers import this module too.
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import importlib
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# Default proxy resolutions when neither arguments nor preferences give any
+DEFAULT_RESOLUTIONS = ('2K',)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="prebake",
+        description="Pre-bake Quick HDRI Controls proxies and thumbnails for a library")
+    parser.add_argument("root", nargs='?',
+                        help="Library folder (default: the HDRI directory from the add-on preferences)")
+    parser.add_argument("--resolutions", nargs='+', metavar="RES",
+                        help="Proxy resolutions such as 1K 2K 4K (default: the batch resolution preference)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes for .hdr originals (default: one per core but one)")
+    parser.add_argument("--thumbnails", action='store_true',
+                        help="Also render missing thumbnails (Blender only)")
+    parser.add_argument("--dry-run", action='store_true',
+                        help="Only report what would be baked")
+    parser.add_argument("--output", metavar="PATH",
+                        help="Write the JSON summary to a file instead of stdout")
+    return parser.parse_args(argv)
+
+def resolution_width(resolution):
+    """Pixel width of a proxy resolution name"""
+    if bpy is not None:
+        from .utils import PROXY_RESOLUTIONS
+        return PROXY_RESOLUTIONS.get(resolution)
+    name = resolution.upper()
+    if name.endswith('K') and name[:-1].isdigit():
+        return int(name[:-1]) * 1024
+    return None
+
+def _get_preferences():
+    from .utils import get_addon_name
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def find_originals(base_dir, thumbnails=False):
+    """Environment maps under a library, skipping proxies folders and thumbnails"""
+    extensions = ('.hdr',) if bpy is None else ('.hdr', '.exr')
+    preferences = _get_preferences() if bpy is not None else None
+    if thumbnails and preferences is not None:
+        from . import thumbnails as thumbs
+        extensions = thumbs.get_preview_extensions(preferences)
+
+    originals = []
+    for root, dirs, files in os.walk(base_dir):
+        if 'proxies' in dirs:
+            dirs.remove('proxies')
+        dirs.sort()
+        for f in sorted(files):
+            if f.lower().endswith(extensions) and "_thumb" not in f.lower():
+                originals.append(os.path.join(root, f))
+    return originals
+
+def get_proxy_path(original_path, resolution, create=True):
+    """Path to bake a proxy to, without create (dry runs) no folders are made"""
+    if bpy is not None:
+        from .utils import get_proxy_path as addon_proxy_path
+        return addon_proxy_path(original_path, resolution, create=create)
+    base_name = os.path.splitext(os.path.basename(original_path))[0]
+    return os.path.join(os.path.dirname(original_path), 'proxies', f"{base_name}_{resolution}.hdr")
+
+def find_existing_proxy(original_path, resolution):
+    """(proxy path, stale) of an existing proxy, or (None, False).
+
+    Only looks, nothing is created. There are no timers to finish background
+    hashes in a headless run, so central store paths are hashed right away.
+    """
+    if bpy is not None:
+        from . import utils, proxy_manifest
+        proxy_path = utils.find_proxy(original_path, resolution, check_stale=False, compute_hash=True)
+        if proxy_path is None:
+            return None, False
+        return proxy_path, proxy_manifest.is_stale(original_path, proxy_path)
+
+    proxy_path = get_proxy_path(original_path, resolution)
+    try:
+        return proxy_path, os.path.getmtime(original_path) > os.path.getmtime(proxy_path)
+    except OSError:
+        return None, False
+
+def generate_timed(original_path, targets):
+    """proxy_worker.generate_proxies, also returning the seconds it took in the worker"""
+    from . import proxy_worker
+    start = time.perf_counter()
+    result = proxy_worker.generate_proxies(original_path, targets)
+    return time.perf_counter() - start, result
+
+class Prebake:
+    """Plans and runs the bake of one library, collecting a per-file report"""
+
+    def __init__(self, root, resolutions, workers=0, thumbnails=False, dry_run=False):
+        self.root = root
+        self.resolutions = [r for r in resolutions if resolution_width(r)]
+        self.workers = workers
+        self.thumbnails = thumbnails and bpy is not None
+        self.dry_run = dry_run
+        self.reports = {}
+        self._locks = {}
+
+    def report_for(self, original_path):
+        return self.reports.setdefault(original_path, {
+            'path': original_path,
+            'proxies': {},
+            'thumbnail': None,
+            'seconds': 0.0,
+        })
+
+    def plan_proxies(self, original_path):
+        """Lock and return (resolution, width, proxy path) of every proxy to bake"""
+        from . import proxy_lock
+
+        report = self.report_for(original_path)
+        targets = []
+        for resolution in self.resolutions:
+            existing, stale = find_existing_proxy(original_path, resolution)
+            if existing and not stale:
+                report['proxies'][resolution] = {'status': 'exists', 'path': existing}
+                continue
+
+            proxy_path = get_proxy_path(original_path, resolution, create=not self.dry_run)
+            if self.dry_run:
+                report['proxies'][resolution] = {'status': 'stale' if stale else 'missing', 'path': proxy_path}
+                continue
+
+            os.makedirs(os.path.dirname(proxy_path), exist_ok=True)
+
+            # Another instance (or an open Blender) is writing this proxy
+            if not proxy_lock.acquire(proxy_path, timeout=0):
+                report['proxies'][resolution] = {'status': 'locked', 'path': proxy_path}
+                continue
+            self._locks.setdefault(original_path, []).append(proxy_path)
+
+            # A stale proxy stays in place until the worker's atomic rename replaces it
+            targets.append((resolution, resolution_width(resolution), proxy_path))
+        return targets
+
+    def release_locks(self, original_path):
+        from . import proxy_lock
+        for proxy_path in self._locks.pop(original_path, []):
+            proxy_lock.release(proxy_path)
+
+    def record_results(self, original_path, targets, results):
+        """Save array results, register the proxies and fill the report"""
+        report = self.report_for(original_path)
+        if bpy is not None:
+            from . import utils, proxy_manifest, proxy_cache
+            utils.write_streamed_proxies(results)
+
+        for resolution, _, proxy_path in targets:
+            written = results.get(resolution, (None, None))[0]
+            if written == original_path:
+                status = 'original'
+            elif written and os.path.exists(written):
+                status = 'created'
+                if bpy is not None:
+                    proxy_manifest.record_proxy(original_path, written, resolution)
+                    proxy_cache.touch(written)
+            else:
+                status = 'failed'
+            report['proxies'][resolution] = {'status': status, 'path': written or proxy_path}
+
+    def bake_proxies_in_blender(self, original_path, targets):
+        """Main-thread generation with the preferred engine, for originals workers can't decode.
+
+        The planned locks are still held, stale proxies are overwritten in place.
+        """
+        from . import utils
+
+        downsample = utils.PROXY_ENGINES.get(utils.get_proxy_engine(), utils.downsample_proxy_blender)
+        results = {}
+        for resolution, target_width, proxy_path in targets:
+            try:
+                results[resolution] = (downsample(original_path, proxy_path, target_width), None)
+            except Exception as e:
+                print(f"Error generating proxy for {original_path}: {str(e)}")
+        self.record_results(original_path, targets, results)
+
+    def run_proxies(self, originals):
+        from . import proxy_worker
+        pool = None
+        pending = {}
+        max_pending = self.workers or proxy_worker.default_worker_count()
+
+        try:
+            for original_path in originals:
+                start = time.perf_counter()
+                targets = self.plan_proxies(original_path)
+                if not targets:
+                    self.report_for(original_path)['seconds'] += time.perf_counter() - start
+                    continue
+
+                if not proxy_worker.can_generate(original_path):
+                    try:
+                        if bpy is None:
+                            for resolution, _, proxy_path in targets:
+                                self.report_for(original_path)['proxies'][resolution] = {
+                                    'status': 'skipped', 'path': proxy_path, 'reason': "needs Blender"}
+                        else:
+                            self.bake_proxies_in_blender(original_path, targets)
+                    finally:
+                        self.release_locks(original_path)
+                    self.report_for(original_path)['seconds'] += time.perf_counter() - start
+                    continue
+
+                if pool is None:
+                    pool = proxy_worker.create_pool(max_pending)
+                pending[pool.submit(generate_timed, original_path, targets)] = (original_path, targets)
+
+                # Keep only as many jobs in flight as there are workers
+                while len(pending) >= max_pending:
+                    self.collect(pending, wait=True)
+
+            while pending:
+                self.collect(pending, wait=True)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            for original_path in list(self._locks):
+                self.release_locks(original_path)
+
+    def collect(self, pending, wait=False):
+        from concurrent.futures import wait as wait_futures, FIRST_COMPLETED
+        done = [f for f in pending if f.done()]
+        if not done and wait:
+            done, _ = wait_futures(list(pending), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            original_path, targets = pending.pop(future)
+            report = self.report_for(original_path)
+            try:
+                seconds, (_, results) = future.result()
+                report['seconds'] += seconds
+                self.record_results(original_path, targets, results)
+            except Exception as e:
+                print(f"Error generating proxy for {original_path}: {str(e)}")
+                for resolution, _, proxy_path in targets:
+                    report['proxies'][resolution] = {'status': 'failed', 'path': proxy_path, 'error': str(e)}
+            finally:
+                self.release_locks(original_path)
+
+    def run_thumbnails(self, originals):
+        from . import thumbnails
+        baker = create_preview_baker()
+        for original_path in originals:
+            report = self.report_for(original_path)
+            thumb_path = thumbnails.get_thumb_path(original_path)
+            if os.path.exists(thumb_path):
+                report['thumbnail'] = {'status': 'exists', 'path': thumb_path}
+                continue
+            if self.dry_run:
+                report['thumbnail'] = {'status': 'missing', 'path': thumb_path}
+                continue
+
+            start = time.perf_counter()
+            success = baker.generate_single_preview(bpy.context, original_path)
+            report['seconds'] += time.perf_counter() - start
+            report['thumbnail'] = {'status': 'created' if success else 'failed', 'path': thumb_path}
+
+    def run(self):
+        start = time.perf_counter()
+        originals = find_originals(self.root, self.thumbnails)
+        proxy_originals = [p for p in originals if p.lower().endswith(('.hdr', '.exr'))]
+
+        self.run_proxies(proxy_originals)
+        if self.thumbnails:
+            self.run_thumbnails(originals)
+
+        if bpy is not None:
+            from . import proxy_cache
+            proxy_cache.flush()
+
+        return self.summary(originals, time.perf_counter() - start)
+
+    def summary(self, originals, seconds):
+        counts = {}
+        for report in self.reports.values():
+            for entry in report['proxies'].values():
+                counts[entry['status']] = counts.get(entry['status'], 0) + 1
+            if report['thumbnail']:
+                key = f"thumbnail_{report['thumbnail']['status']}"
+                counts[key] = counts.get(key, 0) + 1
+            report['seconds'] = round(report['seconds'], 4)
+
+        return {
+            'root': self.root,
+            'mode': 'python' if bpy is None else 'blender',
+            'dry_run': self.dry_run,
+            'resolutions': self.resolutions,
+            'workers': self.workers,
+            'thumbnails': self.thumbnails,
+            'file_count': len(originals),
+            'counts': counts,
+            'seconds': round(seconds, 4),
+            'files': [self.reports[p] for p in originals if p in self.reports],
+        }
+
+def create_preview_baker():
+    """Object running the preview operator's generation code outside an operator"""
+    from .operators import HDRI_OT_generate_previews as Previews
+
+    class PreviewBaker:
+        get_thumb_path = Previews.get_thumb_path
+        get_preview_source = Previews.get_preview_source
+        generate_analytic_preview = Previews.generate_analytic_preview
+        generate_transfer_preview = Previews.generate_transfer_preview
+        generate_single_preview = Previews.generate_single_preview
+
+        def report(self, level, message):
+            print(f"{', '.join(sorted(level))}: {message}")
+
+    return PreviewBaker()
+
+def main(argv):
+    args = parse_args(argv)
+
+    root = args.root
+    resolutions = args.resolutions
+    if bpy is not None:
+        preferences = _get_preferences()
+        if preferences is not None:
+            root = root or bpy.path.abspath(preferences.hdri_directory)
+            resolutions = resolutions or [preferences.proxy_generation_resolution]
+    resolutions = [r.upper() for r in (resolutions or DEFAULT_RESOLUTIONS)]
+
+    if not root or not os.path.isdir(root):
+        print(f"Error: library folder not found: {root}", file=sys.stderr)
+        return 2
+    invalid = [r for r in resolutions if not resolution_width(r)]
+    if invalid:
+        print(f"Error: unknown proxy resolutions: {', '.join(invalid)}", file=sys.stderr)
+        return 2
+    if args.thumbnails and bpy is None:
+        print("Thumbnails need Blender, run with blender -b --python to bake them", file=sys.stderr)
+
+    summary = Prebake(os.path.abspath(root), resolutions, args.workers,
+                      args.thumbnails, args.dry_run).run()
+
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary['counts'].get('failed') or summary['counts'].get('thumbnail_failed') else 0
+
+def _load_package():
+    """Import the add-on package this script belongs to and return its prebake module.
+
+    Inside Blender the add-on is enabled so its preferences exist. In plain Python
+    the package is registered as a bare namespace, its __init__ needs bpy.
+    """
+    addon_dir = os.path.dirname(os.path.realpath(__file__))
+    package = os.path.basename(addon_dir)
+    parent = os.path.dirname(addon_dir)
+    if parent not in sys.path:
+        sys.path.append(parent)
+
+    if bpy is not None:
+        import addon_utils
+        addon_utils.enable(package, default_set=True)
+    elif package not in sys.modules:
+        stub = types.ModuleType(package)
+        stub.__path__ = [addon_dir]
+        sys.modules[package] = stub
+
+    return importlib.import_module(f"{package}.prebake")
+
+if __name__ == "__main__":
+    # Blender passes script arguments after "--"
+    if bpy is not None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    else:
+        argv = sys.argv[1:]
+    sys.exit(_load_package().main(argv))
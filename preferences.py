@@ -296,12 +296,64 @@ class QuickHDRIPreferences(AddonPreferences):
         default='ORBS_4'
     )
 
+    use_thumbnail_atlas: BoolProperty(
+        name="Thumbnail Atlas",
+        description="Pack each folder's thumbnails into one atlas image so a folder's icons load with a single read",
+        default=False
+    )
+
+    preview_render_method: EnumProperty(
+        name="Render Method",
+        description="How preview thumbnails are produced",
+        items=[
+            ('CYCLES', 'Cycles Scene', 'Render the preview scene with Cycles'),
+            ('ANALYTIC', 'Analytic Orbs', 'Compute a mirror ball and diffuse ball directly from the HDRI, milliseconds per file'),
+            ('PRT', 'Relit Bake', 'Relight a one-time bake of the preview scene with each HDRI (bake first, falls back to Cycles)')
+        ],
+        default='CYCLES'
+    )
+
+    thumbnail_format: EnumProperty(
+        name="Thumbnail Format",
+        description="Storage format for generated thumbnails",
+        items=[
+            ('PNG', 'PNG', 'Full colour PNG'),
+            ('PNG_PALETTE', 'PNG 8-bit Palette', 'Quantized 256 colour PNG, several times smaller and faster to read over the network')
+        ],
+        default='PNG'
+    )
+
+    thumbnail_max_width: IntProperty(
+        name="Stored Thumbnail Width",
+        description="Maximum stored width of inspection-size thumbnails, larger renders are downsampled before saving",
+        default=1024,
+        min=256,
+        max=2048
+    )
+
+    preview_use_proxy: BoolProperty(
+        name="Render From Proxy",
+        description="Render previews from a low resolution proxy instead of the full HDRI. Existing proxies are reused, missing ones are created",
+        default=False
+    )
+
+    preview_proxy_resolution: EnumProperty(
+        name="Preview Proxy Resolution",
+        description="Resolution of the proxy used for preview renders",
+        items=[
+            ('1K', '1K', '1024 pixels width'),
+            ('2K', '2K', '2048 pixels width')
+        ],
+        default='2K'
+    )
+
     # Proxy Settings
     default_proxy_resolution: EnumProperty(
         name="Default Proxy Resolution",
         description="Default resolution for HDRI proxies",
         items=[
             ('ORIGINAL', 'Original', 'Use original resolution'),
+            ('AUTO', 'Auto', 'Smallest proxy covering the viewport, within the memory budget'),
             ('1K', '1K', 'Use 1K resolution'),
             ('2K', '2K', 'Use 2K resolution'),
             ('4K', '4K', 'Use 4K resolution'),
@@ -311,7 +363,7 @@ class QuickHDRIPreferences(AddonPreferences):
 
     proxy_cache_limit: IntProperty(
         name="Proxy Cache Limit",
-        description="Maximum size for proxy cache in megabytes",
+        description="Maximum size for proxy cache in megabytes. Least recently used proxies are removed when it is exceeded",
         default=500,
         min=1,
         max=999999999
@@ -346,16 +398,145 @@ class QuickHDRIPreferences(AddonPreferences):
         default=""
     )
 
+    proxy_engine: EnumProperty(
+        name="Proxy Engine",
+        description="How proxies are downsampled from the original HDRI",
+        items=[
+            ('BLENDER', 'Blender', 'Image.scale on the loaded original'),
+            ('NUMPY', 'NumPy Area', 'Energy-preserving area average computed with NumPy'),
+            ('STREAMING', 'Streaming', 'NumPy area average reading .hdr originals in bands of scanlines, memory follows the proxy size instead of the original. Other formats use NumPy Area')
+        ],
+        default='STREAMING'
+    )
+
+    proxy_auto_memory_budget: IntProperty(
+        name="Auto Memory Budget",
+        description="Largest image memory in megabytes an Auto resolution proxy may use once loaded (1K is 8 MB, 2K 32 MB, 4K 128 MB)",
+        default=256,
+        min=8,
+        max=65536
+    )
+
+    proxy_prefetch_count: IntProperty(
+        name="Prefetch Neighbours",
+        description="Generate proxies for this many next and previous HDRIs of the current listing in the background (Radiance .hdr only), 0 disables prefetching",
+        default=2,
+        min=0,
+        max=10
+    )
+
+    proxy_prefetch_preload: BoolProperty(
+        name="Preload Prefetched Proxies",
+        description="Also load prefetched proxies into memory so switching to them is instant. Uses more memory",
+        default=False
+    )
+
+    proxy_use_workers: BoolProperty(
+        name="Use Worker Processes",
+        description="Generate proxies of .hdr files in background processes using every core, keeping Blender responsive. Other formats are still generated in Blender",
+        default=True
+    )
+
+    proxy_worker_count: IntProperty(
+        name="Workers",
+        description="Number of worker processes, 0 uses all cores but one",
+        default=0,
+        min=0,
+        max=64
+    )
+
+    tiled_proxy_render: BoolProperty(
+        name="Render From Tiled EXR",
+        description="With Viewport Only proxies, render from the tiled mip-mapped EXR of an HDRI instead of the original when an up to date one exists",
+        default=False
+    )
+
+    tiled_proxy_tile_size: EnumProperty(
+        name="Tile Size",
+        description="Tile size of tiled EXRs",
+        items=[
+            ('32', '32', '32x32 pixel tiles'),
+            ('64', '64', '64x64 pixel tiles'),
+            ('128', '128', '128x128 pixel tiles'),
+        ],
+        default='64'
+    )
+
+    tiled_proxy_codec: EnumProperty(
+        name="Tiled EXR Codec",
+        description="Compression of tiled EXRs",
+        items=[
+            ('ZIP', 'ZIP', 'Lossless, smaller files'),
+            ('NONE', 'None', 'Uncompressed, fastest to read'),
+        ],
+        default='ZIP'
+    )
+
+    proxy_pyramid: BoolProperty(
+        name="Proxy Pyramid",
+        description="Decode each original once and cascade down to every selected proxy resolution",
+        default=False
+    )
+
+    proxy_pyramid_resolutions: EnumProperty(
+        name="Pyramid Resolutions",
+        description="Proxy resolutions written in pyramid mode (only those smaller than the source)",
+        items=[
+            ('1K', '1K', '1024 pixels width'),
+            ('2K', '2K', '2048 pixels width'),
+            ('4K', '4K', '4096 pixels width'),
+            ('8K', '8K', '8192 pixels width'),
+        ],
+        options={'ENUM_FLAG'},
+        default={'1K', '2K', '4K'}
+    )
+
     proxy_format: EnumProperty(
         name="Proxy Format",
         description="File format for proxy files",
         items=[
-            ('HDR', 'HDR', 'OpenEXR HDR format'),
-            ('EXR', 'EXR', 'OpenEXR format'),
+            ('HDR', 'HDR', 'Radiance RGBE .hdr'),
+            ('EXR', 'EXR', '16-bit half float OpenEXR, about half the size of .hdr'),
         ],
         default='EXR'
     )
 
+    proxy_storage: EnumProperty(
+        name="Proxy Storage",
+        description="Where proxies are stored",
+        items=[
+            ('LOCAL', 'Next to HDRI', 'Proxies folder next to each HDRI. Read-only folders fall back to the central store'),
+            ('CENTRAL', 'Central Store', 'One local folder keyed by file content, identical HDRIs share their proxies'),
+        ],
+        default='LOCAL'
+    )
+
+    central_proxy_directory: StringProperty(
+        name="Central Proxy Directory",
+        description="Folder of the central proxy store, ideally on fast local disk. Empty uses the Blender user data folder",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    proxy_verify_hash: BoolProperty(
+        name="Verify Proxy Sources by Hash",
+        description="Record a content hash of each original with its proxy, so copied or touched files that didn't change keep their proxies",
+        default=False
+    )
+
+    proxy_exr_codec: EnumProperty(
+        name="EXR Codec",
+        description="Compression codec for EXR proxies",
+        items=[
+            ('ZIP', 'ZIP', 'Lossless, good ratio'),
+            ('PIZ', 'PIZ', 'Lossless wavelet, good for noisy images'),
+            ('DWAA', 'DWAA', 'Lossy, smallest files and fast to load'),
+            ('RLE', 'RLE', 'Lossless run length, fastest to encode'),
+            ('NONE', 'None', 'No compression'),
+        ],
+        default='ZIP'
+    )
+
     proxy_generation_device: EnumProperty(
         name="Render Device",
         description="Device to use for proxy generation",
@@ -504,11 +685,20 @@ class QuickHDRIPreferences(AddonPreferences):
         update=update_panel_location
     )
 
+    batch_tick_budget_ms: IntProperty(
+        name="Batch Tick Budget",
+        description="Milliseconds of work per UI update during batch generation. Fast items are processed several per update, higher values finish sooner but make the UI less responsive",
+        default=50,
+        min=10,
+        max=1000
+    )
+
     # Statistics and Previews
     preview_stats_total: IntProperty(default=0)
     preview_stats_completed: IntProperty(default=0)
     preview_stats_failed: IntProperty(default=0)
     preview_stats_time: FloatProperty(default=0.0)
+    preview_stats_throughput: FloatProperty(default=0.0)
     preview_stats_current_file: StringProperty(default="")
     is_generating: BoolProperty(default=False)
 
@@ -517,6 +707,7 @@ class QuickHDRIPreferences(AddonPreferences):
     proxy_stats_completed: IntProperty(default=0)
     proxy_stats_failed: IntProperty(default=0)
     proxy_stats_time: FloatProperty(default=0.0)
+    proxy_stats_throughput: FloatProperty(default=0.0)
     proxy_stats_current_file: StringProperty(default="")
     is_proxy_generating: BoolProperty(default=False)
 
@@ -729,6 +920,26 @@ class QuickHDRIPreferences(AddonPreferences):
             print(f"Failed to load preview image '{self.preview_image}': {str(e)}")
             return 0
 
+    def draw_interrupted_batch(self, layout, kind):
+        """Draw resume/discard actions when a full batch run was interrupted"""
+        from . import batch_jobs
+        job = batch_jobs.load_job(kind)
+        if not job:
+            return
+
+        pending = len(batch_jobs.get_pending_files(job))
+        if not pending:
+            return
+
+        resume_box = layout.box()
+        resume_box.alert = True
+        resume_box.label(text=f"Interrupted Full Batch: {len(job['files']) - pending}/{len(job['files'])} done", icon='ERROR')
+        row = resume_box.row(align=True)
+        op = row.operator("world.resume_hdri_batch_job", text="Resume", icon='PLAY')
+        op.kind = kind
+        op = row.operator("world.discard_hdri_batch_job", text="Discard", icon='X')
+        op.kind = kind
+
     def draw(self, context):
         from . import utils
 
@@ -1003,6 +1214,9 @@ class QuickHDRIPreferences(AddonPreferences):
                 grid.label(text="Time Elapsed:")
                 grid.label(text=f"{self.preview_stats_time:.2f} seconds")
 
+                grid.label(text="Throughput:")
+                grid.label(text=f"{self.preview_stats_throughput:.2f} items/sec")
+
             else:
                 # Preview Generation Options
                 gen_box = main_col.box()
@@ -1038,17 +1252,38 @@ class QuickHDRIPreferences(AddonPreferences):
                     # Quality settings grid
                     quality_grid = quality_box.grid_flow(row_major=True, columns=2, even_columns=True)
 
+                    quality_grid.label(text="Render Method:")
+                    quality_grid.prop(self, "preview_render_method", text="")
+
+                    is_analytic = self.preview_render_method == 'ANALYTIC'
+
                     quality_grid.label(text="Scene Type:")
-                    quality_grid.prop(self, "preview_scene_type", text="")
+                    sub = quality_grid.row(align=True)
+                    sub.enabled = not is_analytic
+                    sub.prop(self, "preview_scene_type", text="")
+                    if self.preview_render_method == 'PRT':
+                        sub.operator("world.bake_hdri_preview_transfer", text="", icon='RENDER_STILL')
 
                     quality_grid.label(text="Render Device:")
-                    quality_grid.prop(self, "preview_render_device", text="")
+                    sub = quality_grid.row()
+                    sub.enabled = not is_analytic
+                    sub.prop(self, "preview_render_device", text="")
 
                     quality_grid.label(text="Resolution:")
                     quality_grid.prop(self, "preview_resolution", text="%")
 
                     quality_grid.label(text="Render Samples:")
-                    quality_grid.prop(self, "preview_samples", text="")
+                    sub = quality_grid.row()
+                    sub.enabled = not is_analytic
+                    sub.prop(self, "preview_samples", text="")
+
+                    quality_grid.label(text="Tick Budget (ms):")
+                    quality_grid.prop(self, "batch_tick_budget_ms", text="")
+
+                    quality_grid.prop(self, "preview_use_proxy", text="Render From Proxy")
+                    proxy_res = quality_grid.row()
+                    proxy_res.enabled = self.preview_use_proxy
+                    proxy_res.prop(self, "preview_proxy_resolution", text="")
 
                     # Output Resolution Info
                     res_box = quality_box.box()
@@ -1057,6 +1292,17 @@ class QuickHDRIPreferences(AddonPreferences):
                     actual_y = int(768 * (self.preview_resolution / 100))
                     res_box.label(text=f"Output Resolution: {actual_x} × {actual_y} pixels")
 
+                    # Thumbnail Storage
+                    storage_row = quality_box.row(align=True)
+                    storage_row.prop(self, "thumbnail_format", text="")
+                    storage_row.prop(self, "thumbnail_max_width", text="Max Width")
+                    storage_row.operator("world.reencode_hdri_thumbnails", text="", icon='FILE_REFRESH')
+
+                    # Thumbnail Atlas
+                    atlas_row = quality_box.row(align=True)
+                    atlas_row.prop(self, "use_thumbnail_atlas", text="Pack Folder Thumbnail Atlas")
+                    atlas_row.operator("world.build_thumbnail_atlases", text="", icon='FILE_REFRESH')
+
                     # Generation Button
                     gen_col.separator()
                     action_row = gen_col.row(align=True)
@@ -1074,6 +1320,8 @@ class QuickHDRIPreferences(AddonPreferences):
                         icon='RENDER_STILL'
                     )
 
+                    self.draw_interrupted_batch(gen_col, 'PREVIEWS')
+
                 # Preview Limit section
                 preview_limit_box = main_col.box()
                 preview_limit_header = preview_limit_box.row()
@@ -1112,6 +1360,9 @@ class QuickHDRIPreferences(AddonPreferences):
                     status_grid.label(text="Total Time:")
                     status_grid.label(text=f"{self.preview_stats_time:.2f} seconds")
 
+                    status_grid.label(text="Throughput:")
+                    status_grid.label(text=f"{self.preview_stats_throughput:.2f} items/sec")
+
                     clear_row = status_box.row()
                     clear_row.operator("world.clear_preview_stats", text="Clear Results", icon='X')
 
@@ -1129,6 +1380,23 @@ class QuickHDRIPreferences(AddonPreferences):
             settings_col = col.column(align=True)
             settings_col.prop(self, "default_proxy_resolution", text="Default Resolution")
             settings_col.prop(self, "default_proxy_mode", text="Default Application")
+            settings_col.prop(self, "proxy_auto_memory_budget", text="Auto Budget (MB)")
+
+            format_row = settings_col.row(align=True)
+            format_row.prop(self, "proxy_format", text="Format")
+            codec = format_row.row(align=True)
+            codec.enabled = self.proxy_format == 'EXR'
+            codec.prop(self, "proxy_exr_codec", text="")
+
+            row = settings_col.row(align=True)
+            row.prop(self, "proxy_prefetch_count")
+            sub = row.row(align=True)
+            sub.enabled = self.proxy_prefetch_count > 0
+            sub.prop(self, "proxy_prefetch_preload", text="Preload")
+
+            settings_col.prop(self, "proxy_storage", text="Storage")
+            if self.proxy_storage == 'CENTRAL':
+                settings_col.prop(self, "central_proxy_directory", text="Store")
 
             cache_header = settings_col.row()
             cache_header.prop(self, "show_cache_settings",
@@ -1140,7 +1408,18 @@ class QuickHDRIPreferences(AddonPreferences):
                 cache_box = settings_col.box()
                 cache_col = cache_box.column(align=True)
                 cache_col.prop(self, "proxy_cache_limit", text="Cache Size Limit (MB)")
+                from . import proxy_cache
+                cache_size = proxy_cache.get_cache_size() / (1024 * 1024)
+                cache_col.label(text=f"Current Usage: {cache_size:.1f} / {self.proxy_cache_limit} MB")
+                if proxy_cache.is_scanning():
+                    cache_col.label(text="Scanning library for proxies...", icon='SORTTIME')
                 cache_col.operator("world.cleanup_hdri_proxies", text="Clear Proxy Cache", icon='TRASH')
+                cache_col.separator()
+                cache_col.prop(self, "proxy_verify_hash")
+                cache_col.operator("world.verify_hdri_proxies", text="Verify Proxies", icon='CHECKMARK')
+                from . import proxy_manifest
+                if proxy_manifest.get_queue_length():
+                    cache_col.label(text=f"Regenerating {proxy_manifest.get_queue_length()} proxies...", icon='SORTTIME')
 
             # Proxy Generation
             gen_header = settings_col.row()
@@ -1161,6 +1440,25 @@ class QuickHDRIPreferences(AddonPreferences):
                 row = box.row()
                 row.prop(self, "proxy_generation_resolution", text="Resolution")
 
+                row = box.row()
+                row.prop(self, "batch_tick_budget_ms", text="Tick Budget (ms)")
+
+                row = box.row(align=True)
+                row.prop(self, "proxy_pyramid", text="Pyramid")
+                sub = row.row(align=True)
+                sub.enabled = self.proxy_pyramid
+                sub.prop(self, "proxy_pyramid_resolutions", expand=True)
+
+                row = box.row(align=True)
+                row.prop(self, "proxy_engine", text="Engine")
+                row.operator("world.benchmark_hdri_proxy_engines", text="", icon='TIME')
+
+                row = gen_col.row(align=True)
+                row.prop(self, "proxy_use_workers")
+                sub = row.row(align=True)
+                sub.enabled = self.proxy_use_workers
+                sub.prop(self, "proxy_worker_count")
+
                 gen_col.separator()
 
                 # Generation Status
@@ -1180,6 +1478,10 @@ class QuickHDRIPreferences(AddonPreferences):
                     time_row = status_box.row(align=True)
                     time_row.label(text="Elapsed Time:")
                     time_row.label(text=f"{self.proxy_stats_time:.2f} seconds")
+
+                    rate_row = status_box.row(align=True)
+                    rate_row.label(text="Throughput:")
+                    rate_row.label(text=f"{self.proxy_stats_throughput:.2f} items/sec")
                 else:
                     # Generation Buttons
                     row = box.row(align=True)
@@ -1188,6 +1490,14 @@ class QuickHDRIPreferences(AddonPreferences):
                     sub.operator("world.generate_hdri_proxies", text="Generate Proxies")
                     sub.operator("world.full_batch_hdri_proxies", text="Full Batch Process")
 
+                    row = box.row(align=True)
+                    row.operator("world.generate_tiled_hdri_proxies", icon='TEXTURE')
+                    row.prop(self, "tiled_proxy_tile_size", text="")
+                    row.prop(self, "tiled_proxy_codec", text="")
+                    box.prop(self, "tiled_proxy_render")
+
+                    self.draw_interrupted_batch(box, 'PROXIES')
+
                 # Generation Results
                 if self.proxy_stats_total > 0 and not self.is_proxy_generating:
                     result_box = gen_col.box()
@@ -1208,6 +1518,10 @@ class QuickHDRIPreferences(AddonPreferences):
                     time_row.label(text="Total Time:")
                     time_row.label(text=f"{self.proxy_stats_time:.2f} seconds")
 
+                    rate_row = result_box.row(align=True)
+                    rate_row.label(text="Throughput:")
+                    rate_row.label(text=f"{self.proxy_stats_throughput:.2f} items/sec")
+
                     # Clear Results Button
                     clear_row = result_box.row(align=True)
                     clear_row.operator("world.clear_proxy_stats", text="Clear Results", icon='X')
@@ -0,0 +1,156 @@
+"""
+Quick HDRI Controls - Precomputed radiance transfer for preview thumbnails
+"""
+import os
+import numpy as np
+from . import analytic_previews, imaging
+
+# Environment basis - piecewise constant cells over the equirect map
+BASIS_COLUMNS = 16
+BASIS_ROWS = 8
+
+# Resolution the preview scene is baked at. Fixed, the transfer holds a
+# value per pixel and basis cell (about 75 MB here, 1.2 GB at 1024x768).
+# Relit thumbnails are resized to the preview resolution afterwards.
+BAKE_WIDTH = 256
+BAKE_HEIGHT = 192
+
+# Loaded transfer data keyed by path -> (mtime, data)
+_transfer_cache = {}
+
+def get_transfer_path(support_blend_path, scene_type):
+    return os.path.join(os.path.dirname(support_blend_path),
+                        f"preview_transfer_{scene_type.lower()}.npz")
+
+def basis_count(columns=BASIS_COLUMNS, rows=BASIS_ROWS):
+    return columns * rows
+
+def basis_pixels(index, columns=BASIS_COLUMNS, rows=BASIS_ROWS):
+    """RGBA pixels of a columns x rows environment lit only in one cell (-1 = all dark)"""
+    pixels = np.zeros((rows * columns, 4), dtype=np.float32)
+    pixels[:, 3] = 1.0
+    if index >= 0:
+        pixels[index, :3] = 1.0
+    return pixels.ravel()
+
+def cell_radiance(env, columns=BASIS_COLUMNS, rows=BASIS_ROWS):
+    """Solid-angle weighted mean radiance of each basis cell, shape (columns * rows, 3).
+
+    The env rows run bottom-up, matching the cell order of basis_pixels.
+    """
+    height, width = env.shape[:2]
+    elevation = ((np.arange(height, dtype=np.float32) + 0.5) / height - 0.5) * np.pi
+    weights = np.cos(elevation)
+
+    row_edges = np.linspace(0, height, rows + 1).astype(np.int32)
+    column_edges = np.linspace(0, width, columns + 1).astype(np.int32)
+
+    # Weighted column sums per cell row, then split the columns into cells
+    radiance = np.zeros((rows, columns, 3), dtype=np.float32)
+    for r in range(rows):
+        r0, r1 = row_edges[r], row_edges[r + 1]
+        w = weights[r0:r1]
+        row_sum = np.tensordot(w, env[r0:r1], axes=(0, 0))  # (width, 3)
+        cumulative = np.vstack([np.zeros((1, 3), dtype=np.float64), np.cumsum(row_sum, axis=0)])
+        cell_sums = cumulative[column_edges[1:]] - cumulative[column_edges[:-1]]
+        cell_weights = w.sum() * np.diff(column_edges)[:, None]
+        radiance[r] = cell_sums / np.maximum(cell_weights, 1e-8)
+
+    return radiance.reshape(rows * columns, 3)
+
+def camera_ray_directions(corners, matrix, width, height):
+    """World directions of every pixel (rows bottom-up) from camera view frame corners.
+
+    corners are the camera's view_frame points (top-right, bottom-right,
+    bottom-left, top-left) in camera space, matrix its 3x3 world rotation.
+    """
+    top_right, bottom_right, bottom_left, top_left = [np.asarray(c, dtype=np.float32) for c in corners]
+    fx = ((np.arange(width, dtype=np.float32) + 0.5) / width)[None, :, None]
+    fy = ((np.arange(height, dtype=np.float32) + 0.5) / height)[:, None, None]
+    local = bottom_left + (bottom_right - bottom_left) * fx + (top_left - bottom_left) * fy
+    directions = local @ np.asarray(matrix, dtype=np.float32).T
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+def save_transfer(path, transfer, constant, alpha, directions, columns=BASIS_COLUMNS, rows=BASIS_ROWS):
+    np.savez_compressed(
+        path,
+        transfer=transfer.astype(np.float16),
+        constant=constant.astype(np.float32),
+        alpha=alpha.astype(np.float32),
+        directions=directions.astype(np.float16),
+        basis=np.array([columns, rows], dtype=np.int32),
+    )
+    _transfer_cache.pop(path, None)
+
+def load_transfer(path):
+    """Load baked transfer data, or None if there is no bake"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _transfer_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with np.load(path) as data:
+            transfer = {name: data[name] for name in data.files}
+    except Exception as e:
+        print(f"Error loading preview transfer {path}: {str(e)}")
+        return None
+
+    # Flatten once for fast relighting
+    height, width = transfer['alpha'].shape
+    transfer['transfer'] = transfer['transfer'].astype(np.float32).reshape(height * width, -1, 3)
+    transfer['directions'] = transfer['directions'].astype(np.float32)
+
+    _transfer_cache[path] = (mtime, transfer)
+    return transfer
+
+def _resize(array, width, height):
+    height_now, width_now = array.shape[:2]
+    if (width, height) == (width_now, height_now):
+        return array
+    if width <= width_now and height <= height_now:
+        return imaging.area_resample(array, width, height)
+    return imaging.bilinear_resample(array, width, height)
+
+def relight(transfer, env, width=None, height=None):
+    """Relight the baked scene with an environment, at the bake size or width x height.
+
+    The lit geometry is resized from the bake, the environment behind it is
+    sampled at the output size so it stays sharp.
+    Returns a (height, width, 4) display-referred image, rows bottom-up.
+    """
+    columns, rows = (int(v) for v in transfer['basis'])
+    bake_height, bake_width = transfer['alpha'].shape
+    width = width or bake_width
+    height = height or bake_height
+
+    radiance = cell_radiance(env, columns, rows)  # (K, 3)
+    geometry = np.einsum('pkc,kc->pc', transfer['transfer'], radiance).reshape(bake_height, bake_width, 3)
+    geometry += transfer['constant']
+
+    geometry = _resize(geometry, width, height)
+    alpha = _resize(transfer['alpha'], width, height)
+    directions = _resize(transfer['directions'], width, height)
+    directions /= np.maximum(np.linalg.norm(directions, axis=-1, keepdims=True), 1e-8)
+
+    # Geometry is premultiplied by coverage, the environment fills in behind it
+    background = analytic_previews.sample_environment(env, directions)
+    image = geometry + (1.0 - alpha)[..., None] * background
+
+    output = np.ones((height, width, 4), dtype=np.float32)
+    output[..., :3] = analytic_previews.tonemap(image)
+    return output
+
+def render_preview(transfer, hdri_path, thumb_path, width=None, height=None):
+    """Relight baked transfer with an HDRI and write the thumbnail at width x height"""
+    try:
+        env = analytic_previews.load_environment(hdri_path)
+        analytic_previews.save_image(relight(transfer, env, width, height), thumb_path)
+        return os.path.exists(thumb_path)
+    except Exception as e:
+        print(f"Error relighting preview for {hdri_path}: {str(e)}")
+        return False
@@ -0,0 +1,141 @@
+"""
+Quick HDRI Controls - Automatic proxy resolution from viewport size and memory budget
+"""
+import bpy
+
+AUTO = 'AUTO'
+
+# Blender holds float images as RGBA float32
+BYTES_PER_PIXEL = 16
+
+# Equirectangular maps are half as high as they are wide
+ASPECT = 0.5
+
+# Seconds between checks for viewport resizes and engine switches
+WATCH_INTERVAL = 1.0
+
+DEFAULT_MEMORY_BUDGET = 256
+
+# Scene name -> (render engine, resolution) currently applied
+_applied = {}
+
+# Scene name -> state seen on the last check, applied once it holds for two checks
+_candidates = {}
+
+def _get_preferences():
+    from .utils import get_addon_name
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def get_memory_budget():
+    """Image memory budget of an AUTO proxy in megabytes"""
+    preferences = _get_preferences()
+    if preferences is None:
+        return DEFAULT_MEMORY_BUDGET
+    return preferences.proxy_auto_memory_budget
+
+def get_viewport_width():
+    """Pixel width of the widest 3D viewport in any window, 0 when there is none"""
+    width = 0
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type != 'VIEW_3D':
+                    continue
+                for region in area.regions:
+                    if region.type == 'WINDOW':
+                        width = max(width, region.width)
+    except AttributeError:
+        pass
+    return width
+
+def estimate_memory(width):
+    """Bytes an equirectangular proxy of this width takes once loaded"""
+    return width * int(width * ASPECT) * BYTES_PER_PIXEL
+
+def choose_resolution(viewport_width, budget_mb):
+    """Smallest proxy at least as wide as the viewport, capped by the memory budget.
+
+    Without a viewport (background, render farm) the largest proxy within the
+    budget is used. The smallest proxy is used when even it exceeds the budget.
+    """
+    from .utils import PROXY_RESOLUTIONS
+
+    ordered = sorted(PROXY_RESOLUTIONS, key=PROXY_RESOLUTIONS.get)
+    budget = budget_mb * 1024 * 1024
+    fitting = [r for r in ordered if estimate_memory(PROXY_RESOLUTIONS[r]) <= budget] or ordered[:1]
+
+    if viewport_width:
+        for resolution in fitting:
+            if PROXY_RESOLUTIONS[resolution] >= viewport_width:
+                return resolution
+    return fitting[-1]
+
+def resolve(resolution):
+    """Concrete proxy resolution for a proxy_resolution value, AUTO is evaluated now"""
+    if resolution != AUTO:
+        return resolution
+    return choose_resolution(get_viewport_width(), get_memory_budget())
+
+def _get_state(scene):
+    return scene.render.engine, resolve(AUTO)
+
+def remember(scene):
+    """Record the resolution an AUTO proxy was just applied at"""
+    _applied[scene.name] = _get_state(scene)
+    _candidates.pop(scene.name, None)
+
+def _apply(scene):
+    """Re-run the engine's proxy update with a window context, as if the setting changed"""
+    window_manager = bpy.context.window_manager
+    window = window_manager.windows[0] if window_manager and window_manager.windows else None
+    try:
+        if window is None:
+            scene.hdri_settings.update_hdri_proxy(bpy.context)
+        else:
+            with bpy.context.temp_override(window=window, screen=window.screen):
+                scene.hdri_settings.update_hdri_proxy(bpy.context)
+    except Exception as e:
+        print(f"Error applying automatic proxy resolution: {str(e)}")
+
+def watch():
+    """Timer re-applying AUTO proxies when the viewport is resized or the engine changes"""
+    scene = bpy.context.scene
+    settings = getattr(scene, "hdri_settings", None) if scene else None
+    if settings is None or settings.proxy_resolution != AUTO:
+        _applied.clear()
+        _candidates.clear()
+        return None
+
+    # Never swap images under a running render
+    if bpy.app.is_job_running('RENDER'):
+        return WATCH_INTERVAL
+
+    state = _get_state(scene)
+    if scene.name not in _applied:
+        _applied[scene.name] = state
+    elif state != _applied[scene.name]:
+        # Wait for the size to settle so a drag doesn't create every proxy on the way
+        if _candidates.get(scene.name) == state:
+            print(f"Automatic proxy resolution: {_applied[scene.name][1]} -> {state[1]} ({state[0]})")
+            _apply(scene)
+            remember(scene)
+        else:
+            _candidates[scene.name] = state
+    else:
+        _candidates.pop(scene.name, None)
+
+    return WATCH_INTERVAL
+
+def start_watching():
+    if not bpy.app.timers.is_registered(watch):
+        bpy.app.timers.register(watch, first_interval=WATCH_INTERVAL)
+
+def stop_watching():
+    """Stop the watcher, called when the add-on is unregistered"""
+    if bpy.app.timers.is_registered(watch):
+        bpy.app.timers.unregister(watch)
+    _applied.clear()
+    _candidates.clear()
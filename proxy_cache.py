@@ -0,0 +1,285 @@
+"""
+Quick HDRI Controls - Proxy cache size limit with least-recently-used eviction
+"""
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bpy
+
+# Proxy path -> {'size': bytes, 'last_access': timestamp}
+_index = {}
+_index_loaded = False
+_save_pending = False
+
+# Seconds to wait before writing the index after a change
+SAVE_DELAY = 2.0
+
+# Seconds between checks on the background library scan
+SCAN_POLL = 0.5
+
+# Library scan for proxies the index doesn't know, walks the folders off the main thread
+_scan_pool = None
+_scan_future = None
+
+def get_index_path():
+    from .utils import get_state_path
+    return get_state_path("proxy_cache_index.json")
+
+def _get_preferences():
+    from .utils import get_addon_name
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def _normalize(path):
+    return os.path.normpath(os.path.abspath(bpy.path.abspath(path)))
+
+def _load_index():
+    """Load the saved index once, proxies it doesn't know are found by a background scan"""
+    global _index_loaded
+    if _index_loaded:
+        return
+    _index_loaded = True
+
+    try:
+        with open(get_index_path(), 'r') as f:
+            _index.update(json.load(f))
+    except (IOError, OSError, json.JSONDecodeError):
+        pass
+
+    request_scan()
+
+def _save_index():
+    global _save_pending
+    _save_pending = False
+    try:
+        with open(get_index_path(), 'w') as f:
+            json.dump(_index, f)
+    except (IOError, OSError) as e:
+        print(f"Error saving proxy cache index: {str(e)}")
+    return None
+
+def _schedule_save():
+    """Batch index writes - many proxies are touched in a row during batch runs"""
+    global _save_pending
+    if _save_pending:
+        return
+    _save_pending = True
+    try:
+        bpy.app.timers.register(_save_index, first_interval=SAVE_DELAY)
+    except Exception:
+        _save_index()
+
+def flush():
+    """Write a pending index change now, for runs that exit before the timer fires"""
+    if _save_pending:
+        _save_index()
+
+def find_untracked_proxies(folders, known, extensions):
+    """Proxy files under (folder, proxies only) pairs that aren't in known.
+
+    With proxies only, just files inside 'proxies' folders count (library),
+    otherwise every proxy file does (central store). Untracked proxies get
+    their modification time as last access. Doesn't touch bpy, runs on the
+    scan thread. Returns {proxy path: index entry}.
+    """
+    from . import proxy_lock
+
+    found = {}
+    for base_dir, proxies_only in folders:
+        if not os.path.isdir(base_dir):
+            continue
+        for root, dirs, files in os.walk(base_dir):
+            if proxies_only and os.path.basename(root) != 'proxies':
+                continue
+            for filename in files:
+                proxy_path = os.path.join(root, filename)
+                if (proxy_path in known or not filename.lower().endswith(extensions) or
+                        proxy_lock.is_temp_file(filename)):
+                    continue
+                try:
+                    stat = os.stat(proxy_path)
+                except OSError:
+                    continue
+                found[proxy_path] = {'size': stat.st_size, 'last_access': stat.st_mtime}
+    return found
+
+def request_scan():
+    """Reconcile the index with the library and central store on a background thread"""
+    from .utils import PROXY_EXTENSIONS
+    from . import proxy_store
+    global _scan_pool, _scan_future
+
+    if _scan_future is not None:
+        return
+
+    folders = []
+    preferences = _get_preferences()
+    if preferences and preferences.hdri_directory:
+        folders.append((_normalize(preferences.hdri_directory), True))
+    folders.append((_normalize(proxy_store.get_store_directory()), False))
+
+    if _scan_pool is None:
+        _scan_pool = ThreadPoolExecutor(max_workers=1)
+    _scan_future = _scan_pool.submit(find_untracked_proxies, folders, set(_index),
+                                     tuple(PROXY_EXTENSIONS.values()))
+    if not bpy.app.timers.is_registered(process_scan):
+        bpy.app.timers.register(process_scan, first_interval=SCAN_POLL)
+
+def is_scanning():
+    return _scan_future is not None
+
+def process_scan():
+    """Timer callback adding the proxies the background scan found"""
+    global _scan_future
+    if _scan_future is None:
+        return None
+    if not _scan_future.done():
+        return SCAN_POLL
+
+    future, _scan_future = _scan_future, None
+    try:
+        found = future.result()
+    except Exception as e:
+        print(f"Error scanning for proxies: {str(e)}")
+        return None
+
+    added = 0
+    for proxy_path, entry in found.items():
+        if proxy_path not in _index:
+            _index[proxy_path] = entry
+            added += 1
+    if added:
+        _schedule_save()
+        enforce_limit()
+    return None
+
+def shutdown():
+    """Stop the library scan, called when the add-on is unregistered"""
+    global _scan_pool, _scan_future
+    if _scan_pool is not None:
+        _scan_pool.shutdown(wait=False, cancel_futures=True)
+        _scan_pool = None
+    _scan_future = None
+    if bpy.app.timers.is_registered(process_scan):
+        bpy.app.timers.unregister(process_scan)
+    flush()
+
+def is_proxy_path(path):
+    """Whether a path lies in a proxies folder or the central store - nothing else is ever evicted"""
+    from . import proxy_store
+
+    path = _normalize(path)
+    if os.path.basename(os.path.dirname(path)) == 'proxies':
+        return True
+    store_dir = _normalize(proxy_store.get_store_directory())
+    try:
+        return os.path.commonpath([path, store_dir]) == store_dir
+    except ValueError:
+        # Different drives
+        return False
+
+def touch(proxy_path):
+    """Record that a proxy was loaded or written, then enforce the size limit.
+
+    The touched proxy itself is never evicted.
+    """
+    if not proxy_path:
+        return proxy_path
+    _load_index()
+
+    path = _normalize(proxy_path)
+    if not is_proxy_path(path):
+        return proxy_path
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        _index.pop(path, None)
+        return proxy_path
+
+    _index[path] = {'size': size, 'last_access': time.time()}
+    _schedule_save()
+    enforce_limit(protect={path})
+    return proxy_path
+
+def forget(proxy_path):
+    """Drop a proxy that was removed outside the cache manager"""
+    _load_index()
+    if _index.pop(_normalize(proxy_path), None) is not None:
+        _schedule_save()
+
+def clear():
+    """Forget every tracked proxy, used after the proxy folders are wiped"""
+    global _scan_future
+    _load_index()
+    # A running scan may still report the wiped files
+    _scan_future = None
+    _index.clear()
+    _save_index()
+
+def get_cache_size():
+    """Total size of tracked proxies in bytes, never walks the library (safe in draw)"""
+    _load_index()
+    return sum(entry['size'] for entry in _index.values())
+
+def _images_in_use():
+    in_use = set()
+    for image in bpy.data.images:
+        if image.filepath:
+            try:
+                in_use.add(_normalize(image.filepath))
+            except Exception:
+                continue
+    return in_use
+
+def enforce_limit(limit_mb=None, protect=()):
+    """Evict least recently used proxies until the cache fits in the limit.
+
+    Proxies loaded in the blend file and paths in protect are skipped, files
+    outside the proxies folders and the central store are dropped from the
+    index without being touched.
+    Returns (files removed, bytes freed).
+    """
+    _load_index()
+
+    # Never delete an original that ended up in the index
+    for path in [p for p in _index if not is_proxy_path(p)]:
+        del _index[path]
+
+    if limit_mb is None:
+        preferences = _get_preferences()
+        if preferences is None:
+            return 0, 0
+        limit_mb = preferences.proxy_cache_limit
+
+    limit = limit_mb * 1024 * 1024
+    total = sum(entry['size'] for entry in _index.values())
+    if total <= limit:
+        return 0, 0
+
+    skip = set(protect) | _images_in_use()
+    removed = 0
+    freed = 0
+    for path, entry in sorted(_index.items(), key=lambda item: item[1]['last_access']):
+        if total <= limit:
+            break
+        if path in skip:
+            continue
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            print(f"Error evicting proxy {path}: {str(e)}")
+            continue
+
+        del _index[path]
+        total -= entry['size']
+        freed += entry['size']
+
+    if removed:
+        print(f"Proxy cache: evicted {removed} proxies ({freed / (1024 * 1024):.1f} MB)")
+    _schedule_save()
+    return removed, freed
@@ -0,0 +1,197 @@
+"""
+Quick HDRI Controls - Atomic proxy writes and cross-instance proxy locks
+
+Nothing here imports bpy, worker processes use it too.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import threading
+from contextlib import contextmanager
+
+# Seconds interactive callers wait for another instance before using the original
+LOCK_TIMEOUT = 2.0
+
+# Held locks are touched this often, so a lock that stops aging is abandoned
+LOCK_REFRESH = 10.0
+
+# Locks not refreshed for this long were left by a crashed instance or farm node
+STALE_LOCK_AGE = 60.0
+
+# Seconds between checks while waiting on a lock
+LOCK_POLL = 0.25
+
+TEMP_MARKER = ".tmp"
+
+# Lock files this process holds, kept fresh by the heartbeat thread
+_held = set()
+_held_guard = threading.Lock()
+_heartbeat = None
+
+def get_lock_path(proxy_path):
+    return proxy_path + ".lock"
+
+def temp_path(path):
+    """Unique temporary name next to path, keeping its extension so writers pick the format"""
+    base, extension = os.path.splitext(path)
+    return f"{base}.{os.getpid()}-{uuid.uuid4().hex[:8]}{TEMP_MARKER}{extension}"
+
+def is_temp_file(filename):
+    return TEMP_MARKER + "." in filename
+
+@contextmanager
+def atomic_write(path):
+    """Yield a temporary path to write to, renamed over path once the write succeeded.
+
+    Readers only ever see the old file or the complete new one.
+    """
+    temp = temp_path(path)
+    try:
+        yield temp
+        if os.path.exists(temp):
+            os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+def _owner_alive(lock_path):
+    """False only when the lock was taken by a process on this machine that has exited"""
+    try:
+        with open(lock_path, 'r') as f:
+            owner = json.load(f)
+    except (IOError, OSError, ValueError):
+        return True
+
+    if owner.get('host') != socket.gethostname() or sys.platform == 'win32':
+        return True
+    try:
+        os.kill(int(owner.get('pid', 0)), 0)
+    except ProcessLookupError:
+        return False
+    except (OSError, ValueError):
+        pass
+    return True
+
+def _is_stale(lock_path):
+    try:
+        age = time.time() - os.path.getmtime(lock_path)
+    except OSError:
+        return False
+    return age > STALE_LOCK_AGE or not _owner_alive(lock_path)
+
+def _break_stale(lock_path):
+    """Remove a stale lock, True unless another instance got to it first.
+
+    The lock is renamed aside before anything else. The rename is atomic, so of
+    several instances breaking the same lock only one moves it, and the moved
+    file is checked again in case a fresh lock replaced the stale one after it
+    was inspected - that one is put back.
+    """
+    moved = f"{lock_path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.stale"
+    try:
+        os.rename(lock_path, moved)
+    except OSError:
+        return False
+
+    try:
+        if not _is_stale(moved):
+            with open(moved, 'rb') as f:
+                owner = f.read()
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(owner)
+            except OSError:
+                pass
+            return False
+        print(f"Breaking stale proxy lock: {lock_path}")
+        return True
+    finally:
+        try:
+            os.remove(moved)
+        except OSError:
+            pass
+
+def _refresh_held():
+    """Heartbeat thread touching every held lock until none are left"""
+    global _heartbeat
+    while True:
+        time.sleep(LOCK_REFRESH)
+        with _held_guard:
+            if not _held:
+                _heartbeat = None
+                return
+            lock_paths = list(_held)
+        for lock_path in lock_paths:
+            try:
+                os.utime(lock_path)
+            except OSError:
+                pass
+
+def _hold(lock_path):
+    global _heartbeat
+    with _held_guard:
+        _held.add(lock_path)
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_refresh_held, name="proxy-lock-heartbeat", daemon=True)
+            _heartbeat.start()
+
+def is_locked(proxy_path):
+    """Whether another holder currently has the lock of a proxy"""
+    lock_path = get_lock_path(proxy_path)
+    return os.path.exists(lock_path) and not _is_stale(lock_path)
+
+def acquire(proxy_path, timeout=LOCK_TIMEOUT):
+    """Take the lock of a proxy, waiting up to timeout for another holder.
+
+    Stale locks are broken. Returns True once the lock is held, False on timeout,
+    in which case nothing may be written. Held locks are refreshed in the
+    background until released. After waiting, callers should check whether
+    the other holder produced the proxy.
+    """
+    lock_path = get_lock_path(proxy_path)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _is_stale(lock_path) and _break_stale(lock_path):
+                continue
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL)
+            continue
+        except OSError as e:
+            # Read-only folder - nobody else can write there either
+            print(f"Could not create proxy lock {lock_path}: {str(e)}")
+            return True
+
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'host': socket.gethostname(), 'pid': os.getpid(), 'time': time.time()}, f)
+        _hold(lock_path)
+        return True
+
+def release(proxy_path):
+    lock_path = get_lock_path(proxy_path)
+    with _held_guard:
+        _held.discard(lock_path)
+    try:
+        os.remove(lock_path)
+    except OSError:
+        pass
+
+@contextmanager
+def locked(proxy_path, timeout=LOCK_TIMEOUT):
+    """Hold the lock of a proxy for the duration of the block, yields whether it was acquired"""
+    acquired = acquire(proxy_path, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            release(proxy_path)
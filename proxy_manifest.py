@@ -0,0 +1,293 @@
+"""
+Quick HDRI Controls - Proxy source manifest and stale proxy regeneration
+"""
+import os
+import json
+import bpy
+
+# Per-folder manifest describing the source each proxy was generated from
+MANIFEST_NAME = "_proxy_manifest.json"
+MANIFEST_VERSION = 1
+
+# Seconds between checks on background regenerations
+REGENERATE_INTERVAL = 0.5
+
+# Worker processes checking and rebuilding stale proxies
+REGENERATE_WORKERS = 1
+
+# Seconds to wait for another instance updating the same manifest
+MANIFEST_LOCK_TIMEOUT = 2.0
+
+# Regenerations waiting for a worker as (original path, resolution, stale proxy path)
+_regenerate_queue = []
+
+_pool = None
+
+# Future -> (original path, resolution, stale proxy path)
+_pending = {}
+
+def _get_preferences():
+    from .utils import get_addon_name
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def get_manifest_path(proxy_path):
+    return os.path.join(os.path.dirname(proxy_path), MANIFEST_NAME)
+
+def load_manifest(proxy_path):
+    """Load the manifest of the folder holding a proxy (empty manifest if missing)"""
+    manifest_path = get_manifest_path(proxy_path)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict):
+                return manifest
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading proxy manifest {manifest_path}: {str(e)}")
+    return {'proxies': {}}
+
+def save_manifest(proxy_path, manifest):
+    """Replace the manifest through a temporary file, so a crash never leaves it truncated"""
+    from . import proxy_lock
+    manifest['version'] = MANIFEST_VERSION
+    manifest_path = get_manifest_path(proxy_path)
+    try:
+        with proxy_lock.atomic_write(manifest_path) as temp_path:
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+    except (IOError, OSError) as e:
+        print(f"Error saving proxy manifest {manifest_path}: {str(e)}")
+
+def update_manifest(proxy_path, update):
+    """Apply update(manifest) to the manifest of a proxy's folder and save it.
+
+    The manifest is read and written under its own lock, so instances sharing
+    a library keep each other's entries.
+    """
+    from . import proxy_lock
+    manifest_path = get_manifest_path(proxy_path)
+    with proxy_lock.locked(manifest_path, timeout=MANIFEST_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            print(f"Proxy manifest is locked by another instance, not recorded: {manifest_path}")
+            return
+        manifest = load_manifest(proxy_path)
+        update(manifest)
+        save_manifest(proxy_path, manifest)
+
+def find_original(proxy_path):
+    """Original a proxy was generated from, from its manifest entry, or None.
+
+    Works for hash-named central store proxies, whose names say nothing about
+    the original. Identical originals share a store proxy, any of them will do.
+    """
+    if not proxy_path:
+        return None
+    proxy_path = bpy.path.abspath(proxy_path)
+    entry = load_manifest(proxy_path).get('proxies', {}).get(os.path.basename(proxy_path))
+    source = entry.get('source') if entry else None
+    if source and os.path.exists(source):
+        return source
+    return None
+
+def _use_hash():
+    preferences = _get_preferences()
+    return preferences is not None and preferences.proxy_verify_hash
+
+def record_proxy(original_path, proxy_path, resolution, **details):
+    """Store the size, mtime and optionally hash of the source a proxy was made from.
+
+    Extra details (tiled EXR layout) are stored with the entry. An original used
+    as its own proxy (no larger than the target) is never recorded.
+    """
+    if not proxy_path or os.path.normpath(proxy_path) == os.path.normpath(original_path):
+        return proxy_path
+    try:
+        stat = os.stat(original_path)
+    except OSError:
+        return proxy_path
+
+    entry = {
+        'source': os.path.normpath(os.path.abspath(original_path)),
+        'resolution': resolution,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+    }
+    entry.update(details)
+    if _use_hash():
+        from . import proxy_store
+        entry['hash'] = proxy_store.content_hash(original_path)
+
+    def add_entry(manifest):
+        manifest.setdefault('proxies', {})[os.path.basename(proxy_path)] = entry
+
+    update_manifest(proxy_path, add_entry)
+    return proxy_path
+
+def is_stale(original_path, proxy_path, compute_hash=True):
+    """True if the original changed since the proxy was generated.
+
+    A size/mtime mismatch is confirmed against the recorded hash when there is one,
+    so copied or touched files keep their proxies. Without compute_hash only a
+    cached hash is compared and the proxy counts as stale otherwise - the
+    regeneration queue checks again with hashing before rebuilding anything.
+    Proxies from before the manifest are stale when the original is newer than the proxy.
+    """
+    try:
+        stat = os.stat(original_path)
+    except OSError:
+        return False
+
+    entry = load_manifest(proxy_path).get('proxies', {}).get(os.path.basename(proxy_path))
+    if entry is None:
+        try:
+            return stat.st_mtime > os.path.getmtime(proxy_path)
+        except OSError:
+            return False
+
+    if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+        return False
+
+    if entry.get('hash'):
+        from . import proxy_store
+        if compute_hash:
+            content = proxy_store.content_hash(original_path)
+        else:
+            content = proxy_store.cached_hash(original_path)
+        if content == entry['hash']:
+            # Same content, refresh the recorded size and mtime
+            record_proxy(original_path, proxy_path, entry.get('resolution'))
+            return False
+    return True
+
+def queue_regeneration(original_path, resolution, proxy_path):
+    """Check a possibly stale proxy in a worker process and regenerate it in place"""
+    item = (original_path, resolution, proxy_path)
+    if item in _regenerate_queue or item in _pending.values():
+        return
+    print(f"Proxy is out of date, regenerating: {proxy_path}")
+    _regenerate_queue.append(item)
+    if not bpy.app.timers.is_registered(process_regeneration_queue):
+        bpy.app.timers.register(process_regeneration_queue, first_interval=REGENERATE_INTERVAL)
+
+def get_queue_length():
+    return len(_regenerate_queue) + len(_pending)
+
+def _reload_images(proxy_path):
+    """Reload images showing a proxy so the new lighting appears"""
+    norm_path = os.path.normpath(proxy_path)
+    for image in bpy.data.images:
+        if image.filepath and os.path.normpath(bpy.path.abspath(image.filepath)) == norm_path:
+            try:
+                image.reload()
+            except Exception as e:
+                print(f"Error reloading proxy image {image.name}: {str(e)}")
+
+def _collect_regeneration(job, stale, hashed, results):
+    """Register the outcome of a worker's check or rebuild"""
+    from . import proxy_cache, proxy_store
+    from .utils import write_streamed_proxies
+
+    original_path, resolution, proxy_path = job
+    if hashed:
+        proxy_store.store_hash(original_path, *hashed)
+
+    if results is not None:
+        write_streamed_proxies(results)
+        if results[resolution][0] == proxy_path:
+            record_proxy(original_path, proxy_path, resolution)
+            proxy_cache.touch(proxy_path)
+            _reload_images(proxy_path)
+    elif stale:
+        print(f"Proxy is out of date and can only be rebuilt in Blender, run Generate Proxies: {proxy_path}")
+    elif hashed:
+        # Same content, refresh the recorded size and mtime
+        record_proxy(original_path, proxy_path, resolution)
+
+def process_regeneration_queue():
+    """Timer callback handing queued proxies to a worker process and collecting results.
+
+    The stale check (hashing included) and the rebuild both run in the worker,
+    only the bookkeeping happens here on the main thread.
+    """
+    from .utils import PROXY_RESOLUTIONS
+    from . import proxy_lock, proxy_worker
+    global _pool
+
+    for future in [f for f in _pending if f.done()]:
+        job = _pending.pop(future)
+        try:
+            _, stale, hashed, results = future.result()
+            _collect_regeneration(job, stale, hashed, results)
+        except Exception as e:
+            print(f"Error regenerating proxy {job[2]}: {str(e)}")
+        finally:
+            proxy_lock.release(job[2])
+
+    while _regenerate_queue and len(_pending) < REGENERATE_WORKERS:
+        job = _regenerate_queue.pop(0)
+        original_path, resolution, proxy_path = job
+        target_width = PROXY_RESOLUTIONS.get(resolution)
+        if not target_width or not os.path.exists(original_path) or not os.path.exists(proxy_path):
+            continue
+
+        # Never block the UI on another instance, retry on a later tick instead
+        if not proxy_lock.acquire(proxy_path, timeout=0):
+            _regenerate_queue.append(job)
+            break
+
+        entry = load_manifest(proxy_path).get('proxies', {}).get(os.path.basename(proxy_path))
+        try:
+            if _pool is None:
+                _pool = proxy_worker.create_pool(REGENERATE_WORKERS)
+            _pending[_pool.submit(proxy_worker.regenerate_proxy, original_path, resolution,
+                                  target_width, proxy_path, entry, _use_hash())] = job
+        except Exception as e:
+            print(f"Error starting proxy regeneration worker: {str(e)}")
+            proxy_lock.release(proxy_path)
+
+    return REGENERATE_INTERVAL if (_regenerate_queue or _pending) else None
+
+def shutdown():
+    """Stop the regeneration worker, called when the add-on is unregistered"""
+    from . import proxy_lock
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    for job in _pending.values():
+        proxy_lock.release(job[2])
+    _pending.clear()
+    _regenerate_queue.clear()
+    if bpy.app.timers.is_registered(process_regeneration_queue):
+        bpy.app.timers.unregister(process_regeneration_queue)
+
+def find_stale_proxies(base_dir):
+    """Every (original, resolution, proxy path) under a library whose proxy may be out of date.
+
+    Originals are never hashed here, a changed size or mtime is enough - the
+    regeneration worker confirms against the recorded hash. Only folders with a proxies folder are checked - central store proxies are
+    named by content hash, so a changed original never maps to an old proxy.
+    """
+    from .utils import PROXY_RESOLUTIONS, find_proxy
+    from . import proxy_store
+
+    stale = []
+    if proxy_store.use_central_store():
+        return stale
+
+    for root, dirs, files in os.walk(base_dir):
+        if 'proxies' not in dirs:
+            continue
+        dirs.remove('proxies')
+        for filename in files:
+            if not filename.lower().endswith(('.hdr', '.exr')):
+                continue
+            original_path = os.path.join(root, filename)
+            for resolution in PROXY_RESOLUTIONS:
+                proxy_path = find_proxy(original_path, resolution, check_stale=False)
+                if proxy_path and is_stale(original_path, proxy_path, compute_hash=False):
+                    stale.append((original_path, resolution, proxy_path))
+    return stale
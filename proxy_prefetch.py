@@ -0,0 +1,190 @@
+"""
+Quick HDRI Controls - Background proxy prefetch for neighbouring HDRIs
+"""
+import os
+import bpy
+
+# Seconds between checks on running prefetch jobs
+POLL_INTERVAL = 0.2
+
+# Worker processes kept for prefetching
+PREFETCH_WORKERS = 2
+
+_pool = None
+
+# Future -> (original path, resolution, proxy path)
+_pending = {}
+
+# Images loaded ahead of time by the prefetcher, name -> original path
+_preloaded = {}
+
+def _get_preferences(context):
+    from .utils import get_addon_name
+    try:
+        return context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def get_neighbours(context, filepath, count):
+    """The next and previous count HDRIs of the current listing, nearest first"""
+    from .hdri_management import generate_previews
+
+    paths = [item[0] for item in generate_previews(context.scene.hdri_settings, context)
+             if item[0] not in ('NONE', '0', '') and os.path.isfile(item[0])]
+    if filepath not in paths or len(paths) < 2:
+        return []
+
+    index = paths.index(filepath)
+    neighbours = []
+    for step in range(1, count + 1):
+        for direction in (1, -1):
+            path = paths[(index + direction * step) % len(paths)]
+            if path != filepath and path not in neighbours:
+                neighbours.append(path)
+    return neighbours
+
+def _is_busy(original_path, resolution):
+    return any(job[:2] == (original_path, resolution) for job in _pending.values())
+
+def schedule_prefetch(context, filepath):
+    """Queue proxies of the HDRIs around the selected one for background generation"""
+    settings = context.scene.hdri_settings
+    preferences = _get_preferences(context)
+    if (preferences is None or preferences.proxy_prefetch_count <= 0 or
+            settings.proxy_resolution == 'ORIGINAL'):
+        return
+
+    from . import utils, proxy_auto
+
+    resolution = proxy_auto.resolve(settings.proxy_resolution)
+    if resolution not in utils.PROXY_RESOLUTIONS:
+        return
+
+    try:
+        neighbours = get_neighbours(context, filepath, preferences.proxy_prefetch_count)
+    except Exception as e:
+        print(f"Error finding HDRIs to prefetch: {str(e)}")
+        return
+
+    for original_path in neighbours:
+        prefetch(original_path, resolution, preferences.proxy_prefetch_preload)
+
+    # Drop preloaded images that are no longer next to the selection
+    release_preloaded(neighbours + [filepath])
+
+def prefetch(original_path, resolution, preload_existing=False):
+    """Queue one proxy for background generation unless it exists or is being made.
+
+    Originals whose central store hash isn't cached yet are hashed in the
+    background first and queued once that finishes, never on the main thread.
+    Formats the workers can't decode are skipped, their proxies are made when
+    they are selected.
+    """
+    from . import utils, proxy_worker, proxy_lock, proxy_store
+    global _pool
+
+    if _is_busy(original_path, resolution):
+        return
+
+    existing = utils.find_proxy(original_path, resolution)
+    if existing:
+        if preload_existing:
+            preload(existing, original_path)
+        return
+
+    if not proxy_worker.can_generate(original_path):
+        return
+
+    proxy_path = utils.get_proxy_path(original_path, resolution, compute_hash=False)
+    if proxy_path is None:
+        proxy_store.request_hash(original_path, lambda: prefetch(original_path, resolution, preload_existing))
+        return
+
+    # Skip proxies another instance is already writing
+    if not proxy_lock.acquire(proxy_path, timeout=0):
+        return
+    job = (original_path, resolution, proxy_path)
+
+    try:
+        if _pool is None:
+            _pool = proxy_worker.create_pool(PREFETCH_WORKERS)
+        target = [(resolution, utils.PROXY_RESOLUTIONS[resolution], proxy_path)]
+        _pending[_pool.submit(proxy_worker.generate_proxies, original_path, target)] = job
+    except Exception as e:
+        print(f"Error starting proxy prefetch workers: {str(e)}")
+        proxy_lock.release(proxy_path)
+        return
+
+    if not bpy.app.timers.is_registered(process_prefetch):
+        bpy.app.timers.register(process_prefetch, first_interval=POLL_INTERVAL)
+
+def _finish(job, results):
+    """Register a finished prefetch like any other proxy"""
+    from . import utils, proxy_cache, proxy_manifest
+
+    original_path, resolution, proxy_path = job
+    utils.write_streamed_proxies(results)
+    if results[resolution][0] == original_path:
+        # Original is already small enough, nothing to prefetch
+        return
+
+    if not os.path.exists(proxy_path):
+        return
+
+    proxy_manifest.record_proxy(original_path, proxy_path, resolution)
+    proxy_cache.touch(proxy_path)
+
+    preferences = _get_preferences(bpy.context)
+    if preferences and preferences.proxy_prefetch_preload:
+        preload(proxy_path, original_path)
+
+def process_prefetch():
+    """Timer callback collecting finished worker jobs, nothing is decoded here"""
+    from . import proxy_lock
+
+    for future in [f for f in _pending if f.done()]:
+        job = _pending.pop(future)
+        try:
+            _, results = future.result()
+            _finish(job, results)
+        except Exception as e:
+            print(f"Error prefetching proxy for {job[0]}: {str(e)}")
+        finally:
+            proxy_lock.release(job[2])
+
+    return POLL_INTERVAL if _pending else None
+
+def preload(proxy_path, original_path):
+    """Load and decode a proxy now so selecting it later is instant"""
+    try:
+        image = bpy.data.images.load(proxy_path, check_existing=True)
+        if image.name not in _preloaded:
+            # Touching the pixels forces the decode
+            len(image.pixels)
+            _preloaded[image.name] = original_path
+    except Exception as e:
+        print(f"Error preloading proxy {proxy_path}: {str(e)}")
+
+def release_preloaded(keep_paths):
+    """Free preloaded images no longer near the selection and unused by the scene"""
+    for name, original_path in list(_preloaded.items()):
+        image = bpy.data.images.get(name)
+        if image is None or image.users > 0:
+            # Gone, or in use now and no longer ours to free
+            del _preloaded[name]
+        elif original_path not in keep_paths:
+            bpy.data.images.remove(image)
+            del _preloaded[name]
+
+def shutdown():
+    """Stop the prefetch workers, called when the add-on is unregistered"""
+    from . import proxy_lock
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    for job in _pending.values():
+        proxy_lock.release(job[2])
+    _pending.clear()
+    if bpy.app.timers.is_registered(process_prefetch):
+        bpy.app.timers.unregister(process_prefetch)
@@ -0,0 +1,164 @@
+"""
+Quick HDRI Controls - Central content-addressed proxy store
+"""
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import bpy
+from . import proxy_worker
+
+# Seconds between checks on background hashes
+HASH_POLL = 0.2
+
+# Normalized HDRI path -> {'size', 'mtime', 'hash'}, so each file is hashed once
+_hash_index = {}
+_hash_index_loaded = False
+
+# Background hashing for interactive lookups - hashlib and file reads release the GIL
+_hash_pool = None
+
+# Normalized HDRI path -> (future, callbacks run on the main thread once it is hashed)
+_hash_jobs = {}
+
+def _get_preferences():
+    from .utils import get_addon_name
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences
+    except (KeyError, AttributeError):
+        return None
+
+def use_central_store():
+    preferences = _get_preferences()
+    return preferences is not None and preferences.proxy_storage == 'CENTRAL'
+
+def get_store_directory():
+    """Root of the central store, the add-on's data folder unless set in preferences"""
+    preferences = _get_preferences()
+    store_dir = preferences.central_proxy_directory if preferences else ""
+    if store_dir:
+        store_dir = bpy.path.abspath(store_dir)
+    else:
+        store_dir = bpy.utils.user_resource('DATAFILES', path="quick_hdri_proxies")
+    return os.path.normpath(store_dir)
+
+def get_hash_index_path():
+    return os.path.join(get_store_directory(), "hash_index.json")
+
+def _load_hash_index():
+    global _hash_index_loaded
+    if _hash_index_loaded:
+        return
+    _hash_index_loaded = True
+    try:
+        with open(get_hash_index_path(), 'r') as f:
+            _hash_index.update(json.load(f))
+    except (IOError, OSError, json.JSONDecodeError):
+        pass
+
+def _save_hash_index():
+    try:
+        os.makedirs(get_store_directory(), exist_ok=True)
+        with open(get_hash_index_path(), 'w') as f:
+            json.dump(_hash_index, f)
+    except (IOError, OSError) as e:
+        print(f"Error saving proxy hash index: {str(e)}")
+
+def store_hash(filepath, size, mtime, content):
+    """Record a digest computed elsewhere (worker process, background thread)"""
+    _load_hash_index()
+    _hash_index[os.path.normpath(os.path.abspath(filepath))] = {'size': size, 'mtime': mtime, 'hash': content}
+    _save_hash_index()
+
+def cached_hash(filepath):
+    """Recorded digest of a file if its size and mtime are unchanged, else None. Never reads the file."""
+    _load_hash_index()
+    path = os.path.normpath(os.path.abspath(filepath))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    cached = _hash_index.get(path)
+    if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime:
+        return cached['hash']
+    return None
+
+def content_hash(filepath):
+    """BLAKE2b digest of a file's contents, reused while its size and mtime are unchanged.
+
+    Reads the whole file when it isn't cached - interactive lookups use
+    cached_hash and request_hash instead.
+    """
+    content = cached_hash(filepath)
+    if content:
+        return content
+
+    path = os.path.normpath(os.path.abspath(filepath))
+    size, mtime, content = proxy_worker.hash_file(path)
+    store_hash(path, size, mtime, content)
+    return content
+
+def request_hash(filepath, callback=None):
+    """Hash a file in the background, callback runs on the main thread once it is cached"""
+    global _hash_pool
+    path = os.path.normpath(os.path.abspath(filepath))
+    if path in _hash_jobs:
+        if callback:
+            _hash_jobs[path][1].append(callback)
+        return
+
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=1)
+    _hash_jobs[path] = (_hash_pool.submit(proxy_worker.hash_file, path), [callback] if callback else [])
+    if not bpy.app.timers.is_registered(process_hashes):
+        bpy.app.timers.register(process_hashes, first_interval=HASH_POLL)
+
+def process_hashes():
+    """Timer callback storing finished background hashes"""
+    for path, (future, callbacks) in list(_hash_jobs.items()):
+        if not future.done():
+            continue
+        del _hash_jobs[path]
+        try:
+            store_hash(path, *future.result())
+        except Exception as e:
+            print(f"Error hashing {path}: {str(e)}")
+            continue
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error after hashing {path}: {str(e)}")
+
+    return HASH_POLL if _hash_jobs else None
+
+def shutdown():
+    """Stop background hashing, called when the add-on is unregistered"""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+    _hash_jobs.clear()
+    if bpy.app.timers.is_registered(process_hashes):
+        bpy.app.timers.unregister(process_hashes)
+
+def get_store_path(original_path, target_resolution, extension, compute_hash=True, create=True):
+    """Store path of a proxy - identical files share a proxy wherever they live.
+
+    Without compute_hash only an already cached digest is used. When there is
+    none the file is hashed in the background and None returned. Without
+    create the store folder isn't made.
+    """
+    if compute_hash:
+        content = content_hash(original_path)
+    else:
+        content = cached_hash(original_path)
+        if content is None:
+            request_hash(original_path)
+            return None
+
+    proxy_dir = os.path.join(get_store_directory(), content[:2])
+    if create:
+        os.makedirs(proxy_dir, exist_ok=True)
+    return os.path.join(proxy_dir, f"{content}_{target_resolution}{extension}")
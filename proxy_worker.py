@@ -0,0 +1,200 @@
+"""
+Quick HDRI Controls - Proxy generation in worker processes
+
+Nothing here imports bpy, workers run in plain Python processes.
+"""
+import os
+import sys
+import hashlib
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from . import hdr_io, imaging, proxy_lock, exr_io
+except ImportError:
+    import hdr_io
+    import imaging
+    import proxy_lock
+    import exr_io
+
+# Originals the workers can decode, everything else is generated in Blender
+WORKER_EXTENSIONS = ('.hdr',)
+
+# Bytes read per step while hashing
+HASH_CHUNK = 4 * 1024 * 1024
+
+# Run in each worker before any task - registers the add-on package as a bare
+# namespace so task functions unpickle without executing its bpy-bound __init__
+_BOOTSTRAP = (
+    "import sys, types\n"
+    "if {name!r} not in sys.modules:\n"
+    "    package = types.ModuleType({name!r})\n"
+    "    package.__path__ = [{path!r}]\n"
+    "    sys.modules[{name!r}] = package\n"
+)
+
+def can_generate(original_path):
+    return original_path.lower().endswith(WORKER_EXTENSIONS)
+
+def default_worker_count():
+    """Leave one core for Blender's UI"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def create_pool(max_workers=0):
+    """Process pool using the spawn start method, which is safe inside Blender"""
+    context = multiprocessing.get_context('spawn')
+    package = __name__.rpartition('.')[0]
+    initializer = initargs = None
+    if package:
+        source = _BOOTSTRAP.format(name=package, path=os.path.dirname(os.path.realpath(__file__)))
+        initializer, initargs = exec, (source, {})
+
+    # Inside Blender sys.executable is its bundled Python
+    context.set_executable(sys.executable)
+    return ProcessPoolExecutor(max_workers=max_workers or default_worker_count(),
+                               mp_context=context,
+                               initializer=initializer,
+                               initargs=initargs or ())
+
+def hash_file(path):
+    """(size, mtime, BLAKE2b digest) of a file, the central store's content hash"""
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return stat.st_size, stat.st_mtime, digest.hexdigest()
+
+def generate_proxies(original_path, targets):
+    """Downsample one original to every target in a single streaming pass.
+
+    targets are (resolution, width, proxy path). The source is decoded band by
+    band and each level is fed from the rows finished by the next larger one,
+    so memory stays around the size of the outputs. .hdr proxies are written
+    as their rows complete, other formats are returned as half float
+    (height, width, 3) arrays (top row first) for Blender to save. Files are
+    written under temporary names and renamed into place at the end. Targets not
+    smaller than the original map to the original path.
+    Returns (original path, {resolution: (proxy path, pixels or None)}).
+    """
+    bands = hdr_io.iter_hdr_bands(original_path)
+    source_height, source_width, bottom_up = next(bands)
+
+    results = {}
+    levels = []
+    width, height = source_width, source_height
+    for resolution, target_width, proxy_path in sorted(targets, key=lambda t: t[1], reverse=True):
+        if target_width >= source_width:
+            results[resolution] = (original_path, None)
+            continue
+
+        target_height = int(target_width * source_height / source_width)
+        level = {
+            'resolution': resolution,
+            'path': proxy_path,
+            'resampler': imaging.StreamingAreaResampler(width, height, target_width, target_height),
+            'writer': None,
+            'temp': None,
+            'rows': [],
+        }
+        if proxy_path.lower().endswith('.hdr'):
+            level['temp'] = proxy_lock.temp_path(proxy_path)
+            level['writer'] = hdr_io.HDRWriter(level['temp'], target_width, target_height, bottom_up=bottom_up)
+        levels.append(level)
+        width, height = target_width, target_height
+
+    def emit(index, rows):
+        # Store finished rows of a level and cascade them into the next one
+        if not len(rows):
+            return
+        level = levels[index]
+        if level['writer']:
+            level['writer'].write_rows(rows)
+        else:
+            level['rows'].append(rows.astype('float16'))
+        if index + 1 < len(levels):
+            emit(index + 1, levels[index + 1]['resampler'].feed(rows))
+
+    try:
+        if levels:
+            for band in bands:
+                emit(0, levels[0]['resampler'].feed(band))
+            for index, level in enumerate(levels):
+                emit(index, level['resampler'].finish())
+    except BaseException:
+        for level in levels:
+            if level['writer']:
+                level['writer'].close()
+                os.remove(level['temp'])
+        raise
+
+    for level in levels:
+        if level['writer']:
+            level['writer'].close()
+            os.replace(level['temp'], level['path'])
+
+    for level in levels:
+        if level['writer']:
+            results[level['resolution']] = (level['path'], None)
+        else:
+            pixels = np.concatenate(level['rows'])
+            results[level['resolution']] = (level['path'], pixels[::-1] if bottom_up else pixels)
+
+    return original_path, results
+
+def generate_tiled_proxy(original_path, tiled_path, tile_size=exr_io.TILE_SIZE, compression='ZIP'):
+    """Convert a Radiance original into a tiled mip-mapped EXR in one streaming pass.
+
+    Every mip level is written as the source bands are decoded. Bottom-up
+    files are decoded whole, the EXR needs rows top first.
+    Returns (original path, details of the written file).
+    """
+    bands = hdr_io.iter_hdr_bands(original_path)
+    height, width, bottom_up = next(bands)
+    if bottom_up:
+        bands.close()
+        pixels = hdr_io.read_hdr(original_path)
+        bands = (pixels[start:start + hdr_io.BAND_ROWS] for start in range(0, height, hdr_io.BAND_ROWS))
+
+    with proxy_lock.atomic_write(tiled_path) as temp_path:
+        with exr_io.TiledEXRWriter(temp_path, width, height, tile_size, compression) as writer:
+            for band in bands:
+                writer.write_rows(band)
+
+    return original_path, {
+        'width': width,
+        'height': height,
+        'levels': len(writer.levels),
+        'tile_size': tile_size,
+        'compression': compression,
+    }
+
+def regenerate_proxy(original_path, resolution, target_width, proxy_path, entry, use_hash=False):
+    """Check whether a proxy is out of date and rebuild it in place if it is.
+
+    entry is the proxy's manifest entry, None for proxies from before the
+    manifest. A size or mtime mismatch is confirmed against the recorded hash,
+    so copied or touched originals keep their proxies. Originals the workers
+    can't decode are only checked. The hash is returned (as from hash_file)
+    whenever it was read, and always for a rebuild with use_hash.
+    Returns (original path, stale, hash or None, results of generate_proxies or None).
+    """
+    stat = os.stat(original_path)
+    hashed = None
+    if entry is None:
+        stale = stat.st_mtime > os.path.getmtime(proxy_path)
+    elif entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+        stale = False
+    elif entry.get('hash'):
+        hashed = hash_file(original_path)
+        stale = hashed[2] != entry['hash']
+    else:
+        stale = True
+
+    results = None
+    if stale and can_generate(original_path):
+        if use_hash and hashed is None:
+            hashed = hash_file(original_path)
+        _, results = generate_proxies(original_path, [(resolution, target_width, proxy_path)])
+    return original_path, stale, hashed, results
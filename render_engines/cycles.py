@@ -6,7 +6,7 @@ import bpy
 import re
 from bpy.utils import previews
 from mathutils import Vector
-from ..utils import get_hdri_previews, create_hdri_proxy
+from ..utils import get_hdri_previews, create_hdri_proxy, get_render_source
 from ..core import original_paths
 
 # Import common HDRI management functions
@@ -179,7 +179,8 @@ def reload_original_for_render(dummy):
 
                 # Only reload original for 'VIEWPORT' mode
                 if original_path and settings.proxy_mode == 'VIEWPORT':
-                    node.image = bpy.data.images.load(original_path, check_existing=True)
+                    node.image = bpy.data.images.load(get_render_source(original_path), check_existing=True)
+                    original_paths[node.image.name] = original_path
                 break
 
 def reset_proxy_after_render(dummy):
@@ -13,7 +13,7 @@ from math import radians, degrees
 import time
 
 # Import from parent module
-from ..utils import get_hdri_previews, create_hdri_proxy, get_proxy_directory
+from ..utils import get_hdri_previews, create_hdri_proxy, get_proxy_directory, get_render_source
 from ..core import original_paths
 
 # Import common HDRI management functions
@@ -418,12 +418,12 @@ def update_hdri_proxy(self, context):
 
         # Handle proxy creation/selection based on resolution setting
         if settings.proxy_resolution != 'ORIGINAL':
-            # Check for existing proxy first
-            proxy_dir = os.path.join(os.path.dirname(original_path), 'proxies')
-            base_name = os.path.splitext(os.path.basename(original_path))[0]
-            potential_proxy = os.path.join(proxy_dir, f"{base_name}_{settings.proxy_resolution}.hdr")
+            # Check for existing proxy first, in whichever format it was written
+            from ..utils import find_proxy
+            from .. import proxy_cache
+            potential_proxy = proxy_cache.touch(find_proxy(original_path, settings.proxy_resolution))
 
-            if os.path.exists(potential_proxy):
+            if potential_proxy:
                 print(f"Found existing proxy: {potential_proxy}")
                 target_path = potential_proxy
             else:
@@ -806,9 +806,17 @@ def reset_hdri(context):
                     current_original_path = rgb_node.image.filepath
                     print(f"4. Fallback to image.filepath directly: {current_original_path}")
 
-            # 5. If it's a proxy path, try to get the original
+            # 5. Proxies record their original, the only way back from central store proxies
+            if current_original_path:
+                from .. import proxy_manifest
+                recorded_original = proxy_manifest.find_original(current_original_path)
+                if recorded_original:
+                    current_original_path = recorded_original
+                    print(f"5. Original recorded in proxy manifest: {current_original_path}")
+
+            # 6. If it's still a proxy path, try to reconstruct the original from its name
             if current_original_path and '/proxies/' in current_original_path:
-                print(f"5. Detected proxy path, attempting to reconstruct original")
+                print(f"6. Detected proxy path, attempting to reconstruct original")
                 # It's a proxy, try to reconstruct original path
                 proxy_dir = os.path.dirname(current_original_path)
                 parent_dir = os.path.dirname(proxy_dir)
@@ -821,7 +829,7 @@ def reset_hdri(context):
                 potential_original = os.path.join(parent_dir, base_name)
                 if os.path.exists(potential_original):
                     current_original_path = potential_original
-                    print(f"5. Reconstructed original path: {current_original_path}")
+                    print(f"6. Reconstructed original path: {current_original_path}")
 
             print(f"\nFINAL current_original_path (before switch): {current_original_path}")
         else:
@@ -973,6 +981,11 @@ def reload_original_for_render(dummy):
                 if hasattr(rgb_node, 'a_filename'):
                     current_proxy_path = rgb_node.a_filename
 
+                # Proxies record their original, the only way back from central store proxies
+                if not original_path:
+                    from .. import proxy_manifest
+                    original_path = proxy_manifest.find_original(current_proxy_path)
+
                 # Store for later restoration
                 if not hasattr(context.scene, "octane_proxy_restore_path"):
                     bpy.types.Scene.octane_proxy_restore_path = bpy.props.StringProperty()
@@ -987,11 +1000,14 @@ def reload_original_for_render(dummy):
                     if current_image.users == 0:
                         bpy.data.images.remove(current_image)
 
-                    # Load original image
-                    img = bpy.data.images.load(original_path, check_existing=True)
+                    # Load original image, or its tiled EXR when enabled
+                    render_path = get_render_source(original_path)
+                    img = bpy.data.images.load(render_path, check_existing=True)
                     rgb_node.image = img
                     if hasattr(rgb_node, 'a_filename'):
-                        rgb_node.a_filename = original_path
+                        rgb_node.a_filename = render_path
+                    original_paths[img.name] = original_path
+                    original_paths[os.path.basename(render_path)] = original_path
 
                     # Force updates
                     rgb_node.update()
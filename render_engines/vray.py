@@ -16,7 +16,7 @@ import time
 from .. import hdri_management
 
 # Import from parent module
-from ..utils import get_hdri_previews, create_hdri_proxy
+from ..utils import get_hdri_previews, create_hdri_proxy, get_render_source
 from ..core import original_paths
 
 # Re-export common functions with local references
@@ -680,6 +680,11 @@ def update_hdri_proxy(self, context):
     elif current_file in original_paths:
         original_path = original_paths[current_file]
     else:
+        # Proxies record their original, the only way back from central store proxies
+        from .. import proxy_manifest
+        original_path = proxy_manifest.find_original(current_file)
+
+    if not original_path:
         # Try to determine if current file is a proxy
         current_dir = os.path.dirname(current_file)
         current_basename = os.path.basename(current_file)
@@ -1229,6 +1234,11 @@ def reload_original_for_render(dummy):
                     # Find original high-res file
                     original_path = original_paths.get(os.path.basename(current_file), None) if current_file else None
 
+                    # Proxies record their original, the only way back from central store proxies
+                    if not original_path and current_file:
+                        from .. import proxy_manifest
+                        original_path = proxy_manifest.find_original(current_file)
+
                     # If original path not found in tracking, try to determine by filename pattern
                     if not original_path and current_file:
                         # Check if we're in a proxies folder
@@ -1254,8 +1264,11 @@ def reload_original_for_render(dummy):
 
                     # If we found an original, use it
                     if original_path and os.path.exists(original_path):
-                        print(f"V-Ray: Swapping to full-quality HDRI for rendering: {original_path}")
-                        set_vray_bitmap_image(bitmap_node, original_path)
+                        # V-Ray pages tiled mip-mapped EXRs in by level and tile
+                        render_path = get_render_source(original_path)
+                        print(f"V-Ray: Swapping to full-quality HDRI for rendering: {render_path}")
+                        set_vray_bitmap_image(bitmap_node, render_path)
+                        original_paths[os.path.basename(render_path)] = original_path
 
                         # Force node update
                         if hasattr(node_tree, 'update_tag'):
@@ -0,0 +1,16 @@
+"""
+Quick HDRI Controls - pytest plugin collecting the add-on folder as a plain directory
+
+The add-on folder is a package whose __init__ imports bpy, which pytest would
+import before collecting anything below it. The tests only use the modules
+that run without bpy and import them directly (see pythonpath in pytest.ini).
+"""
+import os
+import pytest
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def pytest_collect_directory(path, parent):
+    if str(path) == ADDON_DIR:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,108 @@
+"""
+Quick HDRI Controls - Tiled EXR layout
+"""
+import struct
+import zlib
+import numpy as np
+import pytest
+
+import exr_io
+import imaging
+
+def _read_header(data):
+    """(attributes {name: (type, bytes)}, offset of the first byte after the header)"""
+    magic, version = struct.unpack_from('<ii', data, 0)
+    assert magic == exr_io.EXR_MAGIC
+    assert version == exr_io.EXR_VERSION | exr_io.TILED_FLAG
+
+    attributes = {}
+    position = 8
+    while data[position] != 0:
+        name_end = data.index(b'\0', position)
+        kind_end = data.index(b'\0', name_end + 1)
+        size, = struct.unpack_from('<i', data, kind_end + 1)
+        start = kind_end + 5
+        attributes[data[position:name_end].decode()] = (data[name_end + 1:kind_end].decode(), data[start:start + size])
+        position = start + size
+    return attributes, position + 1
+
+def _unzip(data):
+    predicted = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    interleaved = (np.cumsum(np.concatenate([[predicted[0]], predicted[1:].astype(np.int64) - 128])) % 256).astype(np.uint8)
+    half = (len(interleaved) + 1) // 2
+    raw = np.empty_like(interleaved)
+    raw[0::2] = interleaved[:half]
+    raw[1::2] = interleaved[half:]
+    return raw.tobytes()
+
+def _read_tiles(data, width, height, tile_size):
+    """{(tile x, tile y, level): (rows, columns, RGB) float} from the offset table"""
+    attributes, position = _read_header(data)
+    sizes = exr_io.mip_level_sizes(width, height)
+    counts = [-(-w // tile_size) * -(-h // tile_size) for w, h in sizes]
+    offsets = np.frombuffer(data, dtype='<u8', count=sum(counts), offset=position)
+
+    tiles = {}
+    index = 0
+    for level, (level_width, level_height) in enumerate(sizes):
+        tiles_x = -(-level_width // tile_size)
+        for number in range(counts[level]):
+            offset = int(offsets[index])
+            index += 1
+            tile_x, tile_y, level_x, level_y, size = struct.unpack_from('<iiiii', data, offset)
+            assert (tile_x, tile_y) == (number % tiles_x, number // tiles_x)
+            assert level_x == level_y == level
+
+            columns = min(tile_size, level_width - tile_x * tile_size)
+            rows = min(tile_size, level_height - tile_y * tile_size)
+            raw = data[offset + 20:offset + 20 + size]
+            if size < rows * columns * 3 * 2:
+                raw = _unzip(raw)
+            bgr = np.frombuffer(raw, dtype='<f2').reshape(rows, 3, columns)
+            tiles[tile_x, tile_y, level] = bgr.transpose(0, 2, 1)[..., ::-1].astype(np.float32)
+    return attributes, tiles
+
+def test_mip_level_sizes_round_down():
+    assert exr_io.mip_level_sizes(8, 4) == [(8, 4), (4, 2), (2, 1), (1, 1)]
+    assert exr_io.mip_level_sizes(10, 5) == [(10, 5), (5, 2), (2, 1), (1, 1)]
+
+@pytest.mark.parametrize("compression", ['NONE', 'ZIP'])
+def test_header_attributes(tmp_path, compression):
+    filepath = tmp_path / "map.exr"
+    exr_io.write_tiled_exr(str(filepath), np.ones((20, 40, 3), dtype=np.float32), tile_size=16, compression=compression)
+    attributes, _ = _read_header(filepath.read_bytes())
+
+    assert attributes['compression'][1] == bytes([exr_io.COMPRESSIONS[compression]])
+    assert struct.unpack('<iiii', attributes['dataWindow'][1]) == (0, 0, 39, 19)
+    assert attributes['tiles'] == ('tiledesc', struct.pack('<IIB', 16, 16, exr_io.MIPMAP_LEVELS))
+    assert attributes['channels'][1].startswith(b'B\0')
+
+@pytest.mark.parametrize("compression", ['NONE', 'ZIP'])
+@pytest.mark.parametrize("band_rows", [7, 64])
+def test_offsets_point_at_every_tile(tmp_path, compression, band_rows):
+    width, height, tile_size = 70, 37, 16
+    pixels = np.random.default_rng(1).random((height, width, 3), dtype=np.float32)
+    pixels[:, :20] = 0.5
+    filepath = tmp_path / "map.exr"
+    exr_io.write_tiled_exr(str(filepath), pixels, tile_size=tile_size, compression=compression, band_rows=band_rows)
+
+    _, tiles = _read_tiles(filepath.read_bytes(), width, height, tile_size)
+    expected = pixels
+    for level, (level_width, level_height) in enumerate(exr_io.mip_level_sizes(width, height)):
+        # Every level is an area downsample of the one above it
+        if level:
+            expected = imaging.area_resample(expected, level_width, level_height)
+        tiles_x = -(-level_width // tile_size)
+        tiles_y = -(-level_height // tile_size)
+        image = np.concatenate([
+            np.concatenate([tiles[x, y, level] for x in range(tiles_x)], axis=1)
+            for y in range(tiles_y)
+        ])
+        np.testing.assert_allclose(image, expected.astype(np.float16), rtol=1e-3, atol=1e-4)
+
+def test_brightest_values_stay_finite(tmp_path):
+    filepath = tmp_path / "sun.exr"
+    pixels = np.full((4, 4, 3), 1e6, dtype=np.float32)
+    exr_io.write_tiled_exr(str(filepath), pixels, tile_size=4, compression='NONE')
+    _, tiles = _read_tiles(filepath.read_bytes(), 4, 4, 4)
+    assert np.all(tiles[0, 0, 0] == exr_io.HALF_MAX)
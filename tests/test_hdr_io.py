@@ -0,0 +1,168 @@
+"""
+Quick HDRI Controls - Radiance HDR round trips
+"""
+import os
+import numpy as np
+import pytest
+
+import hdr_io
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def _known_pixels(height, width):
+    """Pixels of the checked-in fixtures, all exactly representable as RGBE.
+
+    opencv_rle.hdr (8x32, RLE scanlines) and opencv_flat.hdr (4x16, flat
+    scanlines) were written from these by OpenCV 5.0's independent Radiance
+    encoder: cv2.imwrite with IMWRITE_HDR_COMPRESSION set to RLE and NONE.
+    """
+    y, x = np.mgrid[0:height, 0:width]
+    red = x % 128
+    green = np.where(x < width // 2, 64, 127 - x)
+    blue = (x * (y + 1)) % 128
+    return (np.stack([red, green, blue], axis=-1) * 2.0 ** (y - 11)[..., None]).astype(np.float32)
+
+def _reference_decode(filepath):
+    """Scanline by scanline Radiance decoder written straight from the format description"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    position = data.index(b'\n\n') + 2
+    line_end = data.index(b'\n', position)
+    sign, height, _, width = data[position:line_end].split()
+    height, width = int(height), int(width)
+    position = line_end + 1
+
+    rgbe = np.zeros((height, width, 4), dtype=np.uint8)
+    for row in range(height):
+        if data[position] == 2 and data[position + 1] == 2 and data[position + 2] < 128:
+            position += 4
+            for channel in range(4):
+                x = 0
+                while x < width:
+                    count = data[position]
+                    if count > 128:
+                        rgbe[row, x:x + count - 128, channel] = data[position + 1]
+                        x += count - 128
+                        position += 2
+                    else:
+                        rgbe[row, x:x + count, channel] = list(data[position + 1:position + 1 + count])
+                        x += count
+                        position += count + 1
+        else:
+            for x in range(width):
+                rgbe[row, x] = list(data[position:position + 4])
+                position += 4
+
+    pixels = np.zeros((height, width, 3), dtype=np.float32)
+    for row in range(height):
+        for x in range(width):
+            r, g, b, e = rgbe[row, x]
+            if e:
+                pixels[row, x] = np.array([r, g, b]) * 2.0 ** (int(e) - 136)
+    return pixels[::-1] if sign == b'+Y' else pixels
+
+def _radiance(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = rng.random((height, width, 3), dtype=np.float32) * 8
+    # Flat areas so the encoder writes run packets as well as literals
+    pixels[:, :width // 3] = 1.5
+    pixels[height // 2, :] = 0.0
+    return pixels
+
+def test_rgbe_round_trip_within_mantissa_precision():
+    rgb = _radiance(16, 32)
+    decoded = hdr_io.rgbe_to_float(hdr_io.float_to_rgbe(rgb))
+    brightest = rgb.max(axis=-1, keepdims=True)
+    # 8 bit mantissas relative to the brightest channel
+    assert np.all(np.abs(decoded - rgb) <= brightest / 128 + 1e-6)
+
+def test_rgbe_encoding_is_stable():
+    rgbe = hdr_io.float_to_rgbe(_radiance(8, 8))
+    assert np.array_equal(hdr_io.float_to_rgbe(hdr_io.rgbe_to_float(rgbe)), rgbe)
+
+def test_rgbe_black_and_negative():
+    rgbe = hdr_io.float_to_rgbe(np.array([[0.0, 0.0, 0.0], [-1.0, -2.0, -3.0]]))
+    assert np.array_equal(rgbe, np.zeros((2, 4), dtype=np.uint8))
+    assert np.array_equal(hdr_io.rgbe_to_float(rgbe), np.zeros((2, 3)))
+
+@pytest.mark.parametrize("width", [8, 130, 300])
+def test_rle_scanlines_round_trip(width):
+    rgbe = hdr_io.float_to_rgbe(_radiance(5, width, seed=width))
+    encoded = hdr_io._encode_band(rgbe)
+    data = np.frombuffer(encoded, dtype=np.uint8)
+    decoded, offset = hdr_io._decode_band(encoded, data, 0, width, len(rgbe))
+    assert offset == len(encoded)
+    assert np.array_equal(decoded, rgbe)
+
+def test_rle_scanline_headers_and_packets():
+    rgbe = np.zeros((1, 10, 4), dtype=np.uint8)
+    rgbe[0, :, 0] = 7
+    rgbe[0, :, 1] = np.arange(10)
+    encoded = hdr_io._encode_band(rgbe)
+    assert encoded[:4] == bytes([2, 2, 0, 10])
+    # Red is a single run, green a single literal packet
+    assert encoded[4:6] == bytes([128 + 10, 7])
+    assert encoded[6:17] == bytes([10]) + bytes(range(10))
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_file_round_trip(tmp_path, compress):
+    pixels = _radiance(70, 96)
+    filepath = str(tmp_path / "map.hdr")
+    hdr_io.write_hdr(filepath, pixels, compress=compress)
+
+    assert hdr_io.read_header(filepath) == (70, 96, False)
+    expected = hdr_io.rgbe_to_float(hdr_io.float_to_rgbe(pixels))
+    assert np.array_equal(hdr_io.read_hdr(filepath), expected)
+
+def test_bottom_up_files_are_flipped(tmp_path):
+    pixels = _radiance(12, 16)
+    filepath = str(tmp_path / "flipped.hdr")
+    with hdr_io.HDRWriter(filepath, 16, 12, bottom_up=True) as writer:
+        writer.write_rows(pixels[::-1])
+    expected = hdr_io.rgbe_to_float(hdr_io.float_to_rgbe(pixels))
+    assert np.array_equal(hdr_io.read_hdr(filepath), expected)
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_truncated_file_raises_value_error(tmp_path, compress):
+    filepath = str(tmp_path / "truncated.hdr")
+    hdr_io.write_hdr(filepath, _radiance(40, 64), compress=compress)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    with open(filepath, 'wb') as f:
+        f.write(data[:len(data) // 2])
+
+    with pytest.raises(ValueError, match="Truncated"):
+        hdr_io.read_hdr(filepath)
+
+def test_not_a_radiance_file(tmp_path):
+    filepath = tmp_path / "other.hdr"
+    filepath.write_bytes(b"P6\n1 1\n255\n\0\0\0")
+    with pytest.raises(ValueError):
+        hdr_io.read_header(str(filepath))
+
+@pytest.mark.parametrize("filename, height, width", [
+    ("opencv_rle.hdr", 8, 32),
+    ("opencv_flat.hdr", 4, 16),
+])
+def test_reads_files_from_another_encoder(filename, height, width):
+    filepath = os.path.join(DATA, filename)
+    expected = _known_pixels(height, width)
+    assert hdr_io.read_header(filepath) == (height, width, False)
+    assert np.array_equal(hdr_io.read_hdr(filepath), expected)
+    # The reference decoder agrees on the same files
+    assert np.array_equal(_reference_decode(filepath), expected)
+
+@pytest.mark.parametrize("width, compress", [(32, True), (300, True), (16, False), (4, True)])
+def test_written_files_decode_with_the_reference_decoder(tmp_path, width, compress):
+    pixels = _radiance(9, width, seed=width)
+    filepath = str(tmp_path / "map.hdr")
+    hdr_io.write_hdr(filepath, pixels, compress=compress)
+    expected = hdr_io.rgbe_to_float(hdr_io.float_to_rgbe(pixels))
+    assert np.array_equal(_reference_decode(filepath), expected)
+
+def test_known_pixels_survive_a_write(tmp_path):
+    pixels = _known_pixels(8, 32)
+    filepath = str(tmp_path / "known.hdr")
+    hdr_io.write_hdr(filepath, pixels)
+    assert np.array_equal(_reference_decode(filepath), pixels)
@@ -0,0 +1,48 @@
+"""
+Quick HDRI Controls - Resampling without bpy
+"""
+import numpy as np
+import pytest
+
+import imaging
+
+def _image(height, width, channels=3, seed=0):
+    return np.random.default_rng(seed).random((height, width, channels), dtype=np.float32) * 10
+
+def _stream(pixels, new_width, new_height, band_rows):
+    height, width = pixels.shape[:2]
+    resampler = imaging.StreamingAreaResampler(width, height, new_width, new_height, pixels.shape[2])
+    rows = [resampler.feed(pixels[start:start + band_rows]) for start in range(0, height, band_rows)]
+    rows.append(resampler.finish())
+    return np.concatenate(rows)
+
+@pytest.mark.parametrize("size, new_size, band_rows", [
+    ((64, 128), (32, 64), 16),
+    ((100, 200), (37, 73), 7),
+    ((33, 65), (1, 1), 5),
+    ((50, 50), (50, 25), 64),
+])
+def test_streaming_matches_area_resample(size, new_size, band_rows):
+    pixels = _image(*size)
+    expected = imaging.area_resample(pixels, new_size[1], new_size[0])
+    streamed = _stream(pixels, new_size[1], new_size[0], band_rows)
+    assert streamed.shape == expected.shape
+    np.testing.assert_allclose(streamed, expected, rtol=1e-4, atol=1e-4)
+
+def test_area_resample_keeps_the_mean():
+    pixels = _image(64, 96)
+    reduced = imaging.area_resample(pixels, 17, 11)
+    np.testing.assert_allclose(reduced.mean(axis=(0, 1)), pixels.mean(axis=(0, 1)), rtol=1e-4)
+
+def test_area_resample_of_constant_image():
+    pixels = np.full((30, 40, 4), 2.5, dtype=np.float32)
+    np.testing.assert_allclose(imaging.area_resample(pixels, 7, 3), 2.5, rtol=1e-6)
+
+def test_bilinear_resample_reproduces_linear_gradients():
+    x = np.arange(8, dtype=np.float32)
+    pixels = np.repeat(np.broadcast_to(x, (4, 8))[..., None], 3, axis=2)
+    enlarged = imaging.bilinear_resample(pixels, 16, 8)
+    assert enlarged.shape == (8, 16, 3)
+    # Interior samples fall between source pixel centres
+    expected = np.clip((np.arange(16) + 0.5) / 2 - 0.5, 0, 7)
+    np.testing.assert_allclose(enlarged[3, :, 0], expected, atol=1e-6)
@@ -0,0 +1,453 @@
+"""
+Quick HDRI Controls - Thumbnail storage, manifest and atlas helpers
+"""
+import os
+import json
+import math
+import time
+import bpy
+import numpy as np
+from . import imaging
+
+# Per-folder manifest describing the thumbnails stored next to the HDRIs
+MANIFEST_NAME = "_thumb_manifest.json"
+MANIFEST_VERSION = 1
+
+# Grid-size thumbnail downsampled from the inspection-size render
+SMALL_THUMB_SUFFIX = "_thumb_small.png"
+SMALL_THUMB_WIDTH = 256
+
+# Approximate pixels per unit of template_icon_view scale
+ICON_SCALE_PIXELS = 20
+
+# Packed atlas image holding every thumbnail of a folder
+ATLAS_NAME = "_thumb_atlas.png"
+ATLAS_TILE_WIDTH = 256
+ATLAS_TILE_HEIGHT = 192
+
+# Seconds to wait before repacking an atlas whose thumbnails changed
+ATLAS_REBUILD_DELAY = 2.0
+
+# Folders whose atlas holds outdated tiles, repacked in the background
+_stale_atlases = set()
+
+# Environment maps that get a thumbnail by downscaling instead of rendering
+HDR_EXTENSIONS = ('.hdr', '.exr')
+LDR_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+def is_ldr(filepath):
+    return filepath.lower().endswith(LDR_EXTENSIONS)
+
+def is_thumbnail_file(filename):
+    """Whether a file is a generated thumbnail/atlas rather than an environment map"""
+    return "_thumb" in os.path.basename(filename).lower()
+
+def get_preview_extensions(preferences):
+    """Extensions that receive thumbnails, LDR maps follow the browser's use_png/use_jpg"""
+    extensions = HDR_EXTENSIONS
+    if preferences.use_png:
+        extensions += ('.png',)
+    if preferences.use_jpg:
+        extensions += ('.jpg', '.jpeg')
+    return extensions
+
+def get_thumb_key(hdri_path):
+    """Name a map's thumbnails and atlas entry are stored under.
+
+    HDRIs use their base name. LDR maps add their extension (name_jpg) so a
+    name.jpg next to name.hdr doesn't overwrite its thumbnail.
+    """
+    base_name, extension = os.path.splitext(os.path.basename(hdri_path))
+    if is_ldr(hdri_path):
+        return f"{base_name}_{extension[1:].lower()}"
+    return base_name
+
+def get_thumb_path(hdri_path):
+    """Get the thumbnail path stored alongside an HDRI"""
+    hdri_path = os.path.abspath(hdri_path)
+    directory = os.path.dirname(hdri_path)
+    return os.path.join(directory, f"{get_thumb_key(hdri_path)}_thumb.png")
+
+def get_small_thumb_path(hdri_path):
+    """Get the grid-size thumbnail path stored alongside an HDRI"""
+    hdri_path = os.path.abspath(hdri_path)
+    directory = os.path.dirname(hdri_path)
+    return os.path.join(directory, f"{get_thumb_key(hdri_path)}{SMALL_THUMB_SUFFIX}")
+
+def use_small_thumbnails(preview_scale, ui_scale=1.0):
+    """Whether icons drawn at this preview scale fit the grid-size thumbnail"""
+    return preview_scale * ICON_SCALE_PIXELS * ui_scale <= SMALL_THUMB_WIDTH
+
+def write_small_thumbnail(hdri_path, width=SMALL_THUMB_WIDTH):
+    """Downsample the inspection-size thumbnail of an HDRI into its grid-size thumbnail"""
+    thumb_path = get_thumb_path(hdri_path)
+    small_path = get_small_thumb_path(hdri_path)
+    image = None
+    try:
+        image = bpy.data.images.load(thumb_path, check_existing=False)
+        thumb_width, thumb_height = image.size
+        if thumb_width > width:
+            image.scale(width, max(1, round(thumb_height * width / thumb_width)))
+        image.filepath_raw = small_path
+        image.file_format = 'PNG'
+        image.save()
+        return small_path
+    except Exception as e:
+        print(f"Error writing small thumbnail {small_path}: {str(e)}")
+        return None
+    finally:
+        if image is not None:
+            bpy.data.images.remove(image)
+
+def write_downscaled_thumbnail(image_path, thumb_format='PNG', max_width=1024):
+    """Create the thumbnails of an LDR environment map by downscaling it, no render needed.
+
+    Returns the inspection-size thumbnail path or None on failure.
+    """
+    thumb_path = get_thumb_path(image_path)
+    image = None
+    try:
+        image = bpy.data.images.load(image_path, check_existing=False)
+        width, height = image.size
+        if width == 0 or height == 0:
+            return None
+        if width > max_width:
+            image.scale(max_width, max(1, round(height * max_width / width)))
+        image.filepath_raw = thumb_path
+        image.file_format = 'PNG'
+        image.save()
+    except Exception as e:
+        print(f"Error downscaling thumbnail for {image_path}: {str(e)}")
+        return None
+    finally:
+        if image is not None:
+            bpy.data.images.remove(image)
+
+    store_rendered_thumbnails(image_path, thumb_format)
+    return thumb_path
+
+def encode_thumbnail(thumb_path, thumb_format='PNG', max_width=0, force=True):
+    """Re-encode a thumbnail in place in the given storage format.
+
+    'PNG' keeps Blender's full colour PNG, 'PNG_PALETTE' quantizes to an 8-bit
+    palette PNG. Thumbnails wider than max_width (0 = no limit) are downsampled.
+    With force disabled a full colour PNG that needs no resize is left untouched.
+    Returns the stored (width, height) or None on failure.
+    """
+    image = None
+    try:
+        image = bpy.data.images.load(thumb_path, check_existing=False)
+        width, height = image.size
+        resized = False
+        if max_width and width > max_width:
+            height = max(1, round(height * max_width / width))
+            width = max_width
+            image.scale(width, height)
+            resized = True
+
+        if thumb_format == 'PNG_PALETTE':
+            # Blender rows are bottom-up, PNG scanlines top-down
+            pixels = _read_image_pixels(image)[::-1]
+            rgba = np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
+            imaging.write_png_palette(thumb_path, rgba)
+        elif force or resized:
+            image.filepath_raw = thumb_path
+            image.file_format = 'PNG'
+            image.save()
+
+        return width, height
+    except Exception as e:
+        print(f"Error encoding thumbnail {thumb_path}: {str(e)}")
+        return None
+    finally:
+        if image is not None:
+            bpy.data.images.remove(image)
+
+def record_thumbnail(manifest, thumb_path, thumb_format, size):
+    """Record the storage format of a thumbnail in its folder manifest"""
+    manifest['thumbnail_format'] = thumb_format
+    manifest.setdefault('thumbnails', {})[os.path.basename(thumb_path)] = {
+        'format': thumb_format,
+        'width': size[0],
+        'height': size[1],
+        'mtime': os.path.getmtime(thumb_path),
+    }
+
+def store_rendered_thumbnails(hdri_path, thumb_format='PNG', max_width=0):
+    """Derive the grid-size thumbnail from a fresh render and store both in the chosen format"""
+    thumb_path = get_thumb_path(hdri_path)
+    small_path = write_small_thumbnail(hdri_path)
+
+    folder = os.path.dirname(thumb_path)
+    manifest = load_manifest(folder)
+
+    size = encode_thumbnail(thumb_path, thumb_format, max_width, force=False)
+    if size:
+        record_thumbnail(manifest, thumb_path, thumb_format, size)
+
+    if small_path:
+        size = encode_thumbnail(small_path, thumb_format, force=False)
+        if size:
+            record_thumbnail(manifest, small_path, thumb_format, size)
+
+    save_manifest(folder, manifest)
+
+def get_manifest_path(folder):
+    return os.path.join(folder, MANIFEST_NAME)
+
+def load_manifest(folder):
+    """Load the thumbnail manifest for a folder (empty manifest if missing)"""
+    manifest_path = get_manifest_path(folder)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict):
+                return manifest
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading thumbnail manifest {manifest_path}: {str(e)}")
+    return {'version': MANIFEST_VERSION}
+
+def save_manifest(folder, manifest):
+    manifest['version'] = MANIFEST_VERSION
+    manifest_path = get_manifest_path(folder)
+    try:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return True
+    except IOError as e:
+        print(f"Error saving thumbnail manifest {manifest_path}: {str(e)}")
+        return False
+
+def find_folder_thumbnails(folder):
+    """Return {thumbnail key: thumbnail path} for every thumbnail in a folder.
+
+    Grid-size thumbnails are preferred over inspection-size ones when both exist.
+    """
+    thumbs = {}
+    try:
+        filenames = sorted(os.listdir(folder))
+        for filename in filenames:
+            if filename.lower().endswith("_thumb.png"):
+                thumbs[filename[:-len("_thumb.png")]] = os.path.join(folder, filename)
+        for filename in filenames:
+            if filename.lower().endswith(SMALL_THUMB_SUFFIX):
+                thumbs[filename[:-len(SMALL_THUMB_SUFFIX)]] = os.path.join(folder, filename)
+    except OSError as e:
+        print(f"Error reading thumbnails in {folder}: {str(e)}")
+    return thumbs
+
+def _read_image_pixels(image):
+    """Read a Blender image into a (height, width, 4) float32 array (bottom row first)"""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def build_folder_atlas(folder, tile_width=ATLAS_TILE_WIDTH, tile_height=ATLAS_TILE_HEIGHT):
+    """Pack every thumbnail of a folder into one atlas image plus an offset table.
+
+    The atlas is written next to the thumbnails and its offset table is stored
+    in the folder manifest. Returns the number of packed thumbnails.
+    """
+    thumbs = find_folder_thumbnails(folder)
+    manifest = load_manifest(folder)
+    atlas_path = os.path.join(folder, ATLAS_NAME)
+
+    if not thumbs:
+        # Nothing to pack - drop any stale atlas
+        if 'atlas' in manifest:
+            del manifest['atlas']
+            save_manifest(folder, manifest)
+        if os.path.exists(atlas_path):
+            try:
+                os.remove(atlas_path)
+            except OSError:
+                pass
+        return 0
+
+    columns = math.ceil(math.sqrt(len(thumbs)))
+    rows = math.ceil(len(thumbs) / columns)
+    atlas_pixels = np.zeros((rows * tile_height, columns * tile_width, 4), dtype=np.float32)
+    entries = {}
+
+    for index, (key, thumb_path) in enumerate(thumbs.items()):
+        image = None
+        try:
+            image = bpy.data.images.load(thumb_path, check_existing=False)
+            width, height = image.size
+            if width == 0 or height == 0:
+                continue
+
+            # Fit inside the tile while keeping the aspect ratio
+            scale = min(tile_width / width, tile_height / height)
+            fit_width = max(1, int(width * scale))
+            fit_height = max(1, int(height * scale))
+            if (fit_width, fit_height) != (width, height):
+                image.scale(fit_width, fit_height)
+
+            x = (index % columns) * tile_width
+            # Blender pixel rows run bottom-up, fill the top row of tiles first
+            y = (rows - 1 - index // columns) * tile_height
+            atlas_pixels[y:y + fit_height, x:x + fit_width] = _read_image_pixels(image)
+
+            entries[key] = {
+                'x': x,
+                'y': y,
+                'w': fit_width,
+                'h': fit_height,
+                'source': os.path.basename(thumb_path),
+                'mtime': os.path.getmtime(thumb_path),
+            }
+        except Exception as e:
+            print(f"Error packing thumbnail {thumb_path}: {str(e)}")
+        finally:
+            if image is not None:
+                bpy.data.images.remove(image)
+
+    atlas_image = bpy.data.images.new("_qhdri_thumb_atlas",
+                                      width=columns * tile_width,
+                                      height=rows * tile_height,
+                                      alpha=True)
+    try:
+        atlas_image.pixels.foreach_set(atlas_pixels.ravel())
+        atlas_image.filepath_raw = atlas_path
+        atlas_image.file_format = 'PNG'
+        atlas_image.save()
+    except Exception as e:
+        print(f"Error saving thumbnail atlas {atlas_path}: {str(e)}")
+        return 0
+    finally:
+        bpy.data.images.remove(atlas_image)
+
+    manifest['atlas'] = {
+        'file': ATLAS_NAME,
+        'tile_size': [tile_width, tile_height],
+        'created': time.time(),
+        'entries': entries,
+    }
+    save_manifest(folder, manifest)
+
+    print(f"Packed {len(entries)} thumbnails into atlas: {atlas_path}")
+    return len(entries)
+
+def _thumbnail_mtimes(folder):
+    """{file name: mtime} of the thumbnails in a folder from a single directory listing.
+
+    Directory entries carry their stat data on Windows and SMB shares, so a
+    NAS folder costs one round trip instead of one per thumbnail.
+    """
+    mtimes = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(("_thumb.png", SMALL_THUMB_SUFFIX)):
+                    try:
+                        mtimes[entry.name] = entry.stat().st_mtime
+                    except OSError:
+                        continue
+    except OSError:
+        pass
+    return mtimes
+
+def _atlas_entry_current(key, entry, mtimes):
+    """Whether the thumbnail an atlas tile was packed from is unchanged since"""
+    # Entries from before 'source' was recorded were packed from the preferred file
+    sources = [entry['source']] if 'source' in entry else [f"{key}{SMALL_THUMB_SUFFIX}", f"{key}_thumb.png"]
+    for source in sources:
+        if source in mtimes:
+            return entry.get('mtime') == mtimes[source]
+    return False
+
+def mark_atlas_stale(folder):
+    """Queue a folder's atlas to be repacked once the browser has loaded its icons"""
+    _stale_atlases.add(folder)
+    if not bpy.app.timers.is_registered(rebuild_stale_atlases):
+        bpy.app.timers.register(rebuild_stale_atlases, first_interval=ATLAS_REBUILD_DELAY)
+
+def rebuild_stale_atlases():
+    """Timer callback repacking one stale atlas per tick while no icons are loading"""
+    from .hdri_management import _icon_queue
+    if not _stale_atlases:
+        return None
+    if _icon_queue:
+        return ATLAS_REBUILD_DELAY
+
+    folder = _stale_atlases.pop()
+    try:
+        build_folder_atlas(folder)
+    except Exception as e:
+        print(f"Error rebuilding thumbnail atlas in {folder}: {str(e)}")
+    return ATLAS_REBUILD_DELAY if _stale_atlases else None
+
+def stop_atlas_rebuilds():
+    """Drop queued atlas rebuilds, called when the add-on is unregistered"""
+    _stale_atlases.clear()
+    if bpy.app.timers.is_registered(rebuild_stale_atlases):
+        bpy.app.timers.unregister(rebuild_stale_atlases)
+
+def load_atlas_icons(folder, pcoll, hdri_paths):
+    """Slice a folder atlas into preview icons with a single image read.
+
+    Only paths that are not already in the collection and have an up to date
+    atlas entry are created. Tiles older than their thumbnail are left to the
+    single-file loader and the atlas is queued for a rebuild.
+    Returns {preview key: atlas path} for the icons that were added.
+    """
+    manifest = load_manifest(folder)
+    atlas = manifest.get('atlas')
+    if not atlas:
+        return {}
+
+    atlas_path = os.path.join(folder, atlas.get('file', ATLAS_NAME))
+    if not os.path.exists(atlas_path):
+        return {}
+
+    entries = atlas.get('entries', {})
+    mtimes = _thumbnail_mtimes(folder)
+    wanted = []
+    outdated = False
+    for hdri_path in hdri_paths:
+        if hdri_path in pcoll:
+            continue
+        key = get_thumb_key(hdri_path)
+        if key not in entries:
+            continue
+        if _atlas_entry_current(key, entries[key], mtimes):
+            wanted.append((hdri_path, entries[key]))
+        else:
+            outdated = True
+
+    if outdated:
+        mark_atlas_stale(folder)
+
+    if not wanted:
+        return {}
+
+    image = None
+    try:
+        image = bpy.data.images.load(atlas_path, check_existing=False)
+        atlas_pixels = _read_image_pixels(image)
+    except Exception as e:
+        print(f"Error reading thumbnail atlas {atlas_path}: {str(e)}")
+        return {}
+    finally:
+        if image is not None:
+            bpy.data.images.remove(image)
+
+    loaded = {}
+    for hdri_path, entry in wanted:
+        try:
+            x, y, w, h = entry['x'], entry['y'], entry['w'], entry['h']
+            tile = np.ascontiguousarray(atlas_pixels[y:y + h, x:x + w]).ravel()
+
+            preview = pcoll.new(hdri_path)
+            preview.image_size = (w, h)
+            preview.image_pixels_float.foreach_set(tile)
+            preview.icon_size = (w, h)
+            preview.icon_pixels_float.foreach_set(tile)
+            loaded[hdri_path] = atlas_path
+        except Exception as e:
+            print(f"Error slicing atlas icon for {hdri_path}: {str(e)}")
+
+    return loaded
@@ -801,6 +801,9 @@ def draw_hdri_controls(self, context):
 
             res_col = split.column()
             res_col.prop(settings, "proxy_resolution", text="Resolution")
+            if settings.proxy_resolution == 'AUTO':
+                from . import proxy_auto
+                res_col.label(text=f"Using {proxy_auto.resolve('AUTO')}")
 
         main_column.separator(factor=0.5 * preferences.spacing_scale)
 
@@ -107,6 +107,24 @@ def get_addon_name():
     """Get addon name consistently"""
     return "Quick-HDRI-Controls-main"
 
+def get_state_path(filename):
+    """Path of an add-on state file in Blender's config folder.
+
+    The add-on folder is replaced on every update and may be read-only, so
+    journals and indexes live here. Files an older version left in the add-on
+    folder are moved over.
+    """
+    state_dir = bpy.utils.user_resource('CONFIG', path="quick_hdri_controls", create=True)
+    state_path = os.path.join(state_dir, filename)
+
+    legacy_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), filename)
+    if os.path.exists(legacy_path) and not os.path.exists(state_path):
+        try:
+            shutil.move(legacy_path, state_path)
+        except (IOError, OSError) as e:
+            print(f"Error moving {filename} to the config folder: {str(e)}")
+    return state_path
+
 def get_current_version():
     """Get current addon version from bl_info"""
     addon_name = get_addon_name()
@@ -270,70 +288,507 @@ def cleanup_previews():
         except:
             pass
 
-def get_proxy_directory(filepath):
-    """Get or create the proxy directory for the given HDRI file"""
+def get_proxy_directory(filepath, create=True):
+    """Get or create the proxy directory for the given HDRI file.
+
+    Without create nothing is written, an OSError is raised instead when the
+    folder doesn't exist and couldn't be created.
+    """
     hdri_dir = os.path.dirname(filepath)
     proxy_dir = os.path.join(hdri_dir, 'proxies')
-    os.makedirs(proxy_dir, exist_ok=True)
+    if create:
+        os.makedirs(proxy_dir, exist_ok=True)
+    elif not os.path.isdir(proxy_dir) and not os.access(hdri_dir, os.W_OK):
+        raise OSError(f"Cannot create proxy folder in {hdri_dir}")
     return proxy_dir
 
-def create_hdri_proxy(original_path, target_resolution):
-    """Create a proxy version of an HDRI at the specified resolution."""
-    resolution_map = {
-        '1K': 1024,
-        '2K': 2048,
-        '4K': 4096,
-        '6K': 6144,
-        '8K': 8192,
-        '16K': 16384
-    }
+PROXY_RESOLUTIONS = {
+    '1K': 1024,
+    '2K': 2048,
+    '4K': 4096,
+    '6K': 6144,
+    '8K': 8192,
+    '16K': 16384
+}
+
+# File extension per proxy_format preference
+PROXY_EXTENSIONS = {
+    'HDR': '.hdr',
+    'EXR': '.exr'
+}
+
+def get_proxy_format():
+    """Proxy file format selected in preferences ('HDR' or 'EXR')"""
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences.proxy_format
+    except (KeyError, AttributeError):
+        return 'HDR'
+
+def get_proxy_exr_codec():
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences.proxy_exr_codec
+    except (KeyError, AttributeError):
+        return 'ZIP'
+
+def get_proxy_engine():
+    """Downsampling engine selected in preferences ('BLENDER' or 'NUMPY')"""
+    try:
+        return bpy.context.preferences.addons[get_addon_name()].preferences.proxy_engine
+    except (KeyError, AttributeError):
+        return 'BLENDER'
+
+def downsample_proxy_blender(original_path, proxy_path, target_width):
+    """Create a proxy with Image.scale on a private copy of the original"""
+    # Load original image - never the datablock the world shows, scale() works in place
+    original_img = bpy.data.images.load(original_path, check_existing=False)
+    original_width = original_img.size[0]
+
+    # Don't create proxy if target resolution is higher than original
+    if target_width >= original_width:
+        bpy.data.images.remove(original_img)
+        return original_path
+
+    # Calculate new dimensions
+    aspect_ratio = original_img.size[1] / original_img.size[0]
+    target_height = int(target_width * aspect_ratio)
+
+    # Create resized image
+    original_img.scale(target_width, target_height)
+
+    # Save in the proxy format rather than the original's, readers never see a partial file
+    from . import proxy_lock
+    with proxy_lock.atomic_write(proxy_path) as temp_path:
+        save_proxy_image(original_img, temp_path)
+
+    # Clean up
+    bpy.data.images.remove(original_img)
+
+    return proxy_path
+
+def read_image_pixels(filepath):
+    """Decode an image file into a (height, width, 4) float32 array (rows bottom-up)"""
+    import numpy as np
+
+    # Radiance files skip the image datablock entirely
+    if filepath.lower().endswith('.hdr'):
+        from . import hdr_io
+        rgb = hdr_io.read_hdr(filepath)
+        pixels = np.ones(rgb.shape[:2] + (4,), dtype=np.float32)
+        pixels[..., :3] = rgb[::-1]
+        return pixels
+
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)
+
+def save_proxy_image(image, proxy_path):
+    """Save a float image as a proxy, in the format given by the proxy path extension.
+
+    .exr proxies are written as 16-bit half float RGB with the preferred codec
+    through a temporary scene, .hdr proxies as Radiance RGBE.
+    """
+    if proxy_path.lower().endswith('.exr'):
+        export_scene = bpy.data.scenes.new("_qhdri_proxy_export")
+        try:
+            settings = export_scene.render.image_settings
+            settings.file_format = 'OPEN_EXR'
+            settings.color_mode = 'RGB'
+            settings.color_depth = '16'
+            settings.exr_codec = get_proxy_exr_codec()
+            image.save_render(filepath=proxy_path, scene=export_scene)
+        finally:
+            bpy.data.scenes.remove(export_scene)
+    else:
+        image.filepath_raw = proxy_path
+        image.file_format = 'HDR'
+        image.save()
+
+def write_proxy_pixels(pixels, proxy_path):
+    """Write a (height, width, 4) float32 array as a proxy, atomically"""
+    import numpy as np
+    from . import proxy_lock
+
+    with proxy_lock.atomic_write(proxy_path) as temp_path:
+        if proxy_path.lower().endswith('.hdr'):
+            from . import hdr_io
+            hdr_io.write_hdr(temp_path, pixels[::-1, :, :3])
+            return
+
+        height, width = pixels.shape[:2]
+        image = bpy.data.images.new("_qhdri_proxy", width=width, height=height, alpha=True, float_buffer=True)
+        try:
+            image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+            save_proxy_image(image, temp_path)
+        finally:
+            bpy.data.images.remove(image)
+
+def downsample_proxy_numpy(original_path, proxy_path, target_width):
+    """Create a proxy with an energy-preserving NumPy area downsample"""
+    from . import imaging
+    pixels = read_image_pixels(original_path)
+    height, width = pixels.shape[:2]
+
+    # Don't create proxy if target resolution is higher than original
+    if target_width >= width:
+        return original_path
+
+    target_height = int(target_width * height / width)
+    write_proxy_pixels(imaging.area_resample(pixels, target_width, target_height), proxy_path)
+    return proxy_path
+
+def write_streamed_proxies(results):
+    """Save the proxies a streaming pass returned as arrays (formats hdr_io can't write)"""
+    import numpy as np
+    for proxy_path, pixels in results.values():
+        if pixels is not None:
+            rgba = np.ones(pixels.shape[:2] + (4,), dtype=np.float32)
+            rgba[..., :3] = pixels[::-1]
+            write_proxy_pixels(rgba, proxy_path)
+
+def downsample_proxy_streaming(original_path, proxy_path, target_width):
+    """Create a proxy reading the original in bands of scanlines.
+
+    Peak memory follows the proxy size instead of the original's, so 16K+
+    maps don't need a full decode. Only Radiance originals can be streamed,
+    others use the NumPy engine.
+    """
+    if not original_path.lower().endswith('.hdr'):
+        return downsample_proxy_numpy(original_path, proxy_path, target_width)
+
+    from . import proxy_worker
+    _, results = proxy_worker.generate_proxies(original_path, [(None, target_width, proxy_path)])
+    write_streamed_proxies(results)
+    return results[None][0]
+
+PROXY_ENGINES = {
+    'BLENDER': downsample_proxy_blender,
+    'NUMPY': downsample_proxy_numpy,
+    'STREAMING': downsample_proxy_streaming,
+}
 
-    target_width = resolution_map.get(target_resolution)
+def get_proxy_path(original_path, target_resolution, proxy_format=None, compute_hash=True, create=True):
+    """Path of the proxy for an HDRI at a resolution.
+
+    Proxies go in the proxies folder next to the HDRI, or in the central
+    content-addressed store when it is enabled or the HDRI folder is read-only.
+    Without compute_hash a store path is only returned when the HDRI's hash is
+    already cached, otherwise it is hashed in the background and None returned.
+    Without create no folders are made, for lookups of existing proxies.
+    """
+    from . import proxy_store
+
+    extension = PROXY_EXTENSIONS.get(proxy_format or get_proxy_format(), '.hdr')
+
+    if not proxy_store.use_central_store():
+        try:
+            # Get proxy directory in same folder as HDRI
+            proxy_dir = get_proxy_directory(original_path, create)
+
+            # Generate proxy filename
+            base_name = os.path.splitext(os.path.basename(original_path))[0]
+            proxy_name = f"{base_name}_{target_resolution}{extension}"
+            return os.path.join(proxy_dir, proxy_name)
+        except OSError:
+            # Read-only library, fall back to the central store
+            pass
+
+    return proxy_store.get_store_path(original_path, target_resolution, extension, compute_hash, create)
+
+def find_proxy(original_path, target_resolution, check_stale=True, compute_hash=False):
+    """Existing proxy of an HDRI in any format, preferred format first, or None.
+
+    A proxy older than its original is still returned, but queued for
+    regeneration in the background. Nothing is created on disk. Interactive
+    paths never hash originals here - a central store proxy is found once the
+    background hash is cached. Headless callers without timers pass
+    compute_hash to hash right away.
+    """
+    from . import proxy_manifest, proxy_auto
+
+    target_resolution = proxy_auto.resolve(target_resolution)
+    preferred = get_proxy_format()
+    for proxy_format in [preferred] + [f for f in PROXY_EXTENSIONS if f != preferred]:
+        proxy_path = get_proxy_path(original_path, target_resolution, proxy_format,
+                                    compute_hash=compute_hash, create=False)
+        if proxy_path and os.path.exists(proxy_path):
+            if check_stale and proxy_manifest.is_stale(original_path, proxy_path, compute_hash=False):
+                proxy_manifest.queue_regeneration(original_path, target_resolution, proxy_path)
+            return proxy_path
+    return None
+
+def create_hdri_proxy(original_path, target_resolution, timeout=None):
+    """Create a proxy version of an HDRI at the specified resolution.
+
+    Waits up to timeout seconds (default proxy_lock.LOCK_TIMEOUT, a couple of
+    seconds) for another instance writing the same proxy. When it is still
+    locked the other instance's proxy is used if it finished, otherwise None
+    is returned and callers use the original - nothing is written without the
+    lock. Batch and preview runs pass timeout=0 and never wait.
+    """
+    from . import proxy_cache, proxy_manifest, proxy_lock, proxy_auto
+
+    # AUTO picks a concrete resolution from the viewport size and memory budget
+    target_resolution = proxy_auto.resolve(target_resolution)
+    target_width = PROXY_RESOLUTIONS.get(target_resolution)
     if not target_width:
         return None
 
-    # Get proxy directory in same folder as HDRI
-    proxy_dir = get_proxy_directory(original_path)
+    # Check if proxy already exists in any format
+    existing_proxy = find_proxy(original_path, target_resolution)
+    if existing_proxy:
+        return proxy_cache.touch(existing_proxy)
+
+    proxy_path = get_proxy_path(original_path, target_resolution)
 
-    # Generate proxy filename
-    base_name = os.path.splitext(os.path.basename(original_path))[0]
-    proxy_name = f"{base_name}_{target_resolution}.hdr"
-    proxy_path = os.path.join(proxy_dir, proxy_name)
+    try:
+        # Another Blender instance may be writing the same proxy - wait and reuse its work
+        with proxy_lock.locked(proxy_path, proxy_lock.LOCK_TIMEOUT if timeout is None else timeout) as acquired:
+            existing_proxy = find_proxy(original_path, target_resolution)
+            if existing_proxy:
+                return proxy_cache.touch(existing_proxy)
+            if not acquired:
+                return None
+
+            downsample = PROXY_ENGINES.get(get_proxy_engine(), downsample_proxy_blender)
+            proxy_path = downsample(original_path, proxy_path, target_width)
+            if proxy_path == original_path:
+                # Original is no larger than the target, it is used as is - never recorded or cached
+                return proxy_path
+            proxy_manifest.record_proxy(original_path, proxy_path, target_resolution)
+            return proxy_cache.touch(proxy_path)
+    except Exception as e:
+        print(f"Error creating proxy: {str(e)}")
+        return None
 
-    # Check if proxy already exists
-    if os.path.exists(proxy_path):
-        return proxy_path
+# Proxy "resolution" of the tiled mip-mapped EXR of an original
+TILED_PROXY = 'TILED'
 
+def get_tiled_proxy_settings():
+    """(tile size, compression) for tiled EXR proxies"""
     try:
-        # Load original image
-        original_img = bpy.data.images.load(original_path, check_existing=True)
-        original_width = original_img.size[0]
-
-        # Don't create proxy if target resolution is higher than original
-        if target_width >= original_width:
-            if original_img.users == 0:
-                bpy.data.images.remove(original_img)
-            return original_path
+        preferences = bpy.context.preferences.addons[get_addon_name()].preferences
+        return int(preferences.tiled_proxy_tile_size), preferences.tiled_proxy_codec
+    except (KeyError, AttributeError):
+        return 64, 'ZIP'
+
+def get_tiled_proxy_path(original_path):
+    """Path of the tiled mip-mapped EXR of an HDRI, kept with its other proxies"""
+    return get_proxy_path(original_path, TILED_PROXY, 'EXR')
+
+def find_tiled_proxy(original_path):
+    """Up to date tiled EXR of an HDRI, or None"""
+    from . import proxy_manifest
+    tiled_path = get_tiled_proxy_path(original_path)
+    if os.path.exists(tiled_path) and not proxy_manifest.is_stale(original_path, tiled_path):
+        return tiled_path
+    return None
 
-        # Calculate new dimensions
-        aspect_ratio = original_img.size[1] / original_img.size[0]
-        target_height = int(target_width * aspect_ratio)
+def write_tiled_proxy(original_path, tiled_path, tile_size=64, compression='ZIP'):
+    """Convert an original of any format Blender reads into a tiled mip-mapped EXR.
 
-        # Create resized image
-        original_img.scale(target_width, target_height)
+    Radiance originals are streamed, others are decoded whole first.
+    Returns the details recorded in the manifest.
+    """
+    from . import proxy_worker
+    if proxy_worker.can_generate(original_path):
+        return proxy_worker.generate_tiled_proxy(original_path, tiled_path, tile_size, compression)[1]
+
+    from . import exr_io, proxy_lock
+    pixels = read_image_pixels(original_path)[::-1]
+    with proxy_lock.atomic_write(tiled_path) as temp_path:
+        exr_io.write_tiled_exr(temp_path, pixels, tile_size, compression)
+
+    height, width = pixels.shape[:2]
+    return {
+        'width': width,
+        'height': height,
+        'levels': len(exr_io.mip_level_sizes(width, height)),
+        'tile_size': tile_size,
+        'compression': compression,
+    }
 
-        # Save with proper keyword argument
-        original_img.save(filepath=proxy_path)
+def create_tiled_proxy(original_path, timeout=None):
+    """Create the tiled mip-mapped EXR of an HDRI unless an up to date one exists.
 
-        # Clean up
-        if original_img.users == 0:
-            bpy.data.images.remove(original_img)
+    timeout works as in create_hdri_proxy.
+    """
+    from . import proxy_cache, proxy_manifest, proxy_lock
+
+    existing = find_tiled_proxy(original_path)
+    if existing:
+        return proxy_cache.touch(existing)
 
-        return proxy_path
+    tiled_path = get_tiled_proxy_path(original_path)
+    try:
+        with proxy_lock.locked(tiled_path, proxy_lock.LOCK_TIMEOUT if timeout is None else timeout) as acquired:
+            existing = find_tiled_proxy(original_path)
+            if existing:
+                return proxy_cache.touch(existing)
+            if not acquired:
+                return None
+
+            details = write_tiled_proxy(original_path, tiled_path, *get_tiled_proxy_settings())
+            proxy_manifest.record_proxy(original_path, tiled_path, TILED_PROXY, **details)
+            return proxy_cache.touch(tiled_path)
     except Exception as e:
-        print(f"Error creating proxy: {str(e)}")
+        print(f"Error creating tiled proxy: {str(e)}")
         return None
 
+def get_render_source(original_path):
+    """File to render an HDRI from - its tiled EXR when enabled and up to date, else the original"""
+    try:
+        preferences = bpy.context.preferences.addons[get_addon_name()].preferences
+        if not preferences.tiled_proxy_render:
+            return original_path
+    except (KeyError, AttributeError):
+        return original_path
+    return find_tiled_proxy(original_path) or original_path
+
+def _find_pyramid_levels(original_path, resolutions, proxies):
+    """Fill proxies with usable existing levels, returns the resolutions still missing.
+
+    Out of date proxies are rebuilt with the rest of the pyramid and replaced
+    atomically, they stay usable if the rebuild fails.
+    """
+    from . import proxy_manifest
+
+    missing = []
+    for resolution in resolutions:
+        proxy_path = find_proxy(original_path, resolution, check_stale=False)
+        if proxy_path and not proxy_manifest.is_stale(original_path, proxy_path):
+            proxies[resolution] = proxy_path
+        else:
+            missing.append(resolution)
+    return missing
+
+def create_hdri_proxy_pyramid(original_path, resolutions, timeout=None):
+    """Create several proxy resolutions from a single decode of the original.
+
+    Resolutions are produced largest first, each one downsampled from the
+    previous level (2x steps for 4K/2K/1K), so the original is read only once.
+    Only resolutions smaller than the source are written, existing proxies are kept.
+    Levels another instance still holds after timeout (as in create_hdri_proxy)
+    are left to it.
+    Returns {resolution: proxy path} - empty when nothing is smaller than the
+    source, which is not an error - or None when generation failed.
+    """
+    from . import proxy_lock
+
+    wanted = sorted((r for r in resolutions if r in PROXY_RESOLUTIONS),
+                    key=lambda r: PROXY_RESOLUTIONS[r], reverse=True)
+    proxies = {}
+    missing = _find_pyramid_levels(original_path, wanted, proxies)
+    if not missing:
+        return proxies
+
+    # Hold the locks of every missing level, in a fixed order so instances can't deadlock
+    if timeout is None:
+        timeout = proxy_lock.LOCK_TIMEOUT
+    lock_paths = sorted(get_proxy_path(original_path, r) for r in missing)
+    held = [path for path in lock_paths if proxy_lock.acquire(path, timeout)]
+    try:
+        # Levels still locked elsewhere are never written
+        missing = [r for r in missing if get_proxy_path(original_path, r) in held]
+
+        # Another instance may have written some levels while we waited
+        missing = _find_pyramid_levels(original_path, missing, proxies)
+        if missing and not _write_proxy_pyramid(original_path, wanted, missing, proxies):
+            return None
+    finally:
+        for path in held:
+            proxy_lock.release(path)
+
+    return proxies
+
+def _write_proxy_pyramid(original_path, wanted, missing, proxies):
+    """Write the missing levels into proxies, False on failure"""
+    from . import imaging, proxy_cache, proxy_manifest
+
+    # Radiance originals stream through every level in one bounded-memory pass
+    if get_proxy_engine() == 'STREAMING' and original_path.lower().endswith('.hdr'):
+        from . import proxy_worker
+        try:
+            targets = [(r, PROXY_RESOLUTIONS[r], get_proxy_path(original_path, r)) for r in missing]
+            _, results = proxy_worker.generate_proxies(original_path, targets)
+            write_streamed_proxies(results)
+            for resolution, (proxy_path, pixels) in results.items():
+                if proxy_path != original_path:
+                    proxy_manifest.record_proxy(original_path, proxy_path, resolution)
+                    proxies[resolution] = proxy_cache.touch(proxy_path)
+        except Exception as e:
+            print(f"Error creating proxy pyramid: {str(e)}")
+            return False
+        return True
+
+    try:
+        level = read_image_pixels(original_path)
+        source_height, source_width = level.shape[:2]
+
+        smallest_missing = PROXY_RESOLUTIONS[missing[-1]]
+        for resolution in wanted:
+            target_width = PROXY_RESOLUTIONS[resolution]
+            if target_width >= source_width:
+                continue
+            if target_width < smallest_missing:
+                break
+
+            # Cascade from the previous level instead of the full original
+            target_height = int(target_width * source_height / source_width)
+            level = imaging.area_resample(level, target_width, target_height)
+
+            if resolution in missing:
+                proxy_path = get_proxy_path(original_path, resolution)
+                write_proxy_pixels(level, proxy_path)
+                proxy_manifest.record_proxy(original_path, proxy_path, resolution)
+                proxies[resolution] = proxy_cache.touch(proxy_path)
+    except Exception as e:
+        print(f"Error creating proxy pyramid: {str(e)}")
+        return False
+    return True
+
+def benchmark_proxy_engines(original_path, target_resolution, repeats=1):
+    """Time every proxy engine on one HDRI, writing into a temporary folder.
+
+    Engines return at once for targets at least as wide as the source, so the
+    largest resolution below the source width is used in that case.
+    Returns (resolution used, {engine: (seconds per proxy, source megapixels per second)}),
+    or (None, {}) when the HDRI is no larger than the smallest proxy.
+    """
+    image = bpy.data.images.load(original_path, check_existing=False)
+    source_width = image.size[0]
+    megapixels = image.size[0] * image.size[1] / 1e6
+    bpy.data.images.remove(image)
+
+    if PROXY_RESOLUTIONS.get(target_resolution, 0) >= source_width:
+        smaller = [r for r in PROXY_RESOLUTIONS if PROXY_RESOLUTIONS[r] < source_width]
+        if not smaller:
+            return None, {}
+        target_resolution = max(smaller, key=PROXY_RESOLUTIONS.get)
+    target_width = PROXY_RESOLUTIONS[target_resolution]
+
+    results = {}
+    temp_dir = tempfile.mkdtemp(prefix="qhdri_proxy_bench_")
+    try:
+        for engine, downsample in PROXY_ENGINES.items():
+            elapsed = 0.0
+            for run in range(repeats):
+                extension = PROXY_EXTENSIONS.get(get_proxy_format(), '.hdr')
+                proxy_path = os.path.join(temp_dir, f"{engine.lower()}_{run}{extension}")
+                start = time.perf_counter()
+                downsample(original_path, proxy_path, target_width)
+                elapsed += time.perf_counter() - start
+
+            seconds = elapsed / repeats
+            results[engine] = (seconds, megapixels / seconds if seconds > 0 else 0.0)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return target_resolution, results
+
 def cleanup_legacy_files():
     """
     Checks for and removes legacy __init__ files in render engine directories.